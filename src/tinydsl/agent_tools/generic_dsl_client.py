@@ -4,8 +4,16 @@ Generic DSL client that works with any registered DSL.
 Provides a unified interface for interacting with all TinyDSL backends.
 """
 
+import time
 import requests
-from typing import Optional, List, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Dict, Any, Tuple
+
+# Seconds a fetched DSL list is reused before asking the server again
+DSL_LIST_TTL = 60.0
+
+# Base URL -> (fetch time, DSL names), shared by all clients in the process
+_DSL_LIST_CACHE: Dict[str, Tuple[float, List[str]]] = {}
 
 
 class GenericDSLClient:
@@ -17,16 +25,35 @@ class GenericDSLClient:
 
     def __init__(self, base_url: str = "http://localhost:8008/api"):
         self.base_url = base_url.rstrip("/")
-        self._available_dsls = None
+
+        # One keep-alive session, so repeated calls reuse pooled connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def list_dsls(self) -> List[str]:
-        """Get list of available DSLs from the server."""
-        if self._available_dsls is None:
-            url = f"{self.base_url.rstrip('/api')}/dsls"
-            resp = requests.get(url)
-            resp.raise_for_status()
-            self._available_dsls = resp.json().get("dsls", [])
-        return self._available_dsls
+        """
+        Get list of available DSLs from the server.
+
+        The list is cached per base URL for DSL_LIST_TTL seconds and shared
+        with other clients; call invalidate_dsls() to refetch sooner.
+        """
+        now = time.monotonic()
+        cached = _DSL_LIST_CACHE.get(self.base_url)
+        if cached is not None and now - cached[0] < DSL_LIST_TTL:
+            return cached[1]
+
+        url = f"{self.base_url.rstrip('/api')}/dsls"
+        resp = self._session.get(url)
+        resp.raise_for_status()
+        dsls = resp.json().get("dsls", [])
+        _DSL_LIST_CACHE[self.base_url] = (now, dsls)
+        return dsls
+
+    def invalidate_dsls(self) -> None:
+        """Drop the cached DSL list so the next list_dsls() asks the server."""
+        _DSL_LIST_CACHE.pop(self.base_url, None)
 
     def run(self, dsl_name: str, code: str, **kwargs) -> Dict[str, Any]:
         """
@@ -42,7 +69,7 @@ class GenericDSLClient:
         """
         url = f"{self.base_url}/{dsl_name}/run"
         payload = {"code": code, **kwargs}
-        resp = requests.post(url, json=payload, timeout=15)
+        resp = self._session.post(url, json=payload, timeout=15)
         resp.raise_for_status()
         return resp.json()
 
@@ -58,7 +85,7 @@ class GenericDSLClient:
             Response dict with task results
         """
         url = f"{self.base_url}/{dsl_name}/task"
-        resp = requests.post(url, json={"task_id": task_id}, timeout=15)
+        resp = self._session.post(url, json={"task_id": task_id}, timeout=15)
         resp.raise_for_status()
         return resp.json()
 
@@ -74,7 +101,7 @@ class GenericDSLClient:
             Evaluation report with accuracy metrics
         """
         url = f"{self.base_url}/{dsl_name}/eval"
-        resp = requests.post(url, json={"results": results}, timeout=15)
+        resp = self._session.post(url, json={"results": results}, timeout=15)
         resp.raise_for_status()
         return resp.json()
 
@@ -93,7 +120,7 @@ class GenericDSLClient:
         """
         url = f"{self.base_url}/{dsl_name}/examples"
         params = {"tag": tag} if tag else {}
-        resp = requests.get(url, params=params)
+        resp = self._session.get(url, params=params)
         resp.raise_for_status()
         return resp.json().get("examples", [])
 
@@ -175,8 +202,6 @@ class DSLTester:
         Returns:
             Benchmark report with timing and accuracy
         """
-        import time
-
         start_time = time.time()
         results = self.client.run_all_tasks(dsl_name, task_ids)
         elapsed = time.time() - start_time
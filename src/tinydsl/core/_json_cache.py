@@ -0,0 +1,39 @@
+"""Process-wide cache for the DSL data files shipped with the package."""
+
+import functools
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    # Optional: orjson decodes large task and data files several times faster
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+@functools.lru_cache(maxsize=32)
+def _load(path_str: str) -> Any:
+    """Read and parse one JSON file."""
+    return loads(Path(path_str).read_bytes())
+
+
+def load_json(path: Union[str, Path], default: Any = None) -> Any:
+    """
+    Load a JSON data file, parsing each path once per process.
+
+    The parsed object is shared between callers, so treat it as read-only.
+
+    Args:
+        path: JSON file path
+        default: Returned (uncached) if the file does not exist
+
+    Returns:
+        Parsed JSON, or `default`
+    """
+    path = Path(path)
+    if not path.exists():
+        return default
+    return _load(str(path))
@@ -9,11 +9,13 @@ Provides a reusable framework for:
 - Fuzzy matching for text-based DSLs
 """
 
-from typing import List, Dict, Any, Callable, Optional
-import json
+from typing import List, Dict, Any, Callable, Iterator, Optional
+import inspect
 from pathlib import Path
 import difflib
 
+from tinydsl.core._json_cache import loads
+
 
 class BaseEvaluator:
     """
@@ -24,7 +26,10 @@ class BaseEvaluator:
     """
 
     def __init__(
-        self, tasks_path: str, comparator: Optional[Callable[[str, str], bool]] = None
+        self,
+        tasks_path: Optional[str] = None,
+        comparator: Optional[Callable[[str, str], bool]] = None,
+        tasks: Optional[List[Dict[str, Any]]] = None,
     ):
         """
         Initialize evaluator.
@@ -32,18 +37,39 @@ class BaseEvaluator:
         Args:
             tasks_path: Path to JSON file with task definitions
             comparator: Custom comparison function(actual, expected) -> bool
-                       Defaults to exact string match
+                       Defaults to exact string match. May be an async
+                       function (e.g. a remote validator); batch_evaluate
+                       then runs all comparisons concurrently.
+            tasks: Task definitions given in memory; when set, tasks_path
+                   is not read
         """
-        self.tasks_path = Path(tasks_path)
+        self.tasks_path = Path(tasks_path) if tasks_path is not None else None
         self.tasks: List[Dict[str, Any]] = []
-        self._load_tasks()
+        if tasks is not None:
+            self.tasks = list(tasks)
+            self._index_tasks()
+        else:
+            self._load_tasks()
         self.comparator = comparator or self._default_comparator
 
     def _load_tasks(self) -> None:
-        """Load tasks from JSON file."""
-        if self.tasks_path.exists():
-            with open(self.tasks_path, "r") as f:
-                self.tasks = json.load(f)
+        """Load tasks from JSON file and index them by id."""
+        if self.tasks_path is not None and self.tasks_path.exists():
+            self.tasks = loads(self.tasks_path.read_bytes())
+        self._index_tasks()
+
+    def _index_tasks(self) -> None:
+        """Index tasks by id, difficulty and tag."""
+        # Reversed so the first task with a given id wins, as with a linear scan
+        self._task_index = {t["id"]: t for t in reversed(self.tasks)}
+
+        # Positions into self.tasks, in task order
+        self._by_difficulty: Dict[str, List[int]] = {}
+        self._by_tag: Dict[str, List[int]] = {}
+        for i, task in enumerate(self.tasks):
+            self._by_difficulty.setdefault(task.get("difficulty"), []).append(i)
+            for tag in dict.fromkeys(task.get("tags", [])):
+                self._by_tag.setdefault(tag, []).append(i)
 
     def _default_comparator(self, actual: str, expected: str) -> bool:
         """Default exact string comparison."""
@@ -74,10 +100,6 @@ class BaseEvaluator:
             actual_clean = str(actual).strip()
             expected_clean = str(expected).strip()
 
-            # Sequence similarity
-            matcher = difflib.SequenceMatcher(None, expected_clean, actual_clean)
-            similarity = matcher.ratio()
-
             # Line overlap for multi-line text
             expected_lines = expected_clean.splitlines()
             actual_lines = actual_clean.splitlines()
@@ -86,6 +108,22 @@ class BaseEvaluator:
                 matching_lines = set(expected_lines) & set(actual_lines)
                 line_overlap = len(matching_lines) / len(expected_lines)
 
+            matcher = difflib.SequenceMatcher(None, expected_clean, actual_clean)
+            if not return_metrics:
+                # Only pass/fail is needed: skip the O(n*m) ratio() when the
+                # line overlap already passes or the cheap upper bounds on
+                # the ratio show it cannot reach the threshold
+                if line_overlap >= threshold:
+                    return True
+                if (
+                    matcher.real_quick_ratio() < threshold
+                    or matcher.quick_ratio() < threshold
+                ):
+                    return False
+
+            # Sequence similarity
+            similarity = matcher.ratio()
+
             # Pass if either metric exceeds threshold
             passed = similarity >= threshold or line_overlap >= threshold
 
@@ -101,15 +139,25 @@ class BaseEvaluator:
 
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get a task by ID."""
-        return next((t for t in self.tasks if t["id"] == task_id), None)
+        return self._task_index.get(task_id)
+
+    def iter_tasks_by_difficulty(self, difficulty: str) -> Iterator[Dict[str, Any]]:
+        """Yield tasks of a difficulty level without building a list."""
+        tasks = self.tasks
+        return (tasks[i] for i in self._by_difficulty.get(difficulty, ()))
+
+    def iter_tasks_by_tag(self, tag: str) -> Iterator[Dict[str, Any]]:
+        """Yield tasks carrying a tag without building a list."""
+        tasks = self.tasks
+        return (tasks[i] for i in self._by_tag.get(tag, ()))
 
     def get_tasks_by_difficulty(self, difficulty: str) -> List[Dict[str, Any]]:
         """Filter tasks by difficulty level."""
-        return [t for t in self.tasks if t.get("difficulty") == difficulty]
+        return list(self.iter_tasks_by_difficulty(difficulty))
 
     def get_tasks_by_tag(self, tag: str) -> List[Dict[str, Any]]:
         """Filter tasks by tag."""
-        return [t for t in self.tasks if tag in t.get("tags", [])]
+        return list(self.iter_tasks_by_tag(tag))
 
     def evaluate_single(self, task_id: str, actual_output: str) -> Dict[str, Any]:
         """
@@ -121,20 +169,67 @@ class BaseEvaluator:
 
         Returns:
             Dictionary with evaluation results
+
+        Raises:
+            TypeError: If the comparator is async (await aevaluate_single)
         """
+        if inspect.iscoroutinefunction(self.comparator):
+            raise TypeError(
+                "evaluate_single() needs a sync comparator; "
+                "await aevaluate_single() for async ones"
+            )
+
         task = self.get_task(task_id)
         if not task:
-            return {
-                "task_id": task_id,
-                "status": "error",
-                "message": "Task not found",
-                "passed": False,
-            }
+            return self._task_not_found(task_id)
 
         expected = task.get("expected_output", "")
+        comparison_result = self.comparator(actual_output, expected)
+        return self._build_result(task_id, task, actual_output, comparison_result)
 
-        # Comparator might return bool or (bool, dict) tuple
+    async def aevaluate_single(
+        self, task_id: str, actual_output: str
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a single task result, awaiting the comparator if async.
+
+        Safe to await from a running event loop (e.g. an async route).
+
+        Args:
+            task_id: Task identifier
+            actual_output: Generated output from DSL
+
+        Returns:
+            Dictionary with evaluation results
+        """
+        task = self.get_task(task_id)
+        if not task:
+            return self._task_not_found(task_id)
+
+        expected = task.get("expected_output", "")
         comparison_result = self.comparator(actual_output, expected)
+        if inspect.isawaitable(comparison_result):
+            comparison_result = await comparison_result
+        return self._build_result(task_id, task, actual_output, comparison_result)
+
+    @staticmethod
+    def _task_not_found(task_id: str) -> Dict[str, Any]:
+        """Result for an unknown task id."""
+        return {
+            "task_id": task_id,
+            "status": "error",
+            "message": "Task not found",
+            "passed": False,
+        }
+
+    @staticmethod
+    def _build_result(
+        task_id: str, task: Dict[str, Any], actual_output: str, comparison_result: Any
+    ) -> Dict[str, Any]:
+        """Build the evaluation result dict from a comparator's return value."""
+        expected = task.get("expected_output", "")
+
+        # Comparator might return bool or (bool, dict) tuple
         if isinstance(comparison_result, tuple):
             passed, metrics = comparison_result
         else:
@@ -162,18 +257,27 @@ class BaseEvaluator:
         """
         Evaluate multiple task results.
 
+        An async comparator is run on a new event loop, so call this from
+        sync code only; inside a running loop, gather aevaluate_single.
+
         Args:
             results: List of {"task_id": "...", "output": "..."}
 
         Returns:
             Report with accuracy and per-task details
         """
-        details = []
-        for result in results:
-            task_id = result.get("task_id")
-            output = result.get("output", "")
-            evaluation = self.evaluate_single(task_id, output)
-            details.append(evaluation)
+        if inspect.iscoroutinefunction(self.comparator):
+            # Latency-bound comparators: await all results concurrently
+            import asyncio
+
+            details = asyncio.run(self._evaluate_all_async(results))
+        else:
+            details = []
+            for result in results:
+                task_id = result.get("task_id")
+                output = result.get("output", "")
+                evaluation = self.evaluate_single(task_id, output)
+                details.append(evaluation)
 
         total = len(details)
         passed = sum(1 for d in details if d["passed"])
@@ -202,6 +306,19 @@ class BaseEvaluator:
             "details": details,
         }
 
+    async def _evaluate_all_async(
+        self, results: List[Dict[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """Evaluate all results concurrently, keeping their order."""
+        import asyncio
+
+        return await asyncio.gather(
+            *(
+                self.aevaluate_single(r.get("task_id"), r.get("output", ""))
+                for r in results
+            )
+        )
+
     def run_all_tasks(
         self,
         executor: Callable[[str], str],
@@ -236,4 +353,5 @@ class BaseEvaluator:
         return self.batch_evaluate(results)
 
     def __repr__(self) -> str:
-        return f"<BaseEvaluator: {len(self.tasks)} tasks from {self.tasks_path.name}>"
+        source = self.tasks_path.name if self.tasks_path is not None else "memory"
+        return f"<BaseEvaluator: {len(self.tasks)} tasks from {source}>"
@@ -164,5 +164,13 @@ class JSONFileMemory(BaseMemory):
         """Explicitly save to disk."""
         self._save()
 
+    def __enter__(self) -> "JSONFileMemory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Write batched changes (auto_save=False) to disk once, on exit."""
+        if not self.auto_save:
+            self._save()
+
     def __repr__(self) -> str:
         return f"<JSONFileMemory: {self.filepath}, {len(self._store)} keys>"
@@ -41,6 +41,13 @@ class LexiInterpreter(BaseDSL):
     def render(self):
         return self.output
 
+    def reset(self) -> None:
+        """Reset interpreter state; long-term memory is kept."""
+        super().reset()
+        self.output = None
+        # The transformer accumulates output and variables across parse() calls
+        self.parser.reset()
+
 
 # Example usage
 if __name__ == "__main__":
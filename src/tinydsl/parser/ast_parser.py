@@ -10,9 +10,11 @@ Provides common functionality to:
 This module is DSL-agnostic and works with any Lark grammar.
 """
 
-from lark import Lark, Tree, Token
+from lark import Tree, Token
 from typing import Any, Dict
 
+from tinydsl.parser.base_parser import get_lark
+
 
 class LarkASTParser:
     """
@@ -20,6 +22,7 @@ class LarkASTParser:
 
     Produces raw Lark Tree without transformation.
     Provides utilities to export AST in various formats.
+    Each grammar file is compiled once per process and shared.
     """
 
     def __init__(self, grammar_path: str):
@@ -30,13 +33,8 @@ class LarkASTParser:
             grammar_path: Path to Lark grammar file (.lark)
         """
         self.grammar_path = grammar_path
-
-        # Load grammar
-        with open(grammar_path, "r") as f:
-            grammar = f.read()
-
         # No transformer: we want the raw Tree
-        self.parser = Lark(grammar, parser="lalr")
+        self.parser = get_lark(grammar_path)
 
     def parse_tree(self, code: str) -> Tree:
         """
@@ -1,4 +1,124 @@
+import functools
+import hashlib
+import os
 from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from lark import Lark, Tree, __version__ as lark_version
+from lark.exceptions import UnexpectedInput
+
+# (grammar, options) -> Lark instance shared by all parsers in the process
+_LARK_INSTANCES: Dict[Tuple[str, str, Tuple[Tuple[str, Any], ...]], Lark] = {}
+
+# Per-user directory for pickled LALR tables (Lark loads these with pickle,
+# so they must not live anywhere other users can write)
+LARK_CACHE_DIR = Path(
+    os.getenv("TINYDSL_CACHE_DIR")
+    or Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "tinydsl"
+)
+
+
+def lark_cache_file(text: str, options: Dict[str, Any]) -> Union[str, bool]:
+    """
+    Per-user cache file for a grammar's LALR tables.
+
+    Args:
+        text: Grammar text
+        options: Lark options the parser is built with
+
+    Returns:
+        Path to pass as Lark's `cache` option, or False if the cache
+        directory cannot be created
+    """
+    try:
+        LARK_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError:
+        return False
+    digest = hashlib.sha256(
+        repr((text, sorted(options.items()), lark_version)).encode()
+    ).hexdigest()[:32]
+    return os.fspath(LARK_CACHE_DIR / f"lark_{digest}.pickle")
+
+
+def get_lark(
+    grammar_path: Optional[Union[str, os.PathLike]] = None,
+    *,
+    grammar_text: Optional[str] = None,
+    **options: Any,
+) -> Lark:
+    """
+    Return the process-wide LALR parser for a grammar.
+
+    Built on first use and shared afterwards, so only grammars whose parser
+    carries no per-caller state (no inline transformer) should go through
+    here. The built LALR tables are also pickled to LARK_CACHE_DIR, so later
+    processes load them instead of rebuilding.
+
+    Args:
+        grammar_path: Path to a .lark file
+        grammar_text: The grammar itself, instead of grammar_path
+        **options: Extra Lark options (e.g. lexer="basic")
+
+    Returns:
+        The shared Lark instance
+
+    Raises:
+        TypeError: Unless exactly one of grammar_path and grammar_text is given
+    """
+    if (grammar_path is None) == (grammar_text is None):
+        raise TypeError("get_lark() takes exactly one of grammar_path, grammar_text")
+    if grammar_path is not None:
+        key = ("path", os.fspath(grammar_path), tuple(sorted(options.items())))
+    else:
+        key = ("text", grammar_text, tuple(sorted(options.items())))
+
+    if key not in _LARK_INSTANCES:
+        text = grammar_text
+        if text is None:
+            with open(grammar_path, "r") as f:
+                text = f.read()
+        cache = lark_cache_file(text, options)
+        _LARK_INSTANCES[key] = Lark(text, parser="lalr", cache=cache, **options)
+    return _LARK_INSTANCES[key]
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_once(
+    parser: Lark, code: str, build: Optional[Callable[[Tree], Any]]
+) -> Tuple[Any, Optional[str]]:
+    """Parse (and build) code once per process; syntax errors as messages."""
+    try:
+        tree = parser.parse(code)
+    except UnexpectedInput as e:
+        return None, str(e)
+    return (tree if build is None else build(tree)), None
+
+
+def parse_cached(
+    parser: Lark, code: str, build: Optional[Callable[[Tree], Any]] = None
+) -> Any:
+    """
+    Parse code with a shared parser, reusing the result for repeated code.
+
+    Results are shared by every caller, so treat them as read-only: a tree
+    may be transformed (which builds new values and leaves it intact) but
+    not edited. Syntax errors are cached too and re-raised as a ValueError
+    with the message formatted on the first parse.
+
+    Args:
+        parser: Shared parser from get_lark
+        code: Source code
+        build: Optional function applied to the tree; its result is cached
+            instead of the tree, so the tree itself is not kept
+
+    Returns:
+        The parse tree, or build(tree)
+    """
+    result, error = _parse_once(parser, code, build)
+    if error is not None:
+        raise ValueError(error)
+    return result
 
 
 class BaseParser(ABC):
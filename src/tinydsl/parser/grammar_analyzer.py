@@ -4,6 +4,10 @@ from pathlib import Path
 from lark.tree import Tree, Token
 from lark.load_grammar import load_grammar, TERMINALS, RULES
 
+# Comment scanning patterns, compiled once per process
+_COMMENT_RE = re.compile(r"//[^\n]+")
+_HINT_RE = re.compile(r"novel|post-cutoff", re.IGNORECASE)
+
 # --------------------------------------------
 # Base Class: GrammarAnalyzer
 # --------------------------------------------
@@ -34,8 +38,8 @@ class GrammarAnalyzer:
     @staticmethod
     def extract_comment_hints(grammar_text: str):
         """Extract novelty-related comment hints (or other metadata)."""
-        comments = re.findall(r"//[^\n]+", grammar_text)
-        hints = [c.strip() for c in comments if re.search(r"novel|post-cutoff", c, re.IGNORECASE)]
+        comments = _COMMENT_RE.findall(grammar_text)
+        hints = [c.strip() for c in comments if _HINT_RE.search(c)]
         return hints
 
     def analyze(self):
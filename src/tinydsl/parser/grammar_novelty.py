@@ -3,38 +3,39 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+# Basic regex patterns, compiled once per process
+_RULE_RE = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*:", re.MULTILINE)
+_LITERAL_RE = re.compile(r'"([^"]+)"')
+_REGEX_RE = re.compile(r"/([^/]+)/")
+_COMMENT_RE = re.compile(r"//\s*(.*)")
+_ALT_RE = re.compile(r"\|")
+_OPT_RE = re.compile(r"\[.*?\]")
+_GROUP_RE = re.compile(r"\(.*?\)")
+_BRACE_RE = re.compile(r"\{.*?\}")
+
+
 def analyze_grammar(grammar_text):
     """Analyze a single grammar file for novelty and structural complexity."""
-    # Basic regex patterns
-    rule_pattern = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*:", re.MULTILINE)
-    literal_pattern = re.compile(r'"([^"]+)"')
-    regex_pattern = re.compile(r"/([^/]+)/")
-    comment_pattern = re.compile(r"//\s*(.*)")
-    alt_pattern = re.compile(r"\|")
-    opt_pattern = re.compile(r"\[.*?\]")
-    group_pattern = re.compile(r"\(.*?\)")
-    brace_pattern = re.compile(r"\{.*?\}")
-
     # Extract components
-    rules = rule_pattern.findall(grammar_text)
-    literals = literal_pattern.findall(grammar_text)
-    regexes = regex_pattern.findall(grammar_text)
-    comments = comment_pattern.findall(grammar_text)
+    rules = _RULE_RE.findall(grammar_text)
+    literals = _LITERAL_RE.findall(grammar_text)
+    regexes = _REGEX_RE.findall(grammar_text)
+    comments = _COMMENT_RE.findall(grammar_text)
 
     # Rule-by-rule analysis
     rule_data = {}
-    for rule_match in rule_pattern.finditer(grammar_text):
+    for rule_match in _RULE_RE.finditer(grammar_text):
         name = rule_match.group(1)
         start = rule_match.end()
         end = grammar_text.find("\n\n", start)
         rhs = grammar_text[start:end].strip() if end != -1 else grammar_text[start:].strip()
 
-        alts = len(alt_pattern.findall(rhs))
-        opts = len(opt_pattern.findall(rhs))
-        groups = len(group_pattern.findall(rhs))
-        braces = len(brace_pattern.findall(rhs))
-        literals_in_rule = len(literal_pattern.findall(rhs))
-        regexes_in_rule = len(regex_pattern.findall(rhs))
+        alts = len(_ALT_RE.findall(rhs))
+        opts = len(_OPT_RE.findall(rhs))
+        groups = len(_GROUP_RE.findall(rhs))
+        braces = len(_BRACE_RE.findall(rhs))
+        literals_in_rule = len(_LITERAL_RE.findall(rhs))
+        regexes_in_rule = len(_REGEX_RE.findall(rhs))
 
         # Heuristic "novelty" score
         novelty = (0.2 * literals_in_rule +
@@ -19,7 +19,8 @@ import math
 from typing import Callable, Dict, List, Tuple, Any
 from copy import deepcopy
 
-from lark import Lark, Transformer, v_args, Tree, Token
+from lark import Transformer, v_args, Tree, Token
+from tinydsl.parser.base_parser import get_lark
 from tinydsl.parser.lark_math_parser import LarkMathParser
 
 # Shape: (shape_name, x, y, size, color) for v1
@@ -462,11 +463,8 @@ class LarkGLIParser:
     def __init__(self, version: str = "v1"):
         self.version = version
 
-        # Load unified grammar (supports both v1 and v2 features)
-        with open(GLI_GRAMMAR_PATH, "r") as f:
-            grammar = f.read()
-
-        self._parser = Lark(grammar, parser="lalr")
+        # Unified grammar (supports both v1 and v2 features), shared by both
+        self._parser = get_lark(GLI_GRAMMAR_PATH)
 
     def parse(self, code: str) -> List[Shape]:
         tree: Tree = self._parser.parse(code)
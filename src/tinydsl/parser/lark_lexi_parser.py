@@ -18,6 +18,7 @@ import os
 import math
 from lark import Lark, Transformer, v_args, Tree, Token
 from tinydsl.core.memory import JSONFileMemory
+from tinydsl.parser.base_parser import get_lark, lark_cache_file
 from tinydsl.parser.lark_math_parser import LarkMathParser
 
 root_dir = os.path.dirname(os.path.abspath(__file__))
@@ -311,10 +312,22 @@ class LarkLexiParser:
         with open(LEXI_GRAMMAR_PATH) as f:
             grammar = f.read()
 
+        self.transformer = LexiTransformer(version=version)
+        # The inline transformer is per parser, so the instance cannot be
+        # shared; the cache file still loads the LALR tables instead of
+        # rebuilding them
         self.parser = Lark(
-            grammar, parser="lalr", transformer=LexiTransformer(version=version)
+            grammar,
+            parser="lalr",
+            transformer=self.transformer,
+            cache=lark_cache_file(grammar, {}),
         )
 
+    def reset(self) -> None:
+        """Drop output and variables left by earlier parses (memory persists)."""
+        self.transformer.output = []
+        self.transformer.context = {}
+
     def parse(self, code: str):
         try:
             result = self.parser.parse(code)
@@ -338,12 +351,9 @@ class LarkLexiASTParser:
     def __init__(self, version: str = "v1"):
         self.version = version
 
-        # Load unified grammar (supports both v1 and v2 features)
-        with open(LEXI_GRAMMAR_PATH, "r") as f:
-            grammar = f.read()
-
-        # No transformer: we want the raw Tree
-        self.parser = Lark(grammar, parser="lalr")
+        # Unified grammar (supports both v1 and v2 features). No transformer:
+        # we want the raw Tree
+        self.parser = get_lark(LEXI_GRAMMAR_PATH)
 
     def parse_tree(self, code: str) -> Tree:
         return self.parser.parse(code)
@@ -1,6 +1,6 @@
-from lark import Lark, Transformer
+from lark import Transformer
 import math
-from tinydsl.parser.base_parser import BaseParser
+from tinydsl.parser.base_parser import BaseParser, get_lark
 
 
 class MathTransformer(Transformer):
@@ -73,7 +73,8 @@ class LarkMathParser(BaseParser):
     """Reusable Lark-based mathematical expression parser."""
 
     def __init__(self):
-        self.parser = Lark(GRAMMAR, parser="lalr")
+        # Gli and Lexi build one of these per program; the parser is shared
+        self.parser = get_lark(grammar_text=GRAMMAR)
 
     def sanitize(self, expr: str) -> str:
         return expr.strip().replace("$", "")
@@ -2,9 +2,15 @@
 Lark parser for TinyCalc DSL - Novel unit conversion language.
 """
 
+import io
 import os
-from typing import Dict, List
-from lark import Lark, Transformer, v_args
+import sys
+from collections import deque
+from typing import Dict, Tuple
+from lark import Transformer, v_args
+from lark.exceptions import VisitError
+
+from tinydsl.parser.base_parser import get_lark, parse_cached
 
 
 root_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,21 +24,28 @@ TINYCALC_GRAMMAR_PATH = os.getenv(
 class TinyCalcTransformer(Transformer):
     """
     Transformer that builds a unit conversion graph and performs conversions.
+
+    Unit names are interned so graph lookups compare keys by identity.
+    Conversion paths are found once per (from, to) pair and reused until the
+    next define changes the graph.
     """
 
     def __init__(self):
         super().__init__()
         self.units: Dict[str, Dict[str, float]] = {}  # unit -> {target: factor}
+        # (from, to) -> factors along the BFS path, applied in order; filled
+        # for every unit reachable from `from` by one BFS
+        self._paths: Dict[Tuple[str, str], Tuple[float, ...]] = {}
         self.base_unit: str = ""
-        self.output: List[str] = []
+        self.output = io.StringIO()
 
     def define_stmt(self, quantity1, unit1, quantity2, unit2):
         """
         Define a conversion: 1 flurb = 3.7 grobbles
         Stores bidirectional conversion factors.
         """
-        q1, u1 = float(quantity1), str(unit1)
-        q2, u2 = float(quantity2), str(unit2)
+        q1, u1 = float(quantity1), sys.intern(str(unit1))
+        q2, u2 = float(quantity2), sys.intern(str(unit2))
 
         # Forward conversion factor: u1 -> u2
         factor_forward = q2 / q1
@@ -48,36 +61,37 @@ class TinyCalcTransformer(Transformer):
         # Store bidirectional conversions
         self.units[u1][u2] = factor_forward
         self.units[u2][u1] = factor_reverse
+        self._paths.clear()
 
     def set_base_stmt(self, unit):
         """Set the base unit for the system."""
-        self.base_unit = str(unit)
+        self.base_unit = sys.intern(str(unit))
 
     def convert_stmt(self, amount, from_unit, to_unit):
         """Convert X units to Y units."""
         amount = float(amount)
-        from_unit = str(from_unit)
-        to_unit = str(to_unit)
+        from_unit = sys.intern(str(from_unit))
+        to_unit = sys.intern(str(to_unit))
 
         result = self._convert(amount, from_unit, to_unit)
-        self.output.append(f"{result} {to_unit}")
+        self._emit(f"{result} {to_unit}")
 
     def compute_stmt(self, expr_result, target_unit):
         """Compute an expression result in target unit."""
         # expr_result is (amount, unit) tuple from expression evaluation
         if isinstance(expr_result, tuple):
             amount, unit = expr_result
-            target = str(target_unit)
+            target = sys.intern(str(target_unit))
             result = self._convert(amount, unit, target)
-            self.output.append(f"{result} {target}")
+            self._emit(f"{result} {target}")
         else:
             # Just a number, no unit
-            self.output.append(f"{expr_result} {target_unit}")
+            self._emit(f"{expr_result} {target_unit}")
 
     def show_stmt(self):
         """Show all defined units."""
         units_list = list(self.units.keys())
-        self.output.append(f"Units: {', '.join(units_list)}")
+        self._emit(f"Units: {', '.join(units_list)}")
 
     # Expression evaluators
     def add(self, left, right):
@@ -122,7 +136,7 @@ class TinyCalcTransformer(Transformer):
 
     def quantity(self, number, unit):
         """A quantity with a unit."""
-        return (float(number), str(unit))
+        return (float(number), sys.intern(str(unit)))
 
     def number(self, n):
         """Plain number without unit."""
@@ -147,7 +161,7 @@ class TinyCalcTransformer(Transformer):
     def _convert(self, amount: float, from_unit: str, to_unit: str) -> float:
         """
         Convert amount from one unit to another.
-        Uses BFS to find conversion path through the unit graph.
+        Uses BFS to find conversion paths through the unit graph (cached).
         """
         if from_unit == to_unit:
             return amount
@@ -165,53 +179,88 @@ class TinyCalcTransformer(Transformer):
                 raise ValueError(f"Unknown unit: {to_unit}{hint}")
             raise ValueError(f"Unknown unit: {to_unit}")
 
-        # BFS to find path
+        key = (from_unit, to_unit)
+        path = self._paths.get(key)
+        if path is None:
+            self._find_paths(from_unit)
+            path = self._paths.get(key)
+            if path is None:
+                raise ValueError(f"No conversion path from {from_unit} to {to_unit}")
+
+        # Multiply step by step, exactly as walking the path would
+        for factor in path:
+            amount *= factor
+        return amount
+
+    def _find_paths(self, from_unit: str) -> None:
+        """
+        BFS once from a unit, caching the factor path to every reachable unit.
+
+        Each unit keeps the path it is first dequeued with, which is the path
+        a BFS stopping at that unit would return.
+        """
         visited = set()
-        queue = [(from_unit, amount)]
+        queue = deque([(from_unit, ())])
 
         while queue:
-            current_unit, current_amount = queue.pop(0)
-
-            if current_unit == to_unit:
-                return current_amount
+            current_unit, factors = queue.popleft()
 
             if current_unit in visited:
                 continue
             visited.add(current_unit)
+            self._paths[(from_unit, current_unit)] = factors
 
             # Explore neighbors
             for neighbor, factor in self.units.get(current_unit, {}).items():
                 if neighbor not in visited:
-                    new_amount = current_amount * factor
-                    queue.append((neighbor, new_amount))
+                    queue.append((neighbor, factors + (factor,)))
 
-        raise ValueError(f"No conversion path from {from_unit} to {to_unit}")
+    def _emit(self, line: str):
+        """Append one line of output."""
+        self.output.write(line)
+        self.output.write("\n")
 
     def start(self, *statements):
-        return "\n".join(self.output)
+        # Drop the trailing newline written after the last line
+        return self.output.getvalue()[:-1]
 
 
 class LarkTinyCalcParser:
     """Public TinyCalc parser interface."""
 
     def __init__(self):
-        with open(TINYCALC_GRAMMAR_PATH, "r") as f:
-            grammar = f.read()
-        self.parser = Lark(grammar, parser="lalr", transformer=TinyCalcTransformer())
+        # The basic lexer scans with one combined regex
+        self.parser = get_lark(
+            TINYCALC_GRAMMAR_PATH, lexer="basic", maybe_placeholders=False
+        )
+
+    def _run(self, code: str) -> str:
+        """Parse code (cached per source string) and execute it fresh."""
+        tree = parse_cached(self.parser, code)
+        try:
+            return TinyCalcTransformer().transform(tree)
+        except VisitError as e:
+            # Surface the statement's own error rather than Lark's wrapper
+            raise e.orig_exc from None
 
     def parse(self, code: str) -> str:
         """Parse and execute TinyCalc code, returning output."""
         try:
-            return self.parser.parse(code)
+            return self._run(code)
         except Exception as e:
             error_msg = str(e)
 
             # Detect common mistakes and provide helpful hints
-            code_lower = code.strip().lower()
+            stripped = code.strip()
+            code_lower = stripped.lower()
+            has_define = "define" in code_lower
+            has_keyword = (
+                has_define or "convert" in code_lower or "compute" in code_lower
+            )
 
             # Check if user is trying to use general variable syntax
             if (
-                "define" in code_lower
+                has_define
                 and "=" in code
                 and (
                     "flurb" not in code_lower
@@ -227,13 +276,9 @@ class LarkTinyCalcParser:
                 raise ValueError(f"TinyCalc parse error: {error_msg}{hint}")
 
             # Check if user is trying to use simple arithmetic
-            if any(
-                op in code
-                and "convert" not in code_lower
-                and "compute" not in code_lower
-                and "define" not in code_lower
-                for op in ["+", "-", "*", "/"]
-            ) or code.strip().startswith("/"):
+            if (
+                not has_keyword and any(c in "+-*/" for c in code)
+            ) or stripped.startswith("/"):
                 hint = (
                     "\n\n💡 Hint: TinyCalc is for unit conversions only.\n"
                     "   For general arithmetic, use TinyMath instead!\n"
@@ -1,154 +1,274 @@
 """Lark parser for TinyMath DSL."""
 
 import math
+import operator
+import re
 from pathlib import Path
-from lark import Lark, Transformer
-from typing import Dict
+from lark import Transformer, Tree
+from typing import Any, Callable, Dict, List
+
+from tinydsl.parser.base_parser import get_lark, parse_cached
+
+# A program that is a single number literal (same whitespace as the grammar's
+# WS; ASCII digits only, as NUMBER accepts)
+_LITERAL_RE = re.compile(r"[ \t\f\r\n]*(-?[0-9]+(?:\.[0-9]+)?)[ \t\f\r\n]*")
+
+# Built-in functions. The math functions and abs are called directly (one C
+# call, which also checks the argument count); the wrappers left keep TinyMath
+# semantics: min/max over their arguments, one-argument round, and ** for pow
+# (complex results for negative bases, where math.pow raises).
+_FUNCTIONS = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sqrt": math.sqrt,
+    "abs": abs,
+    "log": math.log,
+    "log10": math.log10,
+    "exp": math.exp,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "round": lambda x: round(x),
+    "min": lambda *args: min(args),
+    "max": lambda *args: max(args),
+    "pow": lambda x, y: x**y,
+}
+
+
+def _div(a, b):
+    """Division that reports a zero divisor as a TinyMath error."""
+    if b == 0:
+        raise ValueError("Division by zero")
+    return a / b
+
+
+def _square(a, b):
+    """`a ^ 2` as one multiply for floats; ** for anything else or on overflow."""
+    if type(a) is float:
+        square = a * a
+        # ** raises OverflowError where the multiply gives inf
+        if square != math.inf:
+            return square
+    return a**b
+
+
+# Binary rule -> operation; comparisons give 1.0 (true) or 0.0 (false)
+_BINARY_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "div": _div,
+    "mod": operator.mod,
+    "pow": operator.pow,
+    "eq": lambda a, b: 1.0 if a == b else 0.0,
+    "neq": lambda a, b: 1.0 if a != b else 0.0,
+    "lt": lambda a, b: 1.0 if a < b else 0.0,
+    "lte": lambda a, b: 1.0 if a <= b else 0.0,
+    "gt": lambda a, b: 1.0 if a > b else 0.0,
+    "gte": lambda a, b: 1.0 if a >= b else 0.0,
+}
+
+_UNARY_OPS: Dict[str, Callable[[Any], Any]] = {
+    "neg": operator.neg,
+    "pos": operator.pos,
+}
+
+# Evaluates one node against the variable slots of a program run
+Evaluator = Callable[[List[Any]], Any]
+
+# Slot value of a variable that has not been assigned yet in this run
+_UNSET = object()
+
+
+def _constant(value: Any) -> Evaluator:
+    """Evaluator for a value known at compile time."""
+
+    def constant(env):
+        return value
+
+    constant.value = value
+    return constant
+
+
+def _fold(run: Evaluator, operands: List[Evaluator]) -> Evaluator:
+    """
+    Evaluate `run` now if all its operands are constants.
+
+    Operations that fail (e.g. division by zero) are left to fail at run
+    time, so errors keep their order relative to earlier statements.
+    """
+    if not all(hasattr(operand, "value") for operand in operands):
+        return run
+    try:
+        return _constant(run([]))
+    except Exception:
+        return run
+
+
+def _compile_node(node: Tree, slots: Dict[str, int]) -> Evaluator:
+    """
+    Compile a parse-tree node into a closure over its compiled children.
+
+    Subtrees of constants are folded to a single constant and `x ^ 2` becomes
+    a multiply. Variables are resolved to an index in `slots` (allocating new
+    ones as names are first seen), so runs read a list instead of hashing
+    names. Closures capture names and values only, never tree nodes, so a
+    cached program does not keep its parse tree alive.
+    """
+    rule = node.data
+
+    if rule == "number":
+        return _constant(float(node.children[0]))
+
+    if rule == "var":
+        name = str(node.children[0])
+        slot = slots.setdefault(name, len(slots))
+
+        def var(env):
+            value = env[slot]
+            if value is _UNSET:
+                raise ValueError(f"Undefined variable: {name}")
+            return value
+
+        return var
+
+    if rule in _BINARY_OPS:
+        op = _BINARY_OPS[rule]
+        left, right = (_compile_node(child, slots) for child in node.children)
+        if rule == "pow" and getattr(right, "value", None) == 2.0:
+            op = _square
+
+        def binary(env):
+            return op(left(env), right(env))
+
+        return _fold(binary, [left, right])
+
+    if rule in _UNARY_OPS:
+        op = _UNARY_OPS[rule]
+        (operand,) = (_compile_node(child, slots) for child in node.children)
+
+        def unary(env):
+            return op(operand(env))
+
+        return _fold(unary, [operand])
+
+    if rule == "function_call":
+        func_name = str(node.children[0])
+        func = _FUNCTIONS.get(func_name)
+        args = [
+            _compile_node(arg, slots)
+            for arguments in node.children[1:]
+            for arg in arguments.children
+        ]
+
+        def function_call(env):
+            values = [arg(env) for arg in args]
+            if func is None:
+                raise ValueError(f"Unknown function: {func_name}")
+            try:
+                return func(*values)
+            except Exception as e:
+                raise ValueError(f"Error calling {func_name}: {e}")
+
+        return _fold(function_call, args)
+
+    if rule == "assignment":
+        name = str(node.children[0])
+        expression = _compile_node(node.children[1], slots)
+        slot = slots.setdefault(name, len(slots))
+
+        def assignment(env):
+            value = env[slot] = expression(env)
+            return (name, value)
+
+        return assignment
+
+    if rule == "show_stmt":
+        name = str(node.children[0])
+        slot = slots.setdefault(name, len(slots))
+
+        def show_stmt(env):
+            value = env[slot]
+            if value is _UNSET:
+                raise ValueError(f"Undefined variable: {name}")
+            return (name, value)
+
+        return show_stmt
+
+    raise ValueError(f"Unsupported TinyMath rule: {rule}")
+
+
+def _compile_tree(tree: Tree) -> Callable[[], List[str]]:
+    """
+    Compile a program tree; the result runs it with fresh variables.
+
+    Each statement gives one output line, preceded by "name = value" for
+    assignments and show statements.
+    """
+    slots: Dict[str, int] = {}
+    statements = [_compile_node(child, slots) for child in tree.children]
+    unset = [_UNSET] * len(slots)
+
+    def program() -> List[str]:
+        return _run_statements(statements, unset.copy())
+
+    return program
+
+
+def _run_statements(statements: List[Evaluator], env: List[Any]) -> List[str]:
+    """Run compiled statements against `env`, returning their output lines."""
+    results = []
+    for statement in statements:
+        result = statement(env)
+        if isinstance(result, tuple):
+            name, result = result
+            results.append(f"{name} = {result}")
+        results.append(str(result))
+    return results
 
 
 class TinyMathTransformer(Transformer):
-    """Transform TinyMath parse tree into evaluated results."""
+    """
+    Evaluate a TinyMath parse tree, collecting output lines in `results`.
+
+    Kept for callers of the original transformer API; evaluation goes
+    through the same compiler as LarkTinyMathParser. Variables assigned by
+    the program are left in `variables`, and ones already there are visible
+    to it.
+    """
 
     def __init__(self):
         super().__init__()
-        self.variables: Dict[str, float] = {}
-        self.results = []
-
-    def number(self, args):
-        """Convert number token to float."""
-        return float(args[0])
-
-    def var(self, args):
-        """Retrieve variable value."""
-        name = str(args[0])
-        if name not in self.variables:
-            raise ValueError(f"Undefined variable: {name}")
-        return self.variables[name]
-
-    def assignment(self, args):
-        """Assign value to variable."""
-        name = str(args[0])
-        value = args[1]
-        self.variables[name] = value
-        self.results.append(f"{name} = {value}")
-        return value
+        self.variables: Dict[str, Any] = {}
+        self.results: List[str] = []
 
-    def show_stmt(self, args):
-        """Show variable value."""
-        name = str(args[0])
-        if name not in self.variables:
-            raise ValueError(f"Undefined variable: {name}")
-        value = self.variables[name]
-        self.results.append(f"{name} = {value}")
-        return value
-
-    def add(self, args):
-        """Addition."""
-        return args[0] + args[1]
-
-    def sub(self, args):
-        """Subtraction."""
-        return args[0] - args[1]
-
-    def mul(self, args):
-        """Multiplication."""
-        return args[0] * args[1]
-
-    def div(self, args):
-        """Division."""
-        if args[1] == 0:
-            raise ValueError("Division by zero")
-        return args[0] / args[1]
-
-    def mod(self, args):
-        """Modulo."""
-        return args[0] % args[1]
-
-    def pow(self, args):
-        """Exponentiation."""
-        return args[0] ** args[1]
-
-    def neg(self, args):
-        """Negation."""
-        return -args[0]
-
-    def pos(self, args):
-        """Positive (unary plus)."""
-        return +args[0]
-
-    def eq(self, args):
-        """Equality comparison."""
-        return 1.0 if args[0] == args[1] else 0.0
-
-    def neq(self, args):
-        """Inequality comparison."""
-        return 1.0 if args[0] != args[1] else 0.0
-
-    def lt(self, args):
-        """Less than."""
-        return 1.0 if args[0] < args[1] else 0.0
-
-    def lte(self, args):
-        """Less than or equal."""
-        return 1.0 if args[0] <= args[1] else 0.0
-
-    def gt(self, args):
-        """Greater than."""
-        return 1.0 if args[0] > args[1] else 0.0
-
-    def gte(self, args):
-        """Greater than or equal."""
-        return 1.0 if args[0] >= args[1] else 0.0
-
-    def function_call(self, args):
-        """Call built-in function."""
-        func_name = str(args[0])
-        # args[1] is the arguments list (or None if no args)
-        func_args = args[1] if len(args) > 1 and args[1] is not None else []
-
-        # Built-in functions
-        functions = {
-            "sin": lambda x: math.sin(x),
-            "cos": lambda x: math.cos(x),
-            "tan": lambda x: math.tan(x),
-            "asin": lambda x: math.asin(x),
-            "acos": lambda x: math.acos(x),
-            "atan": lambda x: math.atan(x),
-            "sqrt": lambda x: math.sqrt(x),
-            "abs": lambda x: abs(x),
-            "log": lambda x: math.log(x),
-            "log10": lambda x: math.log10(x),
-            "exp": lambda x: math.exp(x),
-            "floor": lambda x: math.floor(x),
-            "ceil": lambda x: math.ceil(x),
-            "round": lambda x: round(x),
-            "min": lambda *args: min(args),
-            "max": lambda *args: max(args),
-            "pow": lambda x, y: x**y,
-        }
-
-        if func_name not in functions:
-            raise ValueError(f"Unknown function: {func_name}")
+    def transform(self, tree: Tree) -> List[str]:
+        """
+        Evaluate `tree`, appending its output lines to `results`.
 
-        try:
-            result = functions[func_name](*func_args)
-            return result
-        except Exception as e:
-            raise ValueError(f"Error calling {func_name}: {e}")
+        Args:
+            tree: Parse tree from the TinyMath grammar
 
-    def arguments(self, args):
-        """Collect function arguments as a flat list."""
-        return list(args)
+        Returns:
+            The output lines of this program
 
-    def statement(self, args):
-        """Process statement and collect result."""
-        if len(args) > 0:
-            result = args[0]
-            # If it's an expression result (not assignment/show), add it
-            if not isinstance(result, str) and result is not None:
-                self.results.append(str(result))
-            return result
-        return None
+        Raises:
+            ValueError: On runtime errors
+        """
+        slots: Dict[str, int] = {}
+        statements = [_compile_node(child, slots) for child in tree.children]
+        env = [self.variables.get(name, _UNSET) for name in slots]
+        try:
+            results = _run_statements(statements, env)
+        finally:
+            for name, slot in slots.items():
+                if env[slot] is not _UNSET:
+                    self.variables[name] = env[slot]
+        self.results.extend(results)
+        return results
 
 
 class LarkTinyMathParser:
@@ -156,12 +276,8 @@ class LarkTinyMathParser:
 
     def __init__(self):
         grammar_path = Path(__file__).parent.parent / "data" / "tinymath_grammar.lark"
-        with open(grammar_path, "r") as f:
-            self.grammar = f.read()
-
-        self.parser = Lark(
-            self.grammar, parser="lalr", transformer=TinyMathTransformer()
-        )
+        # The basic lexer scans with one combined regex
+        self.parser = get_lark(grammar_path, lexer="basic", maybe_placeholders=False)
 
     def parse(self, code: str) -> str:
         """
@@ -176,18 +292,15 @@ class LarkTinyMathParser:
         Raises:
             ValueError: On syntax or runtime errors
         """
-        try:
-            transformer = TinyMathTransformer()
-            tree = Lark(self.grammar, parser="lalr").parse(code)
-
-            # Transform tree with fresh transformer
-            transformer.transform(tree)
+        literal = _LITERAL_RE.fullmatch(code)
+        if literal:
+            # Nothing to evaluate: skip the parser and the compile cache
+            return str(float(literal.group(1)))
 
-            # Return results
-            if transformer.results:
-                return "\n".join(transformer.results)
-            else:
-                return ""
+        try:
+            # Compiled once per source string; each run starts with no variables
+            results = parse_cached(self.parser, code, _compile_tree)()
+            return "\n".join(results)
 
         except Exception as e:
             raise ValueError(f"TinyMath parse error: {e}")
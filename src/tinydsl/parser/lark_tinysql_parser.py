@@ -2,10 +2,25 @@
 Lark parser for TinySQL DSL - Simple query language.
 """
 
+from __future__ import annotations
+
+import functools
+import io
 import os
 import json
-from typing import Dict, List, Any
-from lark import Lark, Transformer, v_args
+import operator
+import re
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
+from lark import Transformer, v_args
+from lark.exceptions import VisitError
+
+from tinydsl.core._json_cache import loads
+from tinydsl.parser.base_parser import get_lark
+
+if TYPE_CHECKING:
+    # NumPy is imported where large tables need it, so small queries (and
+    # importing this module) do not pay its import cost
+    import numpy as np
 
 
 root_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,6 +29,76 @@ TINYSQL_GRAMMAR_PATH = os.getenv(
     "TINYSQL_GRAMMAR_PATH", os.path.join(data_dir, "tinysql_grammar.lark")
 )
 
+# Comparison operators supported by `filter ... where field OP value`
+_OPS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+# Decimal/scientific literal; used instead of try/float() on every filter value
+_NUM_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+# Words float() also accepts, after optional whitespace and sign
+_FLOAT_WORD_RE = re.compile(r"\s*[-+]?(?:inf(?:inity)?|nan)\s*", re.IGNORECASE)
+
+# Tables with at least this many rows get NumPy-backed filter/sort
+_VECTORIZE_MIN_ROWS = 1000
+
+
+def _as_number(text: str) -> Any:
+    """
+    Convert text to float exactly where float() would, else return it as is.
+
+    Plain decimals take the regex fast path. Only text that could still be
+    a float (contains a digit, or is inf/nan) is handed to float(), so plain
+    words never raise and catch an exception.
+    """
+    if _NUM_RE.fullmatch(text):
+        return float(text)
+    if _FLOAT_WORD_RE.fullmatch(text) or any(c.isdigit() for c in text):
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return text
+
+
+@functools.lru_cache(maxsize=32)
+def _read_table(path: str, mtime_ns: int, size: int) -> List[Dict[str, Any]]:
+    """
+    Parse a table file, once per (path, mtime, size) for the whole process.
+
+    The rows are shared by every load of the file, so treat them as
+    read-only; statements build new lists/dicts rather than editing rows.
+    """
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def _load_table(file_path: str) -> List[Dict[str, Any]]:
+    """Load a table file, reusing the parsed rows until the file changes."""
+    stat = os.stat(file_path)
+    return _read_table(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _numeric_column(rows: List[Dict[str, Any]], field: str) -> Optional[np.ndarray]:
+    """
+    Build a float64 column for `field`, with NaN marking missing/null values.
+
+    Returns None when the column holds anything other than ints/floats, so
+    callers fall back to the row-by-row path with Python comparison semantics.
+    """
+    import numpy as np
+
+    values = [row.get(field) for row in rows]
+    # `v == v` rejects NaN already present in the data, keeping NaN unambiguous
+    if not all(v is None or (isinstance(v, (int, float)) and v == v) for v in values):
+        return None
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
 
 @v_args(inline=True)
 class TinySQLTransformer(Transformer):
@@ -25,8 +110,71 @@ class TinySQLTransformer(Transformer):
         super().__init__()
         self.tables: Dict[str, List[Dict[str, Any]]] = {}
         self.current_table: str = ""
-        self.current_data: List[Dict[str, Any]] = []
-        self.output: List[str] = []
+        self.output = io.StringIO()
+        # table -> field -> cached numeric column (large tables only)
+        self.columns: Dict[str, Dict[str, Optional[np.ndarray]]] = {}
+        # Current rows of a large table as (table, row indices); filter, sort
+        # and limit work on the indices and rows are only built on access
+        self._selection: Optional[Tuple[str, np.ndarray]] = None
+        # Sort keys of the selection not applied yet, so a following limit
+        # only has to order the rows it keeps
+        self._sort_keys: Optional[np.ndarray] = None
+        self._rows: Optional[List[Dict[str, Any]]] = []
+
+    @property
+    def current_data(self) -> List[Dict[str, Any]]:
+        """The current rows, materialized from the selection if needed."""
+        if self._rows is None:
+            table_name, idx = self._sorted_selection()
+            rows = self.tables[table_name]
+            self._rows = [rows[i] for i in idx]
+        return self._rows
+
+    @current_data.setter
+    def current_data(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows = rows
+        self._selection = None
+        self._sort_keys = None
+
+    def _select_rows(
+        self, table_name: str, idx: np.ndarray, sort_keys: Optional[np.ndarray] = None
+    ) -> None:
+        """Make rows `idx` of a large table current, without building them."""
+        self._selection = (table_name, idx)
+        self._sort_keys = sort_keys
+        self._rows = None
+
+    def _sorted_selection(self, n: Optional[int] = None) -> Tuple[str, np.ndarray]:
+        """
+        Apply a deferred sort to the selection and return it.
+
+        With `n`, only the first n rows are kept and ordered: a partition
+        finds the n-th smallest key, and just the rows up to it are sorted.
+        Ties keep selection order, exactly as a full stable sort would.
+        """
+        keys = self._sort_keys
+        if keys is None:
+            return self._selection
+        import numpy as np
+
+        table_name, idx = self._selection
+        if n is not None and 0 < n < len(keys):
+            kth = np.partition(keys, n - 1)[n - 1]
+            candidates = np.flatnonzero(keys <= kth)
+            order = candidates[np.argsort(keys[candidates], kind="stable")[:n]]
+        else:
+            order = np.argsort(keys, kind="stable")
+        self._select_rows(table_name, idx[order])
+        return self._selection
+
+    def _column(self, table_name: str, field: str) -> Optional[np.ndarray]:
+        """Return the cached numeric column for a large table, if available."""
+        cache = self.columns.get(table_name)
+        if cache is None:
+            return None
+        if field not in cache:
+            cache[field] = _numeric_column(self.tables[table_name], field)
+        return cache[field]
 
     def load_stmt(self, name, filepath):
         """Load a JSON table from file."""
@@ -34,14 +182,21 @@ class TinySQLTransformer(Transformer):
         file_path = str(filepath)[1:-1]  # Remove quotes
 
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
-                self.tables[table_name] = data
-                self.current_table = table_name
-                self.current_data = data
-                self.output.append(f"Loaded {len(data)} rows into {table_name}")
+            data = _load_table(file_path)
+            self.tables[table_name] = data
+            if len(data) >= _VECTORIZE_MIN_ROWS:
+                self.columns[table_name] = {}
+            else:
+                self.columns.pop(table_name, None)
+            self.current_table = table_name
+            self.current_data = data
+            if table_name in self.columns:
+                import numpy as np
+
+                self._selection = (table_name, np.arange(len(data)))
+            self._emit(f"Loaded {len(data)} rows into {table_name}")
         except Exception as e:
-            self.output.append(f"Error loading {file_path}: {e}")
+            self._emit(f"Error loading {file_path}: {e}")
 
     def filter_stmt(self, table_name, field, op, val):
         """Filter rows where field matches condition."""
@@ -50,7 +205,7 @@ class TinySQLTransformer(Transformer):
         op = str(op)
 
         if table_name not in self.tables:
-            self.output.append(f"Error: Table {table_name} not found")
+            self._emit(f"Error: Table {table_name} not found")
             return
 
         # Get value
@@ -59,40 +214,31 @@ class TinySQLTransformer(Transformer):
             # Remove quotes from strings
             if value.startswith('"') or value.startswith("'"):
                 value = value[1:-1]
-            # Try to convert to number
-            try:
-                value = float(value)
-            except (ValueError, TypeError):
-                pass
+            # Convert numbers (including quoted numeric strings)
+            value = float(value) if val.type == "NUMBER" else _as_number(value)
         else:
             value = str(val)
 
-        # Filter logic
-        filtered = []
-        for row in self.tables[table_name]:
-            row_val = row.get(field)
-            if row_val is None:
-                continue
-
-            match = False
-            if op == "=":
-                match = row_val == value
-            elif op == ">":
-                match = row_val > value
-            elif op == "<":
-                match = row_val < value
-            elif op == ">=":
-                match = row_val >= value
-            elif op == "<=":
-                match = row_val <= value
-            elif op == "!=":
-                match = row_val != value
-
-            if match:
-                filtered.append(row)
+        # Filter logic: resolve the operator once, not per row
+        op_fn = _OPS[op]
+        rows = self.tables[table_name]
+        column = self._column(table_name, field) if isinstance(value, float) else None
+        if column is not None:
+            import numpy as np
+
+            mask = op_fn(column, value) & ~np.isnan(column)
+            idx = np.flatnonzero(mask)
+            self._select_rows(table_name, idx)
+            self._emit(f"Filtered to {len(idx)} rows")
+            return
 
+        filtered = [
+            row
+            for row in rows
+            if (row_val := row.get(field)) is not None and op_fn(row_val, value)
+        ]
         self.current_data = filtered
-        self.output.append(f"Filtered to {len(filtered)} rows")
+        self._emit(f"Filtered to {len(filtered)} rows")
 
     def select_stmt(self, names):
         """Select specific columns."""
@@ -101,66 +247,99 @@ class TinySQLTransformer(Transformer):
         else:
             fields = [str(names)]
 
-        selected = []
-        for row in self.current_data:
-            new_row = {field: row.get(field) for field in fields if field in row}
-            selected.append(new_row)
+        selected = [
+            {field: row[field] for field in fields if field in row}
+            for row in self.current_data
+        ]
 
         self.current_data = selected
-        # Output the selected data as JSON
-        self.output.append(json.dumps(selected, indent=2))
+        # Output the selected data as JSON (rows are only materialized here)
+        self._emit(json.dumps(selected, indent=2))
 
     def sort_stmt(self, field, order=None):
         """Sort by field."""
         field = str(field)
         reverse = str(order) == "desc" if order else False
 
+        # Vectorized path: selected rows of a large table, numeric in `field`
+        column = None
+        if self._selection is not None:
+            table_name, idx = self._sorted_selection()
+            column = self._column(table_name, field)
+        if column is not None:
+            import numpy as np
+
+            values = column[idx]
+            if not np.isnan(values).any():
+                # Ordered when the rows are next needed (see _sorted_selection)
+                self._select_rows(table_name, idx, -values if reverse else values)
+                self._emit(f"Sorted by {field} {'desc' if reverse else 'asc'}")
+                return
+
         try:
-            self.current_data = sorted(
-                self.current_data, key=lambda x: x.get(field, 0), reverse=reverse
-            )
-            self.output.append(f"Sorted by {field} {'desc' if reverse else 'asc'}")
+            try:
+                # C-level key; rows missing the field fall back to a key of 0
+                rows = sorted(
+                    self.current_data, key=operator.itemgetter(field), reverse=reverse
+                )
+            except KeyError:
+                rows = sorted(
+                    self.current_data, key=lambda x: x.get(field, 0), reverse=reverse
+                )
+            self.current_data = rows
+            self._emit(f"Sorted by {field} {'desc' if reverse else 'asc'}")
         except Exception as e:
-            self.output.append(f"Error sorting: {e}")
+            self._emit(f"Error sorting: {e}")
 
     def limit_stmt(self, n):
         """Limit number of rows."""
         n = int(n)
-        self.current_data = self.current_data[:n]
-        self.output.append(f"Limited to {n} rows")
+        if self._selection is not None:
+            table_name, idx = self._sorted_selection(n)
+            self._select_rows(table_name, idx[:n])
+        else:
+            self.current_data = self.current_data[:n]
+        self._emit(f"Limited to {n} rows")
 
     def show_stmt(self):
         """Show all table names."""
         tables = list(self.tables.keys())
-        self.output.append(f"Tables: {', '.join(tables)}")
+        self._emit(f"Tables: {', '.join(tables)}")
 
     def join_stmt(self, other_table, left_key, right_key):
         """Simple inner join (placeholder)."""
-        self.output.append("Join not fully implemented yet")
+        self._emit("Join not fully implemented yet")
 
     def name_list(self, *names):
         """List of field names."""
         return [str(n) for n in names]
 
-    def value(self, v):
-        """A value (string, number, or name)."""
-        return v
+    def _emit(self, line: str):
+        """Append one line of output."""
+        self.output.write(line)
+        self.output.write("\n")
 
     def start(self, *statements):
-        return "\n".join(self.output)
+        # Drop the trailing newline written after the last line
+        return self.output.getvalue()[:-1]
 
 
 class LarkTinySQLParser:
     """Public TinySQL parser interface."""
 
     def __init__(self):
-        with open(TINYSQL_GRAMMAR_PATH, "r") as f:
-            grammar = f.read()
-        self.parser = Lark(grammar, parser="lalr", transformer=TinySQLTransformer())
+        # Keep the contextual lexer: "=" is both a COMP_OP (filter) and a
+        # literal (join), which only the parser state can disambiguate.
+        self.parser = get_lark(TINYSQL_GRAMMAR_PATH, maybe_placeholders=False)
 
     def parse(self, code: str) -> str:
-        """Parse and execute TinySQL code."""
+        """Parse and execute TinySQL code with a fresh transformer."""
         try:
-            return self.parser.parse(code)
+            tree = self.parser.parse(code)
+            try:
+                return TinySQLTransformer().transform(tree)
+            except VisitError as e:
+                # Surface the statement's own error rather than Lark's wrapper
+                raise e.orig_exc from None
         except Exception as e:
             raise ValueError(f"TinySQL parse error: {e}")
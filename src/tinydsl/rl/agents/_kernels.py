@@ -0,0 +1,170 @@
+"""Numeric kernels shared by RL agents."""
+
+from typing import Sequence
+
+import numpy as np
+
+
+def stable_softmax(logits: np.ndarray) -> np.ndarray:
+    """
+    Numerically stable softmax over the last axis.
+
+    Works on a single logit vector or a (T, actions) batch. The result is
+    computed in one freshly allocated buffer that is exponentiated and
+    normalized in place.
+
+    Args:
+        logits: Logits, shape (actions,) or (T, actions)
+
+    Returns:
+        Probabilities with the same shape as `logits`
+    """
+    probs = logits - logits.max(axis=-1, keepdims=True)
+    np.exp(probs, out=probs)
+    probs /= probs.sum(axis=-1, keepdims=True)
+    return probs
+
+
+def discounted_returns(rewards: Sequence[float], gamma: float) -> np.ndarray:
+    """
+    Discounted return G_t = r_t + gamma * G_{t+1} for every timestep.
+
+    Single reverse pass writing into a preallocated array (O(T)).
+
+    Args:
+        rewards: Per-step rewards in episode order
+        gamma: Discount factor
+
+    Returns:
+        Array of returns, same length as `rewards`
+    """
+    returns = np.empty(len(rewards), dtype=np.float64)
+    G = 0.0
+    for t in range(len(rewards) - 1, -1, -1):
+        G = rewards[t] + gamma * G
+        returns[t] = G
+    return returns
+
+
+def q_update(
+    weights: np.ndarray,
+    observation: np.ndarray,
+    next_observation: np.ndarray,
+    action: int,
+    reward: float,
+    done: bool,
+    lr: float,
+    gamma: float,
+) -> float:
+    """
+    One Q-learning TD update of linear Q weights, applied in place.
+
+    The step size is folded into a single scalar first, so the only
+    vector temporary is the scaled observation added to the action column.
+
+    Args:
+        weights: Q weights (state_size x action_space_size), updated in place
+        observation: Current state
+        next_observation: Next state
+        action: Action taken
+        reward: Reward received
+        done: Whether the episode ended (no bootstrap)
+        lr: Learning rate
+        gamma: Discount factor
+
+    Returns:
+        TD error
+    """
+    column = weights[:, action]
+    q_current = float(observation @ column)
+
+    if done:
+        q_target = reward
+    else:
+        q_target = reward + gamma * float((next_observation @ weights).max())
+
+    td_error = q_target - q_current
+    column += (lr * td_error) * observation
+    return td_error
+
+
+def q_update_batch(
+    weights: np.ndarray,
+    observations: np.ndarray,
+    next_observations: np.ndarray,
+    actions: np.ndarray,
+    rewards: np.ndarray,
+    dones: np.ndarray,
+    lr: float,
+    gamma: float,
+) -> np.ndarray:
+    """
+    Apply `q_update` to a stack of transitions, in order.
+
+    Each update bootstraps from the weights left by the previous one, so the
+    result matches calling `q_update` per step; the loop just runs over
+    plain arrays instead of per-step agent calls.
+
+    Args:
+        weights: Q weights (state_size x action_space_size), updated in place
+        observations: States, shape (T, state_size)
+        next_observations: Next states, shape (T, state_size)
+        actions: Actions taken, shape (T,)
+        rewards: Rewards received, shape (T,)
+        dones: Episode-end flags, shape (T,)
+        lr: Learning rate
+        gamma: Discount factor
+
+    Returns:
+        TD errors, shape (T,)
+    """
+    td_errors = np.empty(len(actions), dtype=np.float64)
+    for t in range(len(actions)):
+        td_errors[t] = q_update(
+            weights,
+            observations[t],
+            next_observations[t],
+            int(actions[t]),
+            float(rewards[t]),
+            bool(dones[t]),
+            lr,
+            gamma,
+        )
+    return td_errors
+
+
+def normalized_discounted_returns(
+    rewards: Sequence[float], gamma: float, eps: float = 1e-8
+) -> np.ndarray:
+    """
+    Discounted returns standardized to zero mean and unit variance.
+
+    The mean and variance are accumulated (Welford's method) in the same
+    reverse pass that computes the returns, leaving one vectorized
+    normalization instead of separate mean/std reductions. Episodes of a
+    single step are returned unnormalized.
+
+    Args:
+        rewards: Per-step rewards in episode order
+        gamma: Discount factor
+        eps: Added to the standard deviation to avoid division by zero
+
+    Returns:
+        Array of normalized returns, same length as `rewards`
+    """
+    T = len(rewards)
+    returns = np.empty(T, dtype=np.float64)
+    G = 0.0
+    mean = 0.0
+    m2 = 0.0
+    for n, t in enumerate(range(T - 1, -1, -1), start=1):
+        G = rewards[t] + gamma * G
+        returns[t] = G
+        delta = G - mean
+        mean += delta / n
+        m2 += delta * (G - mean)
+
+    if T > 1:
+        returns -= mean
+        returns /= np.sqrt(m2 / T) + eps
+    return returns
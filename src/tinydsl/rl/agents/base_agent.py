@@ -1,20 +1,46 @@
 """Base agent interface."""
 
 from abc import ABC, abstractmethod
+from typing import Optional
 import numpy as np
 
 
 class BaseAgent(ABC):
-    """Abstract base class for RL agents."""
+    """
+    Abstract base class for RL agents.
 
-    def __init__(self, action_space_size: int):
+    Observations are C-contiguous `DTYPE` (float32) vectors. Subclasses doing
+    array math should pass inputs through `_coerce` once on entry; it is a
+    no-op for arrays that already meet the contract, so callers producing
+    float32 observations pay nothing.
+    """
+
+    DTYPE = np.float32
+
+    def __init__(self, action_space_size: int, seed: Optional[int] = None):
         """
         Initialize agent.
 
         Args:
             action_space_size: Number of possible actions
+            seed: Seed for the agent's random generator
         """
         self.action_space_size = action_space_size
+        # Per-agent generator: independent, reproducible streams per agent
+        self._rng = np.random.default_rng(seed)
+
+    def reseed(self, seed: Optional[int] = None):
+        """
+        Replace the agent's random generator with a freshly seeded one.
+
+        Args:
+            seed: New seed (None for fresh OS entropy)
+        """
+        self._rng = np.random.default_rng(seed)
+
+    def _coerce(self, observation: np.ndarray) -> np.ndarray:
+        """Return `observation` as a C-contiguous `DTYPE` array."""
+        return np.ascontiguousarray(observation, dtype=self.DTYPE)
 
     @abstractmethod
     def act(self, observation: np.ndarray, explore: bool = True) -> int:
@@ -30,6 +56,22 @@ class BaseAgent(ABC):
         """
         pass
 
+    def batch_act(self, observations: np.ndarray, explore: bool = True) -> np.ndarray:
+        """
+        Choose actions for a batch of observations.
+
+        Subclasses with array-based policies override this with a single
+        batched forward pass; the default just calls `act` per row.
+
+        Args:
+            observations: Observations, shape (batch, state_size)
+            explore: Whether to explore (vs exploit)
+
+        Returns:
+            Action indices, shape (batch,)
+        """
+        return np.array([self.act(obs, explore) for obs in observations], dtype=int)
+
     @abstractmethod
     def learn(
         self,
@@ -51,6 +93,45 @@ class BaseAgent(ABC):
         """
         pass
 
+    def learn_batch(
+        self,
+        observations: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_observations: np.ndarray,
+        dones: np.ndarray,
+    ):
+        """
+        Learn from one episode's transitions, stacked into arrays.
+
+        Subclasses whose updates are simple array kernels override this to
+        run the whole episode in one call; the default calls `learn` per step.
+
+        Args:
+            observations: States, shape (T, state_size)
+            actions: Actions taken, shape (T,)
+            rewards: Rewards received, shape (T,)
+            next_observations: Next states, shape (T, state_size)
+            dones: Episode-end flags, shape (T,)
+        """
+        for t in range(len(actions)):
+            self.learn(
+                observations[t],
+                int(actions[t]),
+                float(rewards[t]),
+                next_observations[t],
+                bool(dones[t]),
+            )
+
+    def serialize(self) -> Optional[bytes]:
+        """
+        Snapshot agent parameters as the bytes `save` would write.
+
+        Returns:
+            File contents, or None if the agent has nothing to save
+        """
+        return None
+
     def save(self, filepath: str):
         """Save agent parameters."""
         pass
@@ -1,8 +1,10 @@
 """Policy Gradient (REINFORCE) agent."""
 
+import io
 import numpy as np
-from typing import List, Tuple
+from typing import Optional
 from tinydsl.rl.agents.base_agent import BaseAgent
+from tinydsl.rl.agents._kernels import normalized_discounted_returns, stable_softmax
 
 
 class PolicyGradientAgent(BaseAgent):
@@ -18,6 +20,8 @@ class PolicyGradientAgent(BaseAgent):
         state_size: int = 100,
         learning_rate: float = 0.001,
         gamma: float = 0.99,
+        seed: Optional[int] = None,
+        max_episode_len: int = 256,
     ):
         """
         Initialize policy gradient agent.
@@ -27,28 +31,59 @@ class PolicyGradientAgent(BaseAgent):
             state_size: Observation dimension
             learning_rate: Learning rate
             gamma: Discount factor
+            seed: Seed for the agent's random generator
+            max_episode_len: Initial episode buffer capacity (grows if exceeded)
         """
-        super().__init__(action_space_size)
+        super().__init__(action_space_size, seed)
         self.state_size = state_size
         self.lr = learning_rate
         self.gamma = gamma
 
         # Policy parameters (logits)
-        self.theta = np.random.randn(state_size, action_space_size) * 0.01
+        self.theta = (
+            self._rng.standard_normal((state_size, action_space_size), dtype=self.DTYPE)
+            * 0.01
+        )
+
+        # Episode buffers: preallocated arrays, one row per timestep, filled
+        # up to the cursor `_t` so the update can slice them without copying
+        self._obs_buf = np.empty((max_episode_len, state_size), dtype=self.DTYPE)
+        self._act_buf = np.empty(max_episode_len, dtype=np.int32)
+        self._rew_buf = np.empty(max_episode_len, dtype=np.float64)
+        self._t = 0
+
+    @staticmethod
+    def _policy_kernel(observation: np.ndarray, theta: np.ndarray) -> np.ndarray:
+        """
+        Softmax action probabilities over plain arrays.
+
+        Kept free of `self` so it can be swapped for a compiled version.
 
-        # Episode buffer
-        self.episode_buffer: List[Tuple] = []
+        Args:
+            observation: State vector
+            theta: Policy parameters (state_size x action_space_size)
+
+        Returns:
+            Action probabilities
+        """
+        return stable_softmax(observation @ theta)
 
     def act(self, observation: np.ndarray, explore: bool = True) -> int:
         """Sample action from policy."""
-        logits = observation @ self.theta
-        # Softmax
-        exp_logits = np.exp(logits - np.max(logits))
-        probs = exp_logits / np.sum(exp_logits)
+        probs = self._policy_kernel(self._coerce(observation), self.theta)
+
+        # Sample action by inverting the CDF (scaled by its total to absorb
+        # float32 rounding, so the index is always in range)
+        cdf = probs.cumsum()
+        return int(np.searchsorted(cdf, self._rng.random() * cdf[-1], side="right"))
 
-        # Sample action
-        action = np.random.choice(self.action_space_size, p=probs)
-        return int(action)
+    def batch_act(self, observations: np.ndarray, explore: bool = True) -> np.ndarray:
+        """Sample actions for a batch from one (batch x actions) matmul."""
+        probs = stable_softmax(self._coerce(observations) @ self.theta)
+        # Row-wise inverse CDF, matching act(): count CDF entries <= u
+        cdf = probs.cumsum(axis=1)
+        u = self._rng.random(len(cdf))[:, None] * cdf[:, -1:]
+        return (cdf <= u).sum(axis=1)
 
     def learn(
         self,
@@ -59,42 +94,60 @@ class PolicyGradientAgent(BaseAgent):
         done: bool,
     ):
         """Store experience in buffer."""
-        self.episode_buffer.append((observation, action, reward))
+        t = self._t
+        if t == len(self._act_buf):
+            self._grow_buffers()
+        self._obs_buf[t] = observation
+        self._act_buf[t] = action
+        self._rew_buf[t] = reward
+        self._t = t + 1
 
         if done:
             self._update_policy()
-            self.episode_buffer = []
+            self._t = 0
+
+    def _grow_buffers(self):
+        """Double the episode buffer capacity, keeping stored steps."""
+        capacity = max(1, 2 * len(self._act_buf))
+        for name in ("_obs_buf", "_act_buf", "_rew_buf"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
 
     def _update_policy(self):
         """Update policy using REINFORCE algorithm."""
-        if not self.episode_buffer:
+        T = self._t
+        if T == 0:
             return
 
-        # Calculate discounted returns
-        returns = []
-        G = 0.0
-        for _, _, reward in reversed(self.episode_buffer):
-            G = reward + self.gamma * G
-            returns.insert(0, G)
-
-        returns = np.array(returns)
-        # Normalize returns
-        if len(returns) > 1:
-            returns = (returns - np.mean(returns)) / (np.std(returns) + 1e-8)
-
-        # Policy gradient update
-        for (observation, action, _), G in zip(self.episode_buffer, returns):
-            # Compute softmax probabilities
-            logits = observation @ self.theta
-            exp_logits = np.exp(logits - np.max(logits))
-            probs = exp_logits / np.sum(exp_logits)
-
-            # Gradient: dlog(pi)/dtheta = (e_a - pi) where e_a is one-hot
-            grad = -probs
-            grad[action] += 1.0
-
-            # Update: theta += lr * G * grad * observation
-            self.theta += self.lr * G * np.outer(observation, grad)
+        # Calculate discounted returns, normalized in the same pass
+        returns = normalized_discounted_returns(
+            self._rew_buf[:T].tolist(), self.gamma
+        ).astype(self.DTYPE)
+
+        # Batched policy gradient over the whole episode
+        observations = self._obs_buf[:T]  # (T, state_size) view
+        actions = self._act_buf[:T]
+
+        # Softmax probabilities for every timestep
+        probs = stable_softmax(observations @ self.theta)
+
+        # Gradient: dlog(pi)/dtheta = (e_a - pi) where e_a is one-hot
+        grad = -probs
+        grad[np.arange(T), actions] += 1.0
+
+        # Update: theta += lr * sum_t G_t * outer(o_t, grad_t), as one matmul.
+        # Scaling grad rows in place leaves the matmul result as the only
+        # (state_size x actions) temporary.
+        grad *= (self.lr * returns)[:, None]
+        self.theta += observations.T @ grad
+
+    def serialize(self) -> bytes:
+        """Snapshot policy parameters in .npy format."""
+        buffer = io.BytesIO()
+        np.save(buffer, self.theta)
+        return buffer.getvalue()
 
     def save(self, filepath: str):
         """Save policy parameters."""
@@ -1,7 +1,10 @@
 """Q-Learning agent with function approximation."""
 
+import io
 import numpy as np
+from typing import Optional
 from tinydsl.rl.agents.base_agent import BaseAgent
+from tinydsl.rl.agents._kernels import q_update, q_update_batch
 
 
 class QLearningAgent(BaseAgent):
@@ -20,6 +23,7 @@ class QLearningAgent(BaseAgent):
         epsilon: float = 0.1,
         epsilon_decay: float = 0.995,
         epsilon_min: float = 0.01,
+        seed: Optional[int] = None,
     ):
         """
         Initialize Q-learning agent.
@@ -32,8 +36,9 @@ class QLearningAgent(BaseAgent):
             epsilon: Initial exploration rate
             epsilon_decay: Epsilon decay per episode
             epsilon_min: Minimum epsilon
+            seed: Seed for the agent's random generator
         """
-        super().__init__(action_space_size)
+        super().__init__(action_space_size, seed)
         self.state_size = state_size
         self.lr = learning_rate
         self.gamma = gamma
@@ -42,17 +47,56 @@ class QLearningAgent(BaseAgent):
         self.epsilon_min = epsilon_min
 
         # Q-function: linear weights
-        self.weights = np.random.randn(state_size, action_space_size) * 0.01
+        self.weights = (
+            self._rng.standard_normal((state_size, action_space_size), dtype=self.DTYPE)
+            * 0.01
+        )
 
-    def act(self, observation: np.ndarray, explore: bool = True) -> int:
-        """Epsilon-greedy action selection."""
-        if explore and np.random.random() < self.epsilon:
-            return np.random.randint(0, self.action_space_size)
+    @staticmethod
+    def _act_kernel(
+        observation: np.ndarray,
+        weights: np.ndarray,
+        epsilon: float,
+        rng: np.random.Generator,
+    ) -> int:
+        """
+        Epsilon-greedy selection over plain arrays.
+
+        Kept free of `self` so it can be swapped for a compiled version.
+
+        Args:
+            observation: State vector
+            weights: Q-function weights (state_size x action_space_size)
+            epsilon: Exploration rate (0 disables exploration)
+            rng: Random generator for exploration
+
+        Returns:
+            Action index
+        """
+        if epsilon > 0.0 and rng.random() < epsilon:
+            return int(rng.integers(weights.shape[1]))
 
         # Greedy action
-        q_values = observation @ self.weights
+        q_values = observation @ weights
         return int(np.argmax(q_values))
 
+    def act(self, observation: np.ndarray, explore: bool = True) -> int:
+        """Epsilon-greedy action selection."""
+        epsilon = self.epsilon if explore else 0.0
+        return self._act_kernel(
+            self._coerce(observation), self.weights, epsilon, self._rng
+        )
+
+    def batch_act(self, observations: np.ndarray, explore: bool = True) -> np.ndarray:
+        """Epsilon-greedy actions for a batch, from one (batch x actions) matmul."""
+        actions = (self._coerce(observations) @ self.weights).argmax(axis=1)
+        if explore and self.epsilon > 0.0:
+            batch = len(actions)
+            explore_mask = self._rng.random(batch) < self.epsilon
+            random_actions = self._rng.integers(self.action_space_size, size=batch)
+            actions = np.where(explore_mask, random_actions, actions)
+        return actions
+
     def learn(
         self,
         observation: np.ndarray,
@@ -62,26 +106,50 @@ class QLearningAgent(BaseAgent):
         done: bool,
     ):
         """Q-learning update."""
-        # Current Q-value
-        q_current = observation @ self.weights[:, action]
-
-        # Target Q-value
-        if done:
-            q_target = reward
-        else:
-            q_next_max = np.max(next_observation @ self.weights)
-            q_target = reward + self.gamma * q_next_max
-
-        # TD error
-        td_error = q_target - q_current
-
-        # Gradient update
-        self.weights[:, action] += self.lr * td_error * observation
+        observation = self._coerce(observation)
+        next_observation = self._coerce(next_observation)
+
+        q_update(
+            self.weights,
+            observation,
+            next_observation,
+            action,
+            reward,
+            done,
+            self.lr,
+            self.gamma,
+        )
+
+    def learn_batch(
+        self,
+        observations: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_observations: np.ndarray,
+        dones: np.ndarray,
+    ):
+        """Q-learning updates for a whole episode in one kernel call."""
+        q_update_batch(
+            self.weights,
+            self._coerce(observations),
+            self._coerce(next_observations),
+            actions,
+            rewards,
+            dones,
+            self.lr,
+            self.gamma,
+        )
 
     def decay_epsilon(self):
         """Decay exploration rate."""
         self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
 
+    def serialize(self) -> bytes:
+        """Snapshot weights in .npy format."""
+        buffer = io.BytesIO()
+        np.save(buffer, self.weights)
+        return buffer.getvalue()
+
     def save(self, filepath: str):
         """Save weights."""
         np.save(filepath, self.weights)
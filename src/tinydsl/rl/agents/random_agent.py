@@ -1,6 +1,7 @@
 """Random agent (baseline)."""
 
 import numpy as np
+from typing import Optional
 from tinydsl.rl.agents.base_agent import BaseAgent
 
 
@@ -11,13 +12,17 @@ class RandomAgent(BaseAgent):
     Useful as a baseline to compare against.
     """
 
-    def __init__(self, action_space_size: int):
+    def __init__(self, action_space_size: int, seed: Optional[int] = None):
         """Initialize random agent."""
-        super().__init__(action_space_size)
+        super().__init__(action_space_size, seed)
 
     def act(self, observation: np.ndarray, explore: bool = True) -> int:
         """Choose random action."""
-        return np.random.randint(0, self.action_space_size)
+        return int(self._rng.integers(self.action_space_size))
+
+    def batch_act(self, observations: np.ndarray, explore: bool = True) -> np.ndarray:
+        """Choose one random action per observation."""
+        return self._rng.integers(self.action_space_size, size=len(observations))
 
     def learn(
         self,
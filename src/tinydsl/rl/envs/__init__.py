@@ -1,5 +1,6 @@
 """DSL environments for RL."""
 
 from tinydsl.rl.envs.dsl_env import DSLEnv, make_env
+from tinydsl.rl.envs.vec_env import SubprocVecEnv
 
-__all__ = ["DSLEnv", "make_env"]
+__all__ = ["DSLEnv", "make_env", "SubprocVecEnv"]
@@ -4,9 +4,41 @@ DSL Environment for Reinforcement Learning
 Wraps any TinyDSL as an RL environment compatible with standard interfaces.
 """
 
+import functools
+from pathlib import Path
 from typing import Any, Dict, Tuple, Optional, List
 import numpy as np
 
+from tinydsl.core._json_cache import load_json
+
+# Offsets of the 10 per-token rows in the one-hot part of the observation
+_OBS_ROWS = np.arange(0, 100, 10)
+
+# Max programs whose outputs are memoized per environment before the cache resets
+_RESULT_CACHE_SIZE = 10_000
+
+# DSLs whose output depends on state outside the program (Lexi's
+# remember/recall use server-side memory; TinySQL loads tables from files
+# that can change), so outputs are never memoized
+_STATEFUL_DSLS = frozenset({"lexi", "tinysql"})
+
+
+@functools.lru_cache(maxsize=None)
+def _load_tasks_file(dsl_name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Index a DSL's task file (read through the shared JSON cache), once per process.
+
+    Args:
+        dsl_name: DSL name (selects `<dsl_name>_tasks.json`)
+
+    Returns:
+        Mapping of task id -> task (empty if the file does not exist)
+    """
+    data_dir = Path(__file__).parent.parent.parent / "data"
+    tasks = load_json(data_dir / f"{dsl_name}_tasks.json", default=[])
+    # Reversed so the first task with a given id wins, as with a linear scan
+    return {t["id"]: t for t in reversed(tasks)}
+
 
 class DSLEnv:
     """
@@ -26,6 +58,7 @@ class DSLEnv:
         reward_fn: Optional[callable] = None,
         max_steps: int = 50,
         vocabulary: Optional[List[str]] = None,
+        client: Optional[Any] = None,
     ):
         """
         Initialize DSL environment.
@@ -36,6 +69,8 @@ class DSLEnv:
             reward_fn: Custom reward function (state, action, result) -> float
             max_steps: Maximum steps per episode
             vocabulary: List of valid tokens (auto-generated if None)
+            client: GenericDSLClient used to run programs; pass one to share
+                its connection pool (a default client is created if None)
         """
         self.dsl_name = dsl_name
         self.task_id = task_id
@@ -53,9 +88,31 @@ class DSLEnv:
             self.vocabulary = vocabulary
 
         self.action_space_size = len(self.vocabulary)
+        # Observation column of each action: first vocabulary index of its
+        # token (as list.index would give), mod 10
+        first_idx = {
+            token: i for i, token in reversed(list(enumerate(self.vocabulary)))
+        }
+        self._action_col = np.array(
+            [first_idx[token] % 10 for token in self.vocabulary], dtype=np.intp
+        )
+
+        # Observation scratch buffer, float32 to match BaseAgent.DTYPE
+        self._obs_buf = np.zeros(100, dtype=np.float32)
+
+        # DSL client (created on first execution unless given) and program ->
+        # output memo, since episodes share many prefixes. Only for DSLs whose
+        # output depends on the code alone; a stateful DSL's cached output goes
+        # stale, and a cache hit would skip its side effects.
+        self._client = client
+        self._output_cache: Optional[Dict[str, str]] = (
+            None if dsl_name in _STATEFUL_DSLS else {}
+        )
 
-        # Current program state
+        # Current program state (tokens, plus their action ids for observations)
         self.program = []
+        self._program_ids = np.zeros(max_steps, dtype=np.int32)
+        self._code = ""  # "".join(self.program), kept up to date by step()
         self.done = False
 
         # Reward function
@@ -65,22 +122,14 @@ class DSLEnv:
             self.reward_fn = CorrectnessReward(dsl_name)
         else:
             self.reward_fn = reward_fn
+        # Per-episode hook of BaseReward subclasses; plain callables have none
+        self._reward_reset = getattr(self.reward_fn, "reset", None)
 
     def _load_task(self, task_id: str) -> Dict[str, Any]:
-        """Load task from JSON."""
-        import json
-        from pathlib import Path
-
-        # Find task file
-        data_dir = Path(__file__).parent.parent.parent / "data"
-        task_file = data_dir / f"{self.dsl_name}_tasks.json"
-
-        if task_file.exists():
-            with open(task_file) as f:
-                tasks = json.load(f)
-                task = next((t for t in tasks if t["id"] == task_id), None)
-                if task:
-                    return task
+        """Load task from JSON (cached per DSL)."""
+        task = _load_tasks_file(self.dsl_name).get(task_id)
+        if task:
+            return task
 
         # Fallback
         return {
@@ -197,8 +246,11 @@ class DSLEnv:
             Initial observation
         """
         self.program = []
+        self._code = ""
         self.current_step = 0
         self.done = False
+        if self._reward_reset is not None:
+            self._reward_reset(self.expected_output)
         return self._get_observation()
 
     def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict]:
@@ -216,11 +268,13 @@ class DSLEnv:
 
         # Convert action to token
         token = self.vocabulary[action]
+        self._program_ids[len(self.program)] = action
         self.program.append(token)
+        self._code += token
         self.current_step += 1
 
         # Check if done
-        code = "".join(self.program)
+        code = self._code
         result = self._execute_program(code)
 
         # Calculate reward
@@ -253,13 +307,22 @@ class DSLEnv:
     def _execute_program(self, code: str) -> Dict[str, Any]:
         """Execute DSL program and return result."""
         try:
-            # Use GenericDSLClient to execute
-            from tinydsl.agent_tools.generic_dsl_client import GenericDSLClient
+            cache = self._output_cache
+            output = cache.get(code) if cache is not None else None
+            if output is None:
+                if self._client is None:
+                    # Use GenericDSLClient to execute
+                    from tinydsl.agent_tools.generic_dsl_client import GenericDSLClient
 
-            client = GenericDSLClient()
+                    self._client = GenericDSLClient()
 
-            result = client.run(self.dsl_name, code)
-            output = result.get("output", "")
+                result = self._client.run(self.dsl_name, code)
+                output = result.get("output", "")
+
+                if cache is not None:
+                    if len(cache) >= _RESULT_CACHE_SIZE:
+                        cache.clear()
+                    cache[code] = output
 
             return {
                 "success": output.strip() == self.expected_output.strip(),
@@ -276,28 +339,26 @@ class DSLEnv:
         Returns:
             Numpy array representing current state
         """
-        # Simple one-hot encoding of last N tokens
-        obs_size = 100  # Fixed observation size
-
-        # One-hot encode program tokens
-        obs = np.zeros(obs_size)
+        # Simple one-hot encoding of last N tokens into the fixed-size buffer
+        obs = self._obs_buf
+        obs.fill(0.0)
 
-        for i, token in enumerate(self.program[-10:]):  # Last 10 tokens
-            if token in self.vocabulary:
-                token_idx = self.vocabulary.index(token)
-                obs[i * 10 + (token_idx % 10)] = 1.0
+        # One-hot encode the last 10 program tokens, one row of 10 per token
+        n = len(self.program)
+        recent = self._program_ids[max(0, n - 10) : n]
+        obs[_OBS_ROWS[: len(recent)] + self._action_col[recent]] = 1.0
 
         # Add metadata
         obs[-5] = self.current_step / self.max_steps  # Progress
         obs[-4] = len(self.program) / self.max_steps  # Program length
         obs[-3] = float(self.done)  # Done flag
 
-        return obs
+        # Callers (e.g. episode buffers) may keep observations, so hand out a copy
+        return obs.copy()
 
     def render(self) -> str:
         """Render current state as string."""
-        code = "".join(self.program)
-        return f"Step {self.current_step}/{self.max_steps}\n{code}"
+        return f"Step {self.current_step}/{self.max_steps}\n{self._code}"
 
     def get_action_mask(self) -> np.ndarray:
         """
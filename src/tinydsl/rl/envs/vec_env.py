@@ -0,0 +1,143 @@
+"""
+Vectorized DSL environments.
+
+Runs several environment copies in worker processes so that DSL execution
+inside `step()` happens in parallel, while the agent acts on stacked
+observations in the main process.
+"""
+
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from tinydsl.rl.envs.dsl_env import DSLEnv
+
+
+def _worker(remote, parent_remote, env_fn: Callable[[], DSLEnv]):
+    """
+    Worker loop: own one environment and serve commands over a pipe.
+
+    Commands are `(name, data)` tuples: ("reset", None), ("step", action) or
+    ("close", None). Exceptions raised by the environment are sent back and
+    re-raised in the main process.
+    """
+    parent_remote.close()
+    env = env_fn()
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "close":
+                break
+            try:
+                if cmd == "reset":
+                    remote.send(env.reset())
+                elif cmd == "step":
+                    remote.send(env.step(data))
+                else:
+                    raise ValueError(f"Unknown command: {cmd}")
+            except Exception as e:
+                remote.send(e)
+    finally:
+        remote.close()
+
+
+class SubprocVecEnv:
+    """
+    Run N environments in separate processes behind a batched interface.
+
+    Unlike Gym-style vector envs, finished environments are not reset
+    automatically: callers pass the indices of the environments to step,
+    which lets whole episodes be collected side by side.
+    """
+
+    def __init__(self, env_fns: Sequence[Callable[[], DSLEnv]]):
+        """
+        Start one worker process per environment.
+
+        Args:
+            env_fns: Callables that each build an environment (must be
+                picklable when the process start method is not "fork")
+        """
+        self.num_envs = len(env_fns)
+        self.closed = False
+
+        self.remotes, work_remotes = zip(
+            *[multiprocessing.Pipe() for _ in range(self.num_envs)]
+        )
+        self.processes = []
+        for work_remote, remote, env_fn in zip(work_remotes, self.remotes, env_fns):
+            process = multiprocessing.Process(
+                target=_worker, args=(work_remote, remote, env_fn), daemon=True
+            )
+            process.start()
+            work_remote.close()
+            self.processes.append(process)
+
+    def _recv(self, i: int) -> Any:
+        """Receive a reply from worker i, re-raising worker exceptions."""
+        result = self.remotes[i].recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def reset(self, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Reset environments.
+
+        Args:
+            indices: Environments to reset (all if None)
+
+        Returns:
+            Stacked observations, shape (len(indices), obs_dim)
+        """
+        indices = range(self.num_envs) if indices is None else indices
+        for i in indices:
+            self.remotes[i].send(("reset", None))
+        return np.stack([self._recv(i) for i in indices])
+
+    def step(
+        self, actions: Sequence[int], indices: Optional[Sequence[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """
+        Step environments in parallel.
+
+        Args:
+            actions: One action per stepped environment
+            indices: Environments to step (all if None)
+
+        Returns:
+            (observations, rewards, dones, infos), batched over `indices`
+        """
+        indices = range(self.num_envs) if indices is None else indices
+        for i, action in zip(indices, actions):
+            self.remotes[i].send(("step", int(action)))
+        results = [self._recv(i) for i in indices]
+
+        observations, rewards, dones, infos = zip(*results)
+        return (
+            np.stack(observations),
+            np.array(rewards, dtype=np.float64),
+            np.array(dones, dtype=bool),
+            list(infos),
+        )
+
+    def close(self):
+        """Stop all worker processes."""
+        if self.closed:
+            return
+        for remote in self.remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+        for remote in self.remotes:
+            remote.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -24,3 +24,15 @@ class BaseReward(ABC):
             Reward value
         """
         pass
+
+    def reset(self, expected: str):
+        """
+        Prepare for a new episode.
+
+        Called by the environment on reset so subclasses can precompute
+        anything derived from the expected output once per episode.
+
+        Args:
+            expected: Expected output for the episode
+        """
+        pass
@@ -1,6 +1,7 @@
 """Correctness-based reward function."""
 
 from typing import Any, List, Dict
+import numpy as np
 from tinydsl.rl.rewards.base_reward import BaseReward
 
 
@@ -24,6 +25,18 @@ class CorrectnessReward(BaseReward):
         """
         self.dsl_name = dsl_name
         self.step_penalty = step_penalty
+        # Expected output the cached fields below were derived from
+        self._expected = None
+        self._expected_stripped = ""
+        self._expected_codes = np.empty(0, dtype=np.uint32)
+
+    def reset(self, expected: str):
+        """Precompute the stripped expected output and its code points."""
+        self._expected = expected
+        self._expected_stripped = expected.strip()
+        self._expected_codes = np.frombuffer(
+            self._expected_stripped.encode("utf-32-le"), dtype=np.uint32
+        )
 
     def __call__(
         self, state: List[str], action: str, result: Dict[str, Any], expected: str
@@ -52,15 +65,22 @@ class CorrectnessReward(BaseReward):
         if not expected:
             return 0.0
 
+        # Per-episode work on `expected` is cached; reset() normally primes it
+        if expected is not self._expected:
+            self.reset(expected)
+
         # Simple character-level similarity
         output = output.strip()
-        expected = expected.strip()
+        expected = self._expected_stripped
 
         if output == expected:
             return 1.0
 
-        # Levenshtein-like similarity
-        matches = sum(1 for a, b in zip(output, expected) if a == b)
+        # Levenshtein-like similarity: positional matches over the common prefix
+        # length, compared as UTF-32 code points (one array element per char)
+        n = min(len(output), len(expected))
+        a = np.frombuffer(output[:n].encode("utf-32-le"), dtype=np.uint32)
+        matches = int(np.count_nonzero(a == self._expected_codes[:n]))
         max_len = max(len(output), len(expected))
 
         return matches / max_len if max_len > 0 else 0.0
@@ -33,12 +33,10 @@ class EfficiencyReward(BaseReward):
         self, state: List[str], action: str, result: Dict[str, Any], expected: str
     ) -> float:
         """Calculate reward based on correctness and efficiency."""
-        reward = 0.0
-
-        # Length penalty
+        # Length penalty (only for tokens over the target)
         program_length = len(state)
-        if program_length > self.target_length:
-            reward += -self.length_penalty * (program_length - self.target_length)
+        overshoot = program_length - self.target_length
+        reward = -self.length_penalty * overshoot if overshoot > 0 else 0.0
 
         if result.get("error"):
             reward += -2.0
@@ -0,0 +1,71 @@
+"""Background writer for training checkpoints."""
+
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+
+class CheckpointWriter:
+    """
+    Write checkpoint files on a background thread.
+
+    The trainer hands over already-serialized bytes, so the snapshot is taken
+    at enqueue time and the training loop never waits on disk I/O. Agents
+    that can only `save(path)` are handed over as that call instead. The thread
+    only runs between the first write and `flush`, so worker processes forked
+    outside that window (see SubprocVecEnv) come from a single-threaded parent.
+    """
+
+    def __init__(self):
+        """Create the (not yet started) writer."""
+        self.q: "queue.Queue[tuple]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def _worker(self):
+        """Drain the queue to disk until a None item, keeping the first failure."""
+        while True:
+            item = self.q.get()
+            if item is None:
+                break
+            path, data = item
+            try:
+                if callable(data):
+                    data(path)
+                else:
+                    Path(path).write_bytes(data)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self.q.task_done()
+
+    def write(self, path: Union[str, Path], data: Union[bytes, Callable[[str], None]]):
+        """
+        Queue `data` to be written to `path`.
+
+        Args:
+            path: Destination file
+            data: File contents, or a function that writes the file given
+                its path
+        """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._worker, daemon=True)
+            self.thread.start()
+        self.q.put((path, data))
+
+    def flush(self):
+        """
+        Block until all queued writes are on disk, then stop the thread.
+
+        Raises:
+            OSError (or the original error): If a queued write failed
+        """
+        if self.thread is not None:
+            self.q.put(None)
+            self.thread.join()
+            self.thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
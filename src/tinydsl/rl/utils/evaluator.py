@@ -1,11 +1,59 @@
 """RL evaluation utilities."""
 
-from typing import Dict, Any, List
+import multiprocessing
+from typing import Dict, Any, List, Optional, Tuple
 from tinydsl.rl.envs.dsl_env import DSLEnv
 from tinydsl.rl.agents.base_agent import BaseAgent
 import numpy as np
 
 
+def _rollout_episodes(
+    agent: BaseAgent, env: DSLEnv, n_episodes: int, seed: Optional[int] = None
+) -> Tuple[List[float], List[int], List[float], List[str]]:
+    """
+    Run greedy evaluation episodes.
+
+    Top-level so it can be shipped to worker processes.
+
+    Args:
+        agent: RL agent to evaluate
+        env: Environment
+        n_episodes: Number of episodes
+        seed: Reseed the agent's randomness (used for worker processes,
+            which otherwise all inherit the same random state)
+
+    Returns:
+        (rewards, lengths, successes, programs)
+    """
+    if seed is not None:
+        agent.reseed(seed)
+
+    rewards = []
+    lengths = []
+    successes = []
+    programs = []
+
+    for _ in range(n_episodes):
+        observation = env.reset()
+        done = False
+        episode_reward = 0.0
+        episode_length = 0
+
+        while not done:
+            action = agent.act(observation, explore=False)
+            observation, reward, done, info = env.step(action)
+            episode_reward += reward
+            episode_length += 1
+
+        rewards.append(episode_reward)
+        lengths.append(episode_length)
+        success = info.get("result", {}).get("success", False)
+        successes.append(1.0 if success else 0.0)
+        programs.append(info.get("current_code", ""))
+
+    return rewards, lengths, successes, programs
+
+
 class RLEvaluator:
     """
     Evaluator for RL agents on DSL tasks.
@@ -18,7 +66,11 @@ class RLEvaluator:
         pass
 
     def evaluate_agent(
-        self, agent: BaseAgent, env: DSLEnv, n_episodes: int = 100
+        self,
+        agent: BaseAgent,
+        env: DSLEnv,
+        n_episodes: int = 100,
+        n_workers: int = 1,
     ) -> Dict[str, Any]:
         """
         Evaluate agent comprehensively.
@@ -27,32 +79,31 @@ class RLEvaluator:
             agent: RL agent to evaluate
             env: Environment
             n_episodes: Number of episodes
+            n_workers: Worker processes to spread episodes over. Evaluation
+                does not update the agent, so episodes are independent; each
+                worker gets its own copy of the agent and environment.
 
         Returns:
             Detailed evaluation metrics
         """
-        rewards = []
-        lengths = []
-        successes = []
-        programs = []
-
-        for _ in range(n_episodes):
-            observation = env.reset()
-            done = False
-            episode_reward = 0.0
-            episode_length = 0
-
-            while not done:
-                action = agent.act(observation, explore=False)
-                observation, reward, done, info = env.step(action)
-                episode_reward += reward
-                episode_length += 1
-
-            rewards.append(episode_reward)
-            lengths.append(episode_length)
-            success = info.get("result", {}).get("success", False)
-            successes.append(1.0 if success else 0.0)
-            programs.append(info.get("current_code", ""))
+        n_workers = max(1, min(n_workers, n_episodes))
+        if n_workers == 1:
+            rewards, lengths, successes, programs = _rollout_episodes(
+                agent, env, n_episodes
+            )
+        else:
+            # Split episodes as evenly as possible, one seed per worker
+            counts = [len(c) for c in np.array_split(np.arange(n_episodes), n_workers)]
+            seeds = np.random.SeedSequence().generate_state(n_workers)
+            with multiprocessing.Pool(n_workers) as pool:
+                chunks = pool.starmap(
+                    _rollout_episodes,
+                    [(agent, env, k, int(seed)) for k, seed in zip(counts, seeds)],
+                )
+            rewards = [r for chunk in chunks for r in chunk[0]]
+            lengths = [n for chunk in chunks for n in chunk[1]]
+            successes = [s for chunk in chunks for s in chunk[2]]
+            programs = [p for chunk in chunks for p in chunk[3]]
 
         return {
             "avg_reward": np.mean(rewards),
@@ -98,24 +149,35 @@ class RLEvaluator:
         Returns:
             Efficiency metrics
         """
-        # Area under curve
-        aucs = [np.trapz(curve) for curve in training_curves]
-
-        # Episodes to threshold (e.g., 80% success)
         threshold = 0.8
-        episodes_to_threshold = []
-        for curve in training_curves:
-            for i, val in enumerate(curve):
-                if val >= threshold:
-                    episodes_to_threshold.append(i)
-                    break
-            else:
-                episodes_to_threshold.append(len(curve))
+        lengths = {len(curve) for curve in training_curves}
+
+        if len(lengths) == 1:
+            # Equal-length curves: one (n_curves, T) array, no Python loops
+            curves = np.asarray(training_curves, dtype=np.float64)
+            # Area under curve
+            aucs = np.trapezoid(curves, axis=1)
+            # Episodes to threshold (e.g., 80% success); T if never reached
+            above = curves >= threshold
+            episodes_to_threshold = np.where(
+                above.any(axis=1), above.argmax(axis=1), curves.shape[1]
+            )
+        else:
+            # Ragged curves: same metrics, one curve at a time
+            aucs = [np.trapezoid(curve) for curve in training_curves]
+            episodes_to_threshold = []
+            for curve in training_curves:
+                above = np.asarray(curve) >= threshold
+                episodes_to_threshold.append(
+                    int(above.argmax()) if above.any() else len(curve)
+                )
 
         return {
             "mean_auc": np.mean(aucs),
             "mean_episodes_to_threshold": np.mean(episodes_to_threshold),
             "convergence_rate": (
-                1.0 / np.mean(episodes_to_threshold) if episodes_to_threshold else 0.0
+                1.0 / np.mean(episodes_to_threshold)
+                if len(episodes_to_threshold)
+                else 0.0
             ),
         }
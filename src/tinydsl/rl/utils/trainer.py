@@ -1,11 +1,18 @@
 """RL training utilities."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from tinydsl.rl.envs.dsl_env import DSLEnv
+from tinydsl.rl.envs.vec_env import SubprocVecEnv
 from tinydsl.rl.agents.base_agent import BaseAgent
+from tinydsl.rl.utils.checkpoint_writer import CheckpointWriter
+import copy
+import functools
+import io
+import os
 import time
 import json
 from pathlib import Path
+import numpy as np
 
 
 class RLTrainer:
@@ -15,7 +22,13 @@ class RLTrainer:
     Handles training loops, logging, checkpointing, and evaluation.
     """
 
-    def __init__(self, env: DSLEnv, agent: BaseAgent, log_dir: Optional[str] = None):
+    def __init__(
+        self,
+        env: DSLEnv,
+        agent: BaseAgent,
+        log_dir: Optional[str] = None,
+        num_envs: int = 1,
+    ):
         """
         Initialize trainer.
 
@@ -23,11 +36,21 @@ class RLTrainer:
             env: DSL environment
             agent: RL agent
             log_dir: Directory for logs and checkpoints
+            num_envs: Copies of `env` to run in parallel worker processes
+                during training (1 = step `env` in-process)
         """
         self.env = env
         self.agent = agent
+        self.num_envs = max(1, num_envs)
         self.log_dir = Path(log_dir) if log_dir else Path("output/rl_logs")
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._ckpt_writer = CheckpointWriter()
+        # Exploration decay (if applicable), looked up once, not per episode
+        self._decay_epsilon = getattr(agent, "decay_epsilon", None)
+        # Output paths resolved once; checkpoints only fill in the episode
+        self._ckpt_template = os.fspath(self.log_dir / "checkpoint_ep{}.npy")
+        self._curve_npz_path = os.fspath(self.log_dir / "training_curve.npz")
+        self._curve_json_path = os.fspath(self.log_dir / "training_curve.json")
 
         self.episode_rewards: List[float] = []
         self.episode_lengths: List[int] = []
@@ -59,55 +82,69 @@ class RLTrainer:
 
         start_time = time.time()
 
-        for episode in range(1, num_episodes + 1):
-            # Run episode
-            episode_reward, episode_length, success = self._run_episode()
-
-            self.episode_rewards.append(episode_reward)
-            self.episode_lengths.append(episode_length)
-            self.success_rate.append(1.0 if success else 0.0)
-
-            # Decay exploration (if applicable)
-            if hasattr(self.agent, "decay_epsilon"):
-                self.agent.decay_epsilon()
-
-            # Logging
-            if verbose and episode % eval_every == 0:
-                avg_reward = sum(self.episode_rewards[-eval_every:]) / eval_every
-                avg_length = sum(self.episode_lengths[-eval_every:]) / eval_every
-                success_rate = sum(self.success_rate[-eval_every:]) / eval_every
-                epsilon = getattr(self.agent, "epsilon", None)
-
-                print(f"Episode {episode}/{num_episodes}")
-                print(f"  Avg Reward: {avg_reward:.2f}")
-                print(f"  Avg Length: {avg_length:.1f}")
-                print(f"  Success Rate: {success_rate:.2%}")
-                if epsilon is not None:
-                    print(f"  Epsilon: {epsilon:.3f}")
-                print()
-
-            # Checkpointing
-            if episode % save_every == 0:
-                self._save_checkpoint(episode)
-
-        elapsed = time.time() - start_time
-
-        # Final evaluation
-        final_eval = self.evaluate(n_episodes=10)
+        vec_env = self._make_vec_env()
+        try:
+            episode = 0
+            while episode < num_episodes:
+                # Run episode(s): one in-process, or a batch across workers
+                if vec_env is None:
+                    results = [self._run_episode()]
+                else:
+                    batch = min(self.num_envs, num_episodes - episode)
+                    results = self._run_vec_episodes(vec_env, batch)
+
+                for episode_reward, episode_length, success in results:
+                    episode += 1
+
+                    self.episode_rewards.append(episode_reward)
+                    self.episode_lengths.append(episode_length)
+                    self.success_rate.append(1.0 if success else 0.0)
+
+                    # Decay exploration (if applicable)
+                    if self._decay_epsilon is not None:
+                        self._decay_epsilon()
+
+                    # Logging
+                    if verbose and episode % eval_every == 0:
+                        avg_reward = np.mean(self.episode_rewards[-eval_every:])
+                        avg_length = np.mean(self.episode_lengths[-eval_every:])
+                        success_rate = np.mean(self.success_rate[-eval_every:])
+                        epsilon = getattr(self.agent, "epsilon", None)
+
+                        # One write per report, blank line included
+                        lines = [
+                            f"Episode {episode}/{num_episodes}",
+                            f"  Avg Reward: {avg_reward:.2f}",
+                            f"  Avg Length: {avg_length:.1f}",
+                            f"  Success Rate: {success_rate:.2%}",
+                        ]
+                        if epsilon is not None:
+                            lines.append(f"  Epsilon: {epsilon:.3f}")
+                        print("\n".join(lines) + "\n")
+
+                    # Checkpointing
+                    if episode % save_every == 0:
+                        self._save_checkpoint(episode)
+            elapsed = time.time() - start_time
+
+            # Final evaluation (on the workers, if any, before they stop)
+            final_eval = self.evaluate(n_episodes=10, vec_env=vec_env)
+            self._save_training_curve()
+        finally:
+            if vec_env is not None:
+                vec_env.close()
+            # Wait for queued checkpoints (and the curve) to hit disk, even
+            # if training failed part way
+            self._ckpt_writer.flush()
 
         stats = {
             "total_episodes": num_episodes,
             "elapsed_seconds": elapsed,
-            "final_avg_reward": sum(self.episode_rewards[-100:])
-            / min(100, len(self.episode_rewards)),
-            "final_success_rate": sum(self.success_rate[-100:])
-            / min(100, len(self.success_rate)),
+            "final_avg_reward": float(np.mean(self.episode_rewards[-100:])),
+            "final_success_rate": float(np.mean(self.success_rate[-100:])),
             "evaluation": final_eval,
         }
 
-        # Save training curve
-        self._save_training_curve()
-
         if verbose:
             print("✅ Training complete!")
             print(f"⏱️ Time: {elapsed:.1f}s")
@@ -140,59 +177,185 @@ class RLTrainer:
 
         return episode_reward, episode_length, success
 
-    def evaluate(self, n_episodes: int = 10) -> Dict[str, Any]:
+    def _make_vec_env(self) -> Optional[SubprocVecEnv]:
+        """Start worker copies of the environment if num_envs > 1."""
+        if self.num_envs == 1:
+            return None
+        env_fn = functools.partial(copy.deepcopy, self.env)
+        return SubprocVecEnv([env_fn] * self.num_envs)
+
+    def _run_vec_episodes(
+        self, vec_env: SubprocVecEnv, n: int
+    ) -> List[Tuple[float, int, bool]]:
+        """
+        Run one episode in each of the first `n` worker environments.
+
+        Actions are chosen with a single batched `act` over all running
+        environments. Transitions are fed to `agent.learn_batch` afterwards,
+        one stacked episode at a time, since episodic agents (e.g. REINFORCE)
+        buffer a single episode between updates.
+        """
+        active = np.arange(n)
+        observations = vec_env.reset(active)
+        transitions: List[List[tuple]] = [[] for _ in range(n)]
+        episode_rewards = [0.0] * n
+        successes = [False] * n
+
+        while len(active):
+            actions = self.agent.batch_act(observations, explore=True)
+            next_observations, rewards, dones, infos = vec_env.step(actions, active)
+
+            for j, i in enumerate(active):
+                transitions[i].append(
+                    (
+                        observations[j],
+                        int(actions[j]),
+                        float(rewards[j]),
+                        next_observations[j],
+                        bool(dones[j]),
+                    )
+                )
+                episode_rewards[i] += rewards[j]
+                if dones[j]:
+                    successes[i] = infos[j].get("result", {}).get("success", False)
+
+            running = ~dones
+            active = active[running]
+            observations = next_observations[running]
+
+        for episode in transitions:
+            obs, actions, rewards, next_obs, dones = zip(*episode)
+            self.agent.learn_batch(
+                np.stack(obs),
+                np.array(actions),
+                np.array(rewards),
+                np.stack(next_obs),
+                np.array(dones),
+            )
+
+        return [
+            (episode_rewards[i], len(transitions[i]), successes[i]) for i in range(n)
+        ]
+
+    def evaluate(
+        self, n_episodes: int = 10, vec_env: Optional[SubprocVecEnv] = None
+    ) -> Dict[str, Any]:
         """
         Evaluate agent performance.
 
         Args:
             n_episodes: Number of evaluation episodes
+            vec_env: Worker environments to run episodes on in parallel
+                (episodes run one at a time on `self.env` if None)
 
         Returns:
             Evaluation statistics
         """
-        rewards = []
-        lengths = []
-        successes = []
-
-        for _ in range(n_episodes):
-            observation = self.env.reset()
-            done = False
-            episode_reward = 0.0
-            episode_length = 0
-
-            while not done:
-                # No exploration during evaluation
-                action = self.agent.act(observation, explore=False)
-                observation, reward, done, info = self.env.step(action)
-                episode_reward += reward
-                episode_length += 1
-
-            rewards.append(episode_reward)
-            lengths.append(episode_length)
-            successes.append(
-                1.0 if info.get("result", {}).get("success", False) else 0.0
-            )
+        rewards = np.zeros(n_episodes, dtype=np.float64)
+        lengths = np.zeros(n_episodes, dtype=np.int32)
+        successes = np.zeros(n_episodes, dtype=np.float64)
+
+        if vec_env is not None:
+            self._evaluate_vec(vec_env, rewards, lengths, successes)
+        else:
+            for i in range(n_episodes):
+                observation = self.env.reset()
+                done = False
+                episode_reward = 0.0
+                episode_length = 0
+
+                while not done:
+                    # No exploration during evaluation
+                    action = self.agent.act(observation, explore=False)
+                    observation, reward, done, info = self.env.step(action)
+                    episode_reward += reward
+                    episode_length += 1
+
+                rewards[i] = episode_reward
+                lengths[i] = episode_length
+                if info.get("result", {}).get("success", False):
+                    successes[i] = 1.0
 
         return {
-            "avg_reward": sum(rewards) / len(rewards),
-            "avg_length": sum(lengths) / len(lengths),
-            "success_rate": sum(successes) / len(successes),
+            "avg_reward": float(rewards.mean()),
+            "avg_length": float(lengths.mean()),
+            "success_rate": float(successes.mean()),
             "n_episodes": n_episodes,
         }
 
+    def _evaluate_vec(
+        self,
+        vec_env: SubprocVecEnv,
+        rewards: np.ndarray,
+        lengths: np.ndarray,
+        successes: np.ndarray,
+    ):
+        """
+        Fill per-episode evaluation stats using all worker environments.
+
+        A worker whose episode ends is reset straight away and given the
+        next episode, so every worker stays busy until all are handed out.
+        """
+        n_episodes = len(rewards)
+        slots = np.arange(min(vec_env.num_envs, n_episodes))
+        episode_of = slots.copy()  # global episode index run by each slot
+        next_episode = len(slots)
+        observations = vec_env.reset(slots)
+
+        while len(slots):
+            actions = self.agent.batch_act(observations, explore=False)
+            observations, step_rewards, dones, infos = vec_env.step(actions, slots)
+            rewards[episode_of] += step_rewards
+            lengths[episode_of] += 1
+
+            finished = np.flatnonzero(dones)
+            for j in finished:
+                if infos[j].get("result", {}).get("success", False):
+                    successes[episode_of[j]] = 1.0
+
+            # Auto-reset finished workers while episodes remain
+            restart = finished[: n_episodes - next_episode]
+            if len(restart):
+                observations[restart] = vec_env.reset(slots[restart])
+                episode_of[restart] = np.arange(
+                    next_episode, next_episode + len(restart)
+                )
+                next_episode += len(restart)
+
+            running = ~dones
+            running[restart] = True
+            slots = slots[running]
+            episode_of = episode_of[running]
+            observations = observations[running]
+
     def _save_checkpoint(self, episode: int):
-        """Save agent checkpoint."""
-        checkpoint_path = self.log_dir / f"checkpoint_ep{episode}.npy"
-        self.agent.save(str(checkpoint_path))
+        """
+        Queue an agent checkpoint for the background writer.
+
+        Agents without `serialize` fall back to `save`, called on a copy of
+        the agent so the file still holds this episode's parameters.
+        """
+        data = self.agent.serialize()
+        if data is None:
+            data = copy.deepcopy(self.agent).save
+        self._ckpt_writer.write(self._ckpt_template.format(episode), data)
 
     def _save_training_curve(self):
-        """Save training curve data."""
-        data = {
-            "episode_rewards": self.episode_rewards,
-            "episode_lengths": self.episode_lengths,
-            "success_rate": self.success_rate,
+        """
+        Save training curve data.
+
+        The arrays go to `training_curve.npz` as raw binary. The JSON copy is
+        written without indentation, which keeps it on json's C encoder.
+        """
+        arrays = {
+            "episode_rewards": np.asarray(self.episode_rewards, dtype=np.float64),
+            "episode_lengths": np.asarray(self.episode_lengths, dtype=np.int32),
+            "success_rate": np.asarray(self.success_rate, dtype=np.float64),
         }
 
-        curve_path = self.log_dir / "training_curve.json"
-        with open(curve_path, "w") as f:
-            json.dump(data, f, indent=2)
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        self._ckpt_writer.write(self._curve_npz_path, buffer.getvalue())
+
+        data = {key: values.tolist() for key, values in arrays.items()}
+        self._ckpt_writer.write(self._curve_json_path, json.dumps(data).encode())
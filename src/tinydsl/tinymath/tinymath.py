@@ -6,9 +6,9 @@ Supports variables, functions, and mathematical expressions.
 
 from pathlib import Path
 from typing import Any
-import json
 
 from tinydsl.core.base_dsl import BaseDSL
+from tinydsl.core._json_cache import load_json
 from tinydsl.parser.lark_tinymath_parser import LarkTinyMathParser
 
 
@@ -59,23 +59,18 @@ class TinyMathInterpreter(BaseDSL):
         """Reset interpreter state."""
         super().reset()
         self.output = ""
-        self.parser = LarkTinyMathParser()
+        # The parser keeps no state between parse() calls (each run gets a
+        # fresh transformer), so the compiled grammar is reused as-is.
 
     def get_examples(self):
         """Load TinyMath examples from JSON."""
         examples_path = self.grammar_path.parent / "tinymath_examples.json"
-        if examples_path.exists():
-            with open(examples_path) as f:
-                return json.load(f)
-        return []
+        return load_json(examples_path, default=[])
 
     def get_tasks(self):
         """Load TinyMath tasks from JSON."""
         tasks_path = self.grammar_path.parent / "tinymath_tasks.json"
-        if tasks_path.exists():
-            with open(tasks_path) as f:
-                return json.load(f)
-        return []
+        return load_json(tasks_path, default=[])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,37 @@
 """Evaluator for TinyMath DSL tasks."""
 
 from pathlib import Path
+from typing import List, Optional
+import numpy as np
 from tinydsl.core.evaluator import BaseEvaluator
 
 
+def _try_parse_floats(lines: List[str]) -> Optional[np.ndarray]:
+    """
+    Parse output lines as one float array in a single pass.
+
+    Lines are either all plain numbers or all "x = 5.0" assignments (the
+    value after the last "=" is taken).
+
+    Args:
+        lines: Output lines
+
+    Returns:
+        Float64 array, or None if any line is not numeric or the formats mix
+    """
+    with_eq = sum("=" in line for line in lines)
+    if with_eq == len(lines):
+        values = (float(line[line.rfind("=") + 1 :]) for line in lines)
+    elif with_eq == 0:
+        values = (float(line) for line in lines)
+    else:
+        return None
+    try:
+        return np.fromiter(values, dtype=np.float64, count=len(lines))
+    except ValueError:
+        return None
+
+
 class TinyMathEvaluator(BaseEvaluator):
     """
     Evaluator for TinyMath DSL.
@@ -48,6 +76,14 @@ class TinyMathEvaluator(BaseEvaluator):
         if len(gen_lines) != len(exp_lines):
             return False
 
+        # Fast path: both sides fully numeric in the same format, compared
+        # in one array op. NaN differences pass, as with the loop below.
+        gen_vals = _try_parse_floats(gen_lines)
+        if gen_vals is not None and ("=" in generated) == ("=" in expected):
+            exp_vals = _try_parse_floats(exp_lines)
+            if exp_vals is not None:
+                return not np.any(np.abs(gen_vals - exp_vals) > self.tolerance)
+
         for gen_line, exp_line in zip(gen_lines, exp_lines):
             gen_line = gen_line.strip()
             exp_line = exp_line.strip()
@@ -58,10 +94,13 @@ class TinyMathEvaluator(BaseEvaluator):
 
             # Try to extract numbers and compare with tolerance
             try:
-                # Handle "x = 5.0" format
-                if "=" in gen_line and "=" in exp_line:
-                    gen_val = float(gen_line.split("=")[-1].strip())
-                    exp_val = float(exp_line.split("=")[-1].strip())
+                # Handle "x = 5.0" format: value after the last "=" (float()
+                # skips the surrounding whitespace, so no split/strip needed)
+                gen_eq = gen_line.rfind("=")
+                exp_eq = exp_line.rfind("=")
+                if gen_eq >= 0 and exp_eq >= 0:
+                    gen_val = float(gen_line[gen_eq + 1 :])
+                    exp_val = float(exp_line[exp_eq + 1 :])
                 else:
                     gen_val = float(gen_line)
                     exp_val = float(exp_line)
@@ -4,9 +4,9 @@ TinySQL Interpreter - Simple Query DSL
 
 from pathlib import Path
 from typing import Any
-import json
 
 from tinydsl.core.base_dsl import BaseDSL
+from tinydsl.core._json_cache import load_json
 from tinydsl.parser.lark_tinysql_parser import LarkTinySQLParser
 
 
@@ -51,20 +51,15 @@ class TinySQLInterpreter(BaseDSL):
         """Reset interpreter state."""
         super().reset()
         self.output = ""
-        self.parser = LarkTinySQLParser()
+        # The parser keeps no state between parse() calls (each run gets a
+        # fresh transformer), so the compiled grammar is reused as-is.
 
     def get_examples(self):
         """Load TinySQL examples from JSON."""
         examples_path = self.grammar_path.parent / "tinysql_examples.json"
-        if examples_path.exists():
-            with open(examples_path) as f:
-                return json.load(f)
-        return []
+        return load_json(examples_path, default=[])
 
     def get_tasks(self):
         """Load TinySQL tasks from JSON."""
         tasks_path = self.grammar_path.parent / "tinysql_tasks.json"
-        if tasks_path.exists():
-            with open(tasks_path) as f:
-                return json.load(f)
-        return []
+        return load_json(tasks_path, default=[])
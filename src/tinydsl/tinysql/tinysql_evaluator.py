@@ -24,8 +24,22 @@ class TinySQLEvaluator(BaseEvaluator):
         Args:
             benchmark_path: Path to TinySQL tasks JSON file
         """
-        # Initialize with default exact matching comparator
-        super().__init__(benchmark_path)
+        super().__init__(benchmark_path, comparator=self._exact_comparator)
+
+        # Expected outputs stripped once, keyed by the task's own string
+        # (whose hash Python caches), so each comparison strips only `actual`
+        self._expected_stripped = {
+            expected: expected.strip()
+            for expected in (t.get("expected_output", "") for t in self.tasks)
+            if isinstance(expected, str)
+        }
+
+    def _exact_comparator(self, actual: str, expected: str) -> bool:
+        """Exact comparison against the pre-stripped expected output."""
+        stripped = self._expected_stripped.get(expected)
+        if stripped is None:
+            stripped = str(expected).strip()
+        return str(actual).strip() == stripped
 
     def evaluate_output(self, task_id: str, generated_output: str) -> Dict:
         """
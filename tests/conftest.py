@@ -2,14 +2,69 @@
 
 import pytest
 import sys
+import json
 import os
 import shutil
+import socket
+import subprocess
+import time
 from pathlib import Path
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Add src to path for imports
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
+# Seconds to wait for the integration-test server to answer
+_SERVER_START_TIMEOUT = 30.0
+
+
+# Markers of tests that need the API server; left out of the short suite
+_SERVER_MARKERS = ("integration", "requires_server")
+# Only run when named in -m (pytest -m benchmark)
+_BENCHMARK_MARKERS = ("benchmark",)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--full",
+        action="store_true",
+        default=False,
+        help="also run integration tests that need the API server",
+    )
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="train RL smoke tests for a single episode",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Deselect server-backed tests unless --full, and benchmarks always.
+
+    An explicit -m expression replaces the server default, and selects
+    benchmarks only if it names them.
+    """
+    markexpr = config.getoption("markexpr")
+    markers = () if "benchmark" in markexpr else _BENCHMARK_MARKERS
+    if not markexpr and not config.getoption("--full"):
+        markers += _SERVER_MARKERS
+
+    selected, deselected = [], []
+    for item in items:
+        if any(item.get_closest_marker(name) for name in markers):
+            deselected.append(item)
+        else:
+            selected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_memory_directory():
@@ -28,13 +83,139 @@ def setup_memory_directory():
 
     yield
 
-    # Cleanup only in CI environment (GitHub Actions)
-    if os.getenv("CI") or os.getenv("GITHUB_ACTIONS"):
+    # Cleanup only in CI environment (GitHub Actions), and not from a
+    # pytest-xdist worker, since other workers may still be using the directory
+    if (os.getenv("CI") or os.getenv("GITHUB_ACTIONS")) and not os.getenv(
+        "PYTEST_XDIST_WORKER"
+    ):
         if memory_dir.exists():
             shutil.rmtree(memory_dir)
 
 
+@pytest.fixture(scope="session")
+def live_server():
+    """
+    Base API URL of one TinyDSL server shared by all integration tests.
+
+    Uses $TINYDSL_BASE_URL (e.g. http://localhost:8008/api) if set; otherwise
+    starts uvicorn on a free port for the session and stops it at the end.
+    Tests using it are skipped if the server does not come up.
+    """
+    base_url = os.getenv("TINYDSL_BASE_URL")
+    if base_url:
+        yield base_url.rstrip("/")
+        return
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    project_root = Path(__file__).parent.parent
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(src_path), env.get("PYTHONPATH")) if p
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "tinydsl.api.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+        ],
+        cwd=project_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    root_url = f"http://127.0.0.1:{port}"
+
+    try:
+        deadline = time.monotonic() + _SERVER_START_TIMEOUT
+        while True:
+            if process.poll() is not None:
+                pytest.skip("TinyDSL server exited during startup")
+            try:
+                if requests.get(f"{root_url}/dsls", timeout=1).ok:
+                    break
+            except requests.ConnectionError:
+                pass
+            if time.monotonic() > deadline:
+                pytest.skip("TinyDSL server did not start in time")
+            time.sleep(0.1)
+
+        yield f"{root_url}/api"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@pytest.fixture(scope="session")
+def train_episodes(request):
+    """
+    Episode count for RL training smoke tests.
+
+    Returns a function mapping a test's usual count to the count to run:
+    1 under --fast, otherwise the count unchanged.
+    """
+    fast = request.config.getoption("--fast")
+    return lambda num_episodes: 1 if fast else num_episodes
+
+
+@pytest.fixture(scope="session")
+def dsl_client(live_server):
+    """GenericDSLClient for the live server, sharing one connection pool."""
+    from tinydsl.agent_tools.generic_dsl_client import GenericDSLClient
+
+    return GenericDSLClient(base_url=live_server)
+
+
+class MockAPI:
+    """Canned JSON responses served in place of the network, keyed by URL."""
+
+    def __init__(self):
+        self._routes = {}
+        self.calls = []  # (method, url) of each request, in order
+
+    def add(self, method: str, url: str, json_body, status: int = 200):
+        """Register (or replace) the response for a method and URL."""
+        self._routes[(method.upper(), url)] = (status, json_body)
+
+    def send(self, adapter, request, **kwargs):
+        """Stand-in for HTTPAdapter.send that answers from the routes."""
+        url = request.url.split("?", 1)[0]
+        self.calls.append((request.method, url))
+        status, body = self._routes.get((request.method, url), (404, {}))
+        response = requests.Response()
+        response.status_code = status
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+
 @pytest.fixture
+def mocked_api():
+    """
+    Serve HTTP requests from a MockAPI instead of the network.
+
+    Patches the transport layer (HTTPAdapter.send), so every requests.Session
+    is covered and responses still go through raise_for_status() and json().
+    Register routes with mocked_api.add("POST", url, {...}).
+    """
+    api = MockAPI()
+    with patch.object(HTTPAdapter, "send", autospec=True, side_effect=api.send):
+        yield api
+
+
+@pytest.fixture(scope="session")
 def sample_tinycalc_code():
     """Sample TinyCalc code for testing."""
     return """
@@ -43,7 +224,7 @@ convert 5 flurb to grobble
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gli_v1_code():
     """Sample Gli V1 code for testing."""
     return """
@@ -53,7 +234,7 @@ draw circle x=50 y=50
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gli_v2_code():
     """Sample Gli V2 code for testing."""
     return """
@@ -63,7 +244,7 @@ draw circle x=x y=50
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_lexi_v1_code():
     """Sample Lexi V1 code for testing."""
     return """
@@ -72,7 +253,7 @@ say "World"
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_lexi_v2_code():
     """Sample Lexi V2 code for testing."""
     return """
@@ -1,7 +1,7 @@
 """Tests for agent tools."""
 
 import pytest
-from unittest.mock import Mock, patch
+import requests
 from tinydsl.agent_tools.generic_dsl_client import GenericDSLClient, DSLTester
 from tinydsl.agent_tools.tinydsl_tool import TinyDSLTool
 from tinydsl.agent_tools.kait_agent import KAITAgent
@@ -12,22 +12,48 @@ from tinydsl.agent_tools.kait_agent import KAITAgent
 # ====================
 
 
+BASE_URL = "http://localhost:8000"
+
+
+def _evaluation(accuracy, correct, total):
+    """run_all_tasks response with the given accuracy."""
+    return {
+        "evaluation": {
+            "summary": {"accuracy": accuracy},
+            "details": {"correct": correct, "total": total},
+        }
+    }
+
+
+class FakeDSLClient:
+    """Stand-in for GenericDSLClient returning preconfigured responses."""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def run_all_tasks(self, dsl_name, task_ids):
+        return self.responses["run_all_tasks"]
+
+    def run(self, dsl_name, code, **kwargs):
+        return self.responses["run"]
+
+
 class TestGenericDSLClient:
     """Test GenericDSLClient."""
 
     def test_client_initialization(self):
         """Test client initializes with base URL."""
-        client = GenericDSLClient(base_url="http://localhost:8000")
-        assert client.base_url == "http://localhost:8000"
+        client = GenericDSLClient(base_url=BASE_URL)
+        assert client.base_url == BASE_URL
 
-    @patch("requests.get")
-    def test_list_dsls(self, mock_get):
+    def test_list_dsls(self, mocked_api):
         """Test listing available DSLs."""
-        mock_get.return_value.json.return_value = {
-            "dsls": ["tinycalc", "tinysql", "gli", "lexi"]
-        }
+        mocked_api.add(
+            "GET", f"{BASE_URL}/dsls", {"dsls": ["tinycalc", "tinysql", "gli", "lexi"]}
+        )
 
-        client = GenericDSLClient(base_url="http://localhost:8000")
+        client = GenericDSLClient(base_url=BASE_URL)
+        client.invalidate_dsls()
         dsls = client.list_dsls()
 
         assert "tinycalc" in dsls
@@ -35,94 +61,77 @@ class TestGenericDSLClient:
         assert "gli" in dsls
         assert "lexi" in dsls
 
-    @patch("requests.post")
-    def test_run_code(self, mock_post):
+    def test_list_dsls_cached(self, mocked_api):
+        """Test the DSL list is fetched once per base URL until invalidated."""
+        mocked_api.add("GET", f"{BASE_URL}/dsls", {"dsls": ["lexi"]})
+
+        client = GenericDSLClient(base_url=BASE_URL)
+        client.invalidate_dsls()
+        assert client.list_dsls() == ["lexi"]
+        assert GenericDSLClient(base_url=BASE_URL).list_dsls() == ["lexi"]
+        assert len(mocked_api.calls) == 1
+
+        mocked_api.add("GET", f"{BASE_URL}/dsls", {"dsls": ["lexi", "gli"]})
+        client.invalidate_dsls()
+        assert client.list_dsls() == ["lexi", "gli"]
+        assert len(mocked_api.calls) == 2
+
+    def test_run_code(self, mocked_api):
         """Test running DSL code."""
-        mock_post.return_value.json.return_value = {
-            "success": True,
-            "output": "5.0 grobble",
-        }
+        mocked_api.add(
+            "POST",
+            f"{BASE_URL}/tinycalc/run",
+            {"success": True, "output": "5.0 grobble"},
+        )
 
-        client = GenericDSLClient(base_url="http://localhost:8000")
+        client = GenericDSLClient(base_url=BASE_URL)
         result = client.run("tinycalc", "convert 5 flurb to grobble")
 
         assert result["success"] is True
         assert "grobble" in result["output"]
 
-    @patch("requests.post")
-    def test_run_all_tasks(self, mock_post):
+    def test_run_all_tasks(self, mocked_api):
         """Test running all tasks for a DSL."""
+        mocked_api.add(
+            "POST",
+            f"{BASE_URL}/tinycalc/task",
+            {"task_id": "001", "generated_output": "14.0 grobble"},
+        )
+        mocked_api.add(
+            "POST",
+            f"{BASE_URL}/tinycalc/eval",
+            {"summary": {"total_tasks": 1, "accuracy": 1.0}},
+        )
 
-        # Mock both run_task and evaluate calls
-        def mock_response(*args, **kwargs):
-            url = args[0] if args else kwargs.get("url", "")
-            mock_resp = Mock()
-
-            if "/task" in url:
-                # run_task response
-                mock_resp.json.return_value = {
-                    "task_id": "001",
-                    "generated_output": "14.0 grobble",
-                }
-            elif "/eval" in url:
-                # evaluate response
-                mock_resp.json.return_value = {
-                    "summary": {"total_tasks": 1, "accuracy": 1.0}
-                }
-            mock_resp.raise_for_status = Mock()
-            return mock_resp
-
-        mock_post.side_effect = mock_response
-
-        client = GenericDSLClient(base_url="http://localhost:8000")
+        client = GenericDSLClient(base_url=BASE_URL)
         result = client.run_all_tasks("tinycalc", ["001"])
 
         assert "evaluation" in result
         assert "summary" in result["evaluation"]
         assert result["evaluation"]["summary"]["accuracy"] == 1.0
 
+    def test_http_error_raised(self, mocked_api):
+        """Test an error status from the server is raised."""
+        client = GenericDSLClient(base_url=BASE_URL)
+        with pytest.raises(requests.HTTPError):
+            client.run("tinycalc", "convert 5 flurb to grobble")
+
 
 class TestKAITAgent:
     """Test KAITAgent."""
 
-    @patch("tinydsl.agent_tools.kait_agent.GenericDSLClient")
-    def test_kait_agent_initialization(self, mock_client_class):
+    def test_kait_agent_initialization(self):
         """Test KAIT agent initializes correctly."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        agent = KAITAgent("tinycalc", base_url="http://localhost:8000")
+        agent = KAITAgent("tinycalc", base_url=BASE_URL)
 
         assert agent.dsl_name == "tinycalc"
-        assert agent.client == mock_client
-
-    @patch("tinydsl.agent_tools.kait_agent.GenericDSLClient")
-    def test_run_baseline(self, mock_client_class):
-        """Test running baseline evaluation."""
-        mock_client = Mock()
-        mock_client.run_all_tasks.return_value = {
-            "evaluation": {
-                "summary": {"accuracy": 0.5},
-                "details": {"correct": 1, "total": 2},
-            }
-        }
-        mock_client_class.return_value = mock_client
-
-        agent = KAITAgent("tinycalc")
-        result = agent.run_baseline(["001", "002"])
-
-        assert "accuracy" in result
-        assert result["accuracy"] == 0.5
-        assert "details" in result
+        assert isinstance(agent.client, GenericDSLClient)
+        assert agent.client.base_url == BASE_URL
 
-    @patch("tinydsl.agent_tools.kait_agent.GenericDSLClient")
-    def test_expose(self, mock_client_class):
+    def test_expose(self):
         """Test exposure phase."""
-        mock_client = Mock()
-        mock_client.run.return_value = {"status": "ok", "output": "result"}
-        mock_client_class.return_value = mock_client
-
-        agent = KAITAgent("tinycalc")
+        agent = KAITAgent("tinycalc", base_url=BASE_URL, check_contamination=False)
+        agent.client = FakeDSLClient({"run": {"status": "ok", "output": "result"}})
         result = agent.expose(["code1", "code2"], token_budget=100)
 
         assert "episodes_completed" in result
@@ -130,57 +139,22 @@ class TestKAITAgent:
         assert "online_accuracies" in result
         assert "total_tokens" in result
 
-    @patch("tinydsl.agent_tools.kait_agent.GenericDSLClient")
-    def test_run_post_exposure(self, mock_client_class):
-        """Test post-exposure evaluation."""
-        mock_client = Mock()
-        mock_client.run_all_tasks.return_value = {
-            "evaluation": {
-                "summary": {"accuracy": 0.7},
-                "details": {"correct": 7, "total": 10},
-            }
-        }
-        mock_client_class.return_value = mock_client
-
-        agent = KAITAgent("tinycalc")
-        agent.baseline_results = {"accuracy": 0.5}
-        result = agent.run_post_exposure(["003", "004"])
-
-        assert "accuracy" in result
-        assert result["accuracy"] == 0.7
-
-    @patch("tinydsl.agent_tools.kait_agent.GenericDSLClient")
-    def test_run_transfer(self, mock_client_class):
-        """Test transfer evaluation."""
-        mock_client = Mock()
-        mock_client.run_all_tasks.return_value = {
-            "evaluation": {
-                "summary": {"accuracy": 0.6},
-                "details": {"correct": 6, "total": 10},
-            }
-        }
-        mock_client_class.return_value = mock_client
-
-        agent = KAITAgent("tinycalc")
-        result = agent.run_transfer(["005", "006"])
-
-        assert "accuracy" in result
-        assert result["accuracy"] == 0.6
-
-    @patch("tinydsl.agent_tools.kait_agent.GenericDSLClient")
-    def test_generate_report(self, mock_client_class):
-        """Test generating KAIT report."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        agent = KAITAgent("tinycalc")
-        agent.baseline_results = {"accuracy": 0.4, "task_ids": ["001"], "details": {}}
-        agent.post_exposure_results = {
-            "accuracy": 0.7,
-            "task_ids": ["002"],
-            "details": {},
-        }
-        agent.transfer_results = {"accuracy": 0.6, "task_ids": ["003"], "details": {}}
+    def test_pipeline(self):
+        """Test one agent through baseline -> post-exposure -> transfer -> report."""
+        agent = KAITAgent("tinycalc", base_url=BASE_URL, check_contamination=False)
+        agent.client = FakeDSLClient({"run_all_tasks": _evaluation(0.4, 4, 10)})
+
+        baseline = agent.run_baseline(["001", "002"])
+        assert baseline["accuracy"] == 0.4
+        assert "details" in baseline
+
+        agent.client.responses["run_all_tasks"] = _evaluation(0.7, 7, 10)
+        post = agent.run_post_exposure(["003", "004"])
+        assert post["accuracy"] == 0.7
+
+        agent.client.responses["run_all_tasks"] = _evaluation(0.6, 6, 10)
+        transfer = agent.run_transfer(["005", "006"])
+        assert transfer["accuracy"] == 0.6
 
         report = agent.generate_report()
 
@@ -196,15 +170,23 @@ class TestKAITAgent:
 # ====================
 
 
+@pytest.fixture(scope="module")
+def tool(live_server):
+    """Create TinyDSLTool instance (shared by the module)."""
+    return TinyDSLTool(base_url=live_server)
+
+
+@pytest.fixture(scope="module")
+def client(live_server):
+    """Create GenericDSLClient instance (shared by the module)."""
+    return GenericDSLClient(base_url=live_server)
+
+
 @pytest.mark.integration
 @pytest.mark.requires_server
+@pytest.mark.xdist_group("server")
 class TestTinyDSLToolIntegration:
-    """Integration tests for TinyDSLTool. Requires running server."""
-
-    @pytest.fixture
-    def tool(self):
-        """Create TinyDSLTool instance."""
-        return TinyDSLTool()
+    """Integration tests for TinyDSLTool against the shared live server."""
 
     def test_tinycalc_run(self, tool):
         """Test TinyCalc execution."""
@@ -257,13 +239,9 @@ class TestTinyDSLToolIntegration:
 
 @pytest.mark.integration
 @pytest.mark.requires_server
+@pytest.mark.xdist_group("server")
 class TestGenericDSLClientIntegration:
-    """Integration tests for GenericDSLClient. Requires running server."""
-
-    @pytest.fixture
-    def client(self):
-        """Create GenericDSLClient instance."""
-        return GenericDSLClient()
+    """Integration tests for GenericDSLClient against the shared live server."""
 
     def test_list_dsls(self, client):
         """Test listing available DSLs."""
@@ -0,0 +1,71 @@
+"""Tests for the /ast endpoint handlers of every DSL."""
+
+import importlib
+import pkgutil
+
+import pytest
+from fastapi import HTTPException
+
+import tinydsl.api
+from tinydsl.api.common_handlers import DSLHandler
+
+# Sample code for each DSL; a new DSL router without an entry fails the tests
+SAMPLE_CODE = {
+    "tinycalc": "define 1 flurb = 2 grobble\nconvert 1 flurb to grobble",
+    "tinymath": "x = 2 + 3\nprint(x)",
+    "tinysql": "show tables",
+    "lexi": 'say "Hello"',
+    "gli": "set color red\ndraw circle x=50 y=50",
+}
+
+# Every tinydsl.api.routes_<name> module, discovered so new DSLs are covered
+DSL_NAMES = sorted(
+    module.name[len("routes_") :]
+    for module in pkgutil.iter_modules(tinydsl.api.__path__)
+    if module.name.startswith("routes_")
+)
+
+
+@pytest.fixture
+def handler(dsl_name):
+    """The DSLHandler of the DSL under test, imported on first use only."""
+    return importlib.import_module(f"tinydsl.api.routes_{dsl_name}").handler
+
+
+@pytest.fixture
+def code(dsl_name):
+    """Sample code for the DSL under test."""
+    assert dsl_name in SAMPLE_CODE, f"Add sample code for {dsl_name} to SAMPLE_CODE"
+    return SAMPLE_CODE[dsl_name]
+
+
+@pytest.mark.parametrize("dsl_name", DSL_NAMES)
+class TestASTEndpoints:
+    """Test AST parsing through each DSL's handler."""
+
+    def test_ast_tree(self, handler, dsl_name, code):
+        """Test valid code returns the tree, pretty print and DOT output."""
+        response = handler.handle_ast(code, include_dot=True)
+
+        assert response["status"] == "ok"
+        assert response["tree"]["type"] == "start"
+        assert response["tree"]["children"]
+        assert isinstance(response["pretty"], str)
+        assert response["dot"].startswith("digraph G {")
+
+    def test_ast_parse_error(self, handler):
+        """Test invalid code is reported as a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            handler.handle_ast("@@@ ###")
+        assert exc_info.value.status_code == 400
+
+    def test_ast_grammar_shared(self, handler, dsl_name):
+        """Test a new handler for the same grammar reuses the compiled parser."""
+        other = DSLHandler(
+            dsl_class=handler.dsl_class,
+            evaluator_class=handler.evaluator_class,
+            tasks_path=handler.tasks_path,
+            dsl_name=dsl_name,
+            grammar_path=handler.grammar_path,
+        )
+        assert other.ast_parser.parser is handler.ast_parser.parser
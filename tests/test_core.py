@@ -24,35 +24,46 @@ class TestBaseDSL:
             BaseDSL()
 
 
+@pytest.fixture
+def registry():
+    """A fresh, empty registry for tests that mutate it."""
+    return DSLRegistry()
+
+
+@pytest.fixture(scope="module")
+def shared_registry():
+    """A registry with TinyCalc registered, shared by read-only tests."""
+    from tinydsl.tinycalc.tinycalc import TinyCalcInterpreter
+
+    registry = DSLRegistry()
+    registry.register("tinycalc", TinyCalcInterpreter)
+    return registry
+
+
 class TestDSLRegistry:
     """Test DSL registry."""
 
-    def test_registry_initialization(self):
+    def test_registry_initialization(self, registry):
         """Test registry initializes with empty registry."""
-        registry = DSLRegistry()
         assert len(registry.list_dsls()) == 0
 
-    def test_register_dsl(self):
+    def test_register_dsl(self, registry):
         """Test registering a DSL."""
         from tinydsl.tinycalc.tinycalc import TinyCalcInterpreter
 
-        registry = DSLRegistry()
         registry.register("tinycalc", TinyCalcInterpreter)
         assert "tinycalc" in registry.list_dsls()
 
-    def test_get_dsl(self):
+    def test_get_dsl(self, shared_registry):
         """Test retrieving a registered DSL."""
         from tinydsl.tinycalc.tinycalc import TinyCalcInterpreter
 
-        registry = DSLRegistry()
-        registry.register("tinycalc", TinyCalcInterpreter)
-        dsl_class = registry.get("tinycalc")
+        dsl_class = shared_registry.get("tinycalc")
         assert dsl_class == TinyCalcInterpreter
 
-    def test_get_nonexistent_dsl(self):
+    def test_get_nonexistent_dsl(self, shared_registry):
         """Test getting a DSL that doesn't exist."""
-        registry = DSLRegistry()
-        dsl = registry.get("nonexistent")
+        dsl = shared_registry.get("nonexistent")
         assert dsl is None
 
 
@@ -91,16 +102,26 @@ class TestMemory:
         store2.clear()
         assert store2.get("key1") is None
 
+    def test_json_file_memory_batched_writes(self, tmp_path):
+        """Test auto_save=False batches writes until the context exits."""
+        file_path = tmp_path / "test_memory.json"
+
+        with JSONFileMemory(str(file_path), auto_save=False) as store:
+            for i in range(10):
+                store.set(f"key{i}", i)
+            store.delete("key0")
+            # Nothing written yet
+            assert JSONFileMemory(str(file_path)).keys() == []
+
+        reloaded = JSONFileMemory(str(file_path))
+        assert reloaded.keys() == [f"key{i}" for i in range(1, 10)]
+
 
 class TestEvaluator:
     """Test DSL evaluator."""
 
-    def test_evaluator_initialization(self, tmp_path):
+    def test_evaluator_initialization(self):
         """Test evaluator initializes correctly."""
-        import json
-
-        # Create a temporary tasks file
-        tasks_file = tmp_path / "test_tasks.json"
         tasks = [
             {
                 "id": "test_001",
@@ -110,18 +131,12 @@ class TestEvaluator:
                 "difficulty": "easy",
             }
         ]
-        with open(tasks_file, "w") as f:
-            json.dump(tasks, f)
-
-        evaluator = BaseEvaluator(str(tasks_file))
+        evaluator = BaseEvaluator(tasks=tasks)
         assert len(evaluator.tasks) == 1
+        assert evaluator.get_task("test_001")["name"] == "Test Task"
 
-    def test_evaluate_single_task(self, tmp_path):
+    def test_evaluate_single_task(self):
         """Test evaluating a single task."""
-        import json
-
-        # Create a temporary tasks file
-        tasks_file = tmp_path / "test_tasks.json"
         tasks = [
             {
                 "id": "test_001",
@@ -131,12 +146,52 @@ class TestEvaluator:
                 "difficulty": "easy",
             }
         ]
-        with open(tasks_file, "w") as f:
-            json.dump(tasks, f)
-
-        evaluator = BaseEvaluator(str(tasks_file))
+        evaluator = BaseEvaluator(tasks=tasks)
         result = evaluator.evaluate_single("test_001", "2.0 grobble")
 
         assert result["task_id"] == "test_001"
         assert result["passed"] is True
         assert result["status"] == "pass"
+
+
+class TestGetLark:
+    """Test the shared Lark parser registry."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Keep pickled parser tables in a temporary cache dir."""
+        from tinydsl.parser import base_parser
+
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(base_parser, "LARK_CACHE_DIR", cache_dir)
+        return cache_dir
+
+    def test_shared_per_grammar_and_options(self, tmp_path):
+        """Test one parser per (grammar, options), from a file or from text."""
+        from tinydsl.parser.base_parser import get_lark
+
+        grammar = 'start: "a" NAME\n%import common.CNAME -> NAME\n'
+        grammar_file = tmp_path / "a.lark"
+        grammar_file.write_text(grammar)
+
+        parser = get_lark(grammar_file)
+        assert get_lark(str(grammar_file)) is parser
+        assert get_lark(grammar_file, lexer="basic") is not parser
+        assert get_lark(grammar_text=grammar).parse("ab") == parser.parse("ab")
+
+    def test_one_line_grammar_text(self):
+        """Test a single-line grammar is never mistaken for a path."""
+        from tinydsl.parser.base_parser import get_lark
+
+        assert get_lark(grammar_text='start: "x"').parse("x").data == "start"
+        with pytest.raises(TypeError):
+            get_lark()
+
+    def test_tables_cached_in_private_dir(self, cache_dir):
+        """Test parser tables are pickled only into the per-user cache dir."""
+        from tinydsl.parser.base_parser import get_lark
+
+        get_lark(grammar_text='start: "cached"')
+
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+        assert len(list(cache_dir.glob("lark_*.pickle"))) == 1
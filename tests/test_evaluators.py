@@ -2,69 +2,110 @@
 
 import pytest
 import json
-import tempfile
-from pathlib import Path
 
 from tinydsl.core.evaluator import BaseEvaluator
-from tinydsl.lexi.lexi_evaluator import LexiEvaluator
-from tinydsl.tinycalc.tinycalc_evaluator import TinyCalcEvaluator
-from tinydsl.tinysql.tinysql_evaluator import TinySQLEvaluator
-from tinydsl.gli.gli_evaluator import GliEvaluator
-
-
-@pytest.fixture
-def sample_tasks_file():
-    """Create a temporary tasks file for testing."""
-    tasks = [
-        {
-            "id": "test_001",
-            "name": "Test Task 1",
-            "code": "test code",
-            "expected_output": "test output",
-            "difficulty": "easy",
-            "tags": ["basic"],
-        },
-        {
-            "id": "test_002",
-            "name": "Test Task 2",
-            "code": "test code 2",
-            "expected_output": "test output 2",
-            "difficulty": "medium",
-            "tags": ["intermediate"],
-        },
-    ]
-
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(tasks, f)
-        temp_path = f.name
-
-    yield temp_path
-
-    # Cleanup
-    Path(temp_path).unlink()
+
+# The DSL evaluators are imported where they are used, so collecting (or an
+# xdist worker running) only some of these tests skips the other DSLs' imports.
+
+
+# Tasks used by the evaluator tests, in memory and (via sample_tasks_file) on disk
+SAMPLE_TASKS = [
+    {
+        "id": "test_001",
+        "name": "Test Task 1",
+        "code": "test code",
+        "expected_output": "test output",
+        "difficulty": "easy",
+        "tags": ["basic"],
+    },
+    {
+        "id": "test_002",
+        "name": "Test Task 2",
+        "code": "test code 2",
+        "expected_output": "test output 2",
+        "difficulty": "medium",
+        "tags": ["intermediate"],
+    },
+]
+
+# Serialized once; every session tasks file is written from these bytes
+SAMPLE_TASKS_JSON = json.dumps(SAMPLE_TASKS, separators=(",", ":")).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_tasks_file(tmp_path_factory):
+    """Create a tasks file shared by the session (tests only read it)."""
+    path = tmp_path_factory.mktemp("tasks") / "tasks.json"
+    path.write_bytes(SAMPLE_TASKS_JSON)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def base_evaluator(sample_tasks_file):
+    """BaseEvaluator with default settings, shared by the session."""
+    return BaseEvaluator(sample_tasks_file)
+
+
+@pytest.fixture(scope="session")
+def lexi_evaluator(sample_tasks_file):
+    """LexiEvaluator with default settings, shared by the session."""
+    from tinydsl.lexi.lexi_evaluator import LexiEvaluator
+
+    return LexiEvaluator(sample_tasks_file)
+
+
+@pytest.fixture(scope="session")
+def tinycalc_evaluator(sample_tasks_file):
+    """TinyCalcEvaluator shared by the session."""
+    from tinydsl.tinycalc.tinycalc_evaluator import TinyCalcEvaluator
+
+    return TinyCalcEvaluator(sample_tasks_file)
+
+
+@pytest.fixture(scope="session")
+def tinymath_evaluator(sample_tasks_file):
+    """TinyMathEvaluator shared by the session."""
+    from tinydsl.tinymath.tinymath_evaluator import TinyMathEvaluator
+
+    return TinyMathEvaluator(sample_tasks_file)
+
+
+@pytest.fixture(scope="session")
+def tinysql_evaluator(sample_tasks_file):
+    """TinySQLEvaluator shared by the session."""
+    from tinydsl.tinysql.tinysql_evaluator import TinySQLEvaluator
+
+    return TinySQLEvaluator(sample_tasks_file)
+
+
+@pytest.fixture(scope="session")
+def gli_evaluator(sample_tasks_file):
+    """GliEvaluator with default (exact) matching, shared by the session."""
+    from tinydsl.gli.gli_evaluator import GliEvaluator
+
+    return GliEvaluator(sample_tasks_file)
 
 
 class TestBaseEvaluator:
     """Test BaseEvaluator functionality."""
 
-    def test_base_evaluator_exact_match(self, sample_tasks_file):
+    def test_base_evaluator_exact_match(self, base_evaluator):
         """Test BaseEvaluator with exact matching."""
-        evaluator = BaseEvaluator(sample_tasks_file)
-        result = evaluator.evaluate_single("test_001", "test output")
+        result = base_evaluator.evaluate_single("test_001", "test output")
         assert result["passed"] is True
         assert result["status"] == "pass"
 
-    def test_base_evaluator_mismatch(self, sample_tasks_file):
+    def test_base_evaluator_mismatch(self, base_evaluator):
         """Test BaseEvaluator with non-matching output."""
-        evaluator = BaseEvaluator(sample_tasks_file)
-        result = evaluator.evaluate_single("test_001", "wrong output")
+        result = base_evaluator.evaluate_single("test_001", "wrong output")
         assert result["passed"] is False
         assert result["status"] == "fail"
 
-    def test_base_evaluator_fuzzy_match(self, sample_tasks_file):
+    def test_base_evaluator_fuzzy_match(self):
         """Test BaseEvaluator with fuzzy matching."""
         evaluator = BaseEvaluator(
-            sample_tasks_file,
+            tasks=SAMPLE_TASKS,
             comparator=BaseEvaluator.fuzzy_comparator(
                 threshold=0.8, return_metrics=True
             ),
@@ -73,64 +114,135 @@ class TestBaseEvaluator:
         assert result["passed"] is True
         assert "similarity" in result
 
-    def test_base_evaluator_batch(self, sample_tasks_file):
+    def test_base_evaluator_batch(self, base_evaluator):
         """Test batch evaluation."""
-        evaluator = BaseEvaluator(sample_tasks_file)
         results = [
             {"task_id": "test_001", "output": "test output"},
             {"task_id": "test_002", "output": "test output 2"},
         ]
-        report = evaluator.batch_evaluate(results)
+        report = base_evaluator.batch_evaluate(results)
         assert report["accuracy"] == 1.0
         assert report["total"] == 2
         assert report["passed"] == 2
 
-    def test_get_task(self, sample_tasks_file):
+    def test_base_evaluator_async_comparator(self):
+        """Test async comparators are awaited concurrently in batch evaluation."""
+        import asyncio
+
+        in_flight = []
+        peak = []
+
+        async def comparator(actual, expected):
+            in_flight.append(actual)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(actual)
+            return actual == expected
+
+        evaluator = BaseEvaluator(tasks=SAMPLE_TASKS, comparator=comparator)
+        report = evaluator.batch_evaluate(
+            [
+                {"task_id": "test_001", "output": "test output"},
+                {"task_id": "test_002", "output": "wrong"},
+                {"task_id": "missing", "output": "x"},
+            ]
+        )
+        assert [d["passed"] for d in report["details"]] == [True, False, False]
+        assert max(peak) == 2
+
+    def test_base_evaluator_async_single(self, sample_tasks_file):
+        """Test single async evaluations are awaited, not run in a new loop."""
+        import asyncio
+
+        async def comparator(actual, expected):
+            return actual == expected
+
+        evaluator = BaseEvaluator(sample_tasks_file, comparator=comparator)
+
+        async def evaluate_in_loop():
+            return await evaluator.aevaluate_single("test_001", "test output")
+
+        assert asyncio.run(evaluate_in_loop())["passed"]
+        with pytest.raises(TypeError, match="aevaluate_single"):
+            evaluator.evaluate_single("test_001", "test output")
+
+    def test_base_evaluator_uses_orjson(self, sample_tasks_file):
+        """Test task files are decoded with orjson when it is installed."""
+        orjson = pytest.importorskip("orjson")
+        from tinydsl.core import _json_cache
+
+        assert _json_cache.loads is orjson.loads
+        assert BaseEvaluator(sample_tasks_file).tasks == SAMPLE_TASKS
+
+    def test_get_task(self, base_evaluator):
         """Test getting a task by ID."""
-        evaluator = BaseEvaluator(sample_tasks_file)
-        task = evaluator.get_task("test_001")
+        task = base_evaluator.get_task("test_001")
         assert task is not None
         assert task["name"] == "Test Task 1"
 
-    def test_get_tasks_by_difficulty(self, sample_tasks_file):
+    def test_get_tasks_by_difficulty(self, base_evaluator):
         """Test filtering tasks by difficulty."""
-        evaluator = BaseEvaluator(sample_tasks_file)
-        easy_tasks = evaluator.get_tasks_by_difficulty("easy")
+        easy_tasks = base_evaluator.get_tasks_by_difficulty("easy")
         assert len(easy_tasks) == 1
         assert easy_tasks[0]["id"] == "test_001"
 
-    def test_get_tasks_by_tag(self, sample_tasks_file):
+    def test_get_tasks_by_tag(self, base_evaluator):
         """Test filtering tasks by tag."""
-        evaluator = BaseEvaluator(sample_tasks_file)
-        basic_tasks = evaluator.get_tasks_by_tag("basic")
+        basic_tasks = base_evaluator.get_tasks_by_tag("basic")
         assert len(basic_tasks) == 1
         assert basic_tasks[0]["id"] == "test_001"
 
+    def test_iter_tasks_lazy(self, base_evaluator):
+        """Test the lazy task iterators yield the same tasks as the getters."""
+        by_difficulty = base_evaluator.iter_tasks_by_difficulty("medium")
+        assert not isinstance(by_difficulty, list)
+        assert [t["id"] for t in by_difficulty] == ["test_002"]
+        assert list(base_evaluator.iter_tasks_by_tag("intermediate")) == (
+            base_evaluator.get_tasks_by_tag("intermediate")
+        )
+        assert list(base_evaluator.iter_tasks_by_tag("missing")) == []
 
-class TestLexiEvaluator:
-    """Test LexiEvaluator functionality."""
+    @pytest.mark.benchmark
+    def test_batch_evaluate_perf(self, request, base_evaluator):
+        """Benchmark batch_evaluate over 10k results (pytest -m benchmark)."""
+        pytest.importorskip("pytest_benchmark")
+        benchmark = request.getfixturevalue("benchmark")
 
-    def test_lexi_evaluator_initialization(self, sample_tasks_file):
-        """Test LexiEvaluator initializes correctly."""
-        evaluator = LexiEvaluator(sample_tasks_file)
-        assert evaluator.threshold == 0.8
+        results = [{"task_id": "test_001", "output": "test output"}] * 10_000
+        report = benchmark.pedantic(
+            base_evaluator.batch_evaluate, args=(results,), rounds=5, warmup_rounds=1
+        )
+        assert report["passed"] == 10_000
+
+
+# (evaluator fixture, result keys its evaluate_output must report)
+DSL_EVALUATORS = [
+    ("lexi_evaluator", ("similarity", "line_overlap")),
+    ("tinycalc_evaluator", ("exact_match",)),
+    ("tinysql_evaluator", ("exact_match",)),
+    ("gli_evaluator", ("exact_match",)),
+]
 
-    def test_lexi_evaluator_custom_threshold(self, sample_tasks_file):
-        """Test LexiEvaluator with custom threshold."""
-        evaluator = LexiEvaluator(sample_tasks_file, threshold=0.9)
-        assert evaluator.threshold == 0.9
 
-    def test_lexi_evaluator_output(self, sample_tasks_file):
-        """Test evaluate_output method."""
-        evaluator = LexiEvaluator(sample_tasks_file)
+@pytest.mark.parametrize(
+    "fixture_name,metric_keys", DSL_EVALUATORS, ids=[e[0] for e in DSL_EVALUATORS]
+)
+class TestDSLEvaluators:
+    """Tests shared by the DSL-specific evaluators."""
+
+    def test_evaluate_output(self, request, fixture_name, metric_keys):
+        """Test evaluate_output passes a matching output and reports metrics."""
+        evaluator = request.getfixturevalue(fixture_name)
         result = evaluator.evaluate_output("test_001", "test output")
         assert result["status"] == "pass"
-        assert "similarity" in result
-        assert "line_overlap" in result
+        for key in metric_keys:
+            assert key in result
+        if "exact_match" in metric_keys:
+            assert result["exact_match"] is True
 
-    def test_lexi_batch_evaluate(self, sample_tasks_file):
+    def test_batch_evaluate(self, request, fixture_name, metric_keys):
         """Test batch evaluation."""
-        evaluator = LexiEvaluator(sample_tasks_file)
+        evaluator = request.getfixturevalue(fixture_name)
         results = [
             {"task_id": "test_001", "output": "test output"},
             {"task_id": "test_002", "output": "test output 2"},
@@ -140,131 +252,140 @@ class TestLexiEvaluator:
         assert len(report["details"]) == 2
 
 
-class TestTinyCalcEvaluator:
-    """Test TinyCalcEvaluator functionality."""
+class TestLexiEvaluator:
+    """Test LexiEvaluator functionality."""
 
-    def test_tinycalc_evaluator_initialization(self, sample_tasks_file):
-        """Test TinyCalcEvaluator initializes correctly."""
-        evaluator = TinyCalcEvaluator(sample_tasks_file)
-        assert evaluator is not None
+    def test_lexi_evaluator_initialization(self, lexi_evaluator):
+        """Test LexiEvaluator initializes correctly."""
+        assert lexi_evaluator.threshold == 0.8
 
-    def test_tinycalc_evaluator_output(self, sample_tasks_file):
-        """Test evaluate_output method."""
-        evaluator = TinyCalcEvaluator(sample_tasks_file)
-        result = evaluator.evaluate_output("test_001", "test output")
-        assert result["status"] == "pass"
-        assert result["exact_match"] is True
+    def test_lexi_evaluator_custom_threshold(self, sample_tasks_file):
+        """Test LexiEvaluator with custom threshold."""
+        from tinydsl.lexi.lexi_evaluator import LexiEvaluator
 
-    def test_tinycalc_batch_evaluate(self, sample_tasks_file):
-        """Test batch evaluation."""
-        evaluator = TinyCalcEvaluator(sample_tasks_file)
-        results = [
-            {"task_id": "test_001", "output": "test output"},
-            {"task_id": "test_002", "output": "test output 2"},
-        ]
-        report = evaluator.batch_evaluate(results)
-        assert report["accuracy"] == 1.0
-        assert len(report["details"]) == 2
+        evaluator = LexiEvaluator(sample_tasks_file, threshold=0.9)
+        assert evaluator.threshold == 0.9
 
 
-class TestTinySQLEvaluator:
-    """Test TinySQLEvaluator functionality."""
+class TestTinyMathEvaluator:
+    """Test TinyMathEvaluator functionality."""
 
-    def test_tinysql_evaluator_initialization(self, sample_tasks_file):
-        """Test TinySQLEvaluator initializes correctly."""
-        evaluator = TinySQLEvaluator(sample_tasks_file)
-        assert evaluator is not None
+    def test_tinymath_numeric_compare(self, tinymath_evaluator):
+        """Test tolerance compare for numeric and assignment outputs."""
+        compare = tinymath_evaluator.compare_output
+        assert compare("1.0\n2.00001\n3.0", "1.0\n2.0\n3")
+        assert compare("x = 5.00001\ny = 2", "x = 5.0\ny = 2.0")
+        assert not compare("1.0\n2.1", "1.0\n2.0")
+        # Mixed formats and text lines take the per-line path
+        assert compare("x = 5.0\n10.00001", "x = 5.0\n10.0")
+        assert not compare("x = 5.0", "5.0")
+        assert compare("done\n1.0", "done\n1.00001")
 
-    def test_tinysql_evaluator_output(self, sample_tasks_file):
-        """Test evaluate_output method."""
-        evaluator = TinySQLEvaluator(sample_tasks_file)
-        result = evaluator.evaluate_output("test_001", "test output")
-        assert result["status"] == "pass"
-        assert result["exact_match"] is True
 
-    def test_tinysql_batch_evaluate(self, sample_tasks_file):
-        """Test batch evaluation."""
-        evaluator = TinySQLEvaluator(sample_tasks_file)
-        results = [
-            {"task_id": "test_001", "output": "test output"},
-            {"task_id": "test_002", "output": "test output 2"},
-        ]
-        report = evaluator.batch_evaluate(results)
-        assert report["accuracy"] == 1.0
-        assert len(report["details"]) == 2
+class TestTinySQLEvaluator:
+    """Test TinySQLEvaluator functionality."""
+
+    def test_tinysql_exact_match_whitespace(self, tinysql_evaluator):
+        """Test exact matching ignores surrounding whitespace only."""
+        evaluate = tinysql_evaluator.evaluate_output
+        assert evaluate("test_002", "  test output 2\n")["exact_match"]
+        assert not evaluate("test_002", "test output")["exact_match"]
 
 
 class TestGliEvaluator:
     """Test GliEvaluator functionality."""
 
-    def test_gli_evaluator_initialization(self, sample_tasks_file):
+    def test_gli_evaluator_initialization(self, gli_evaluator):
         """Test GliEvaluator initializes correctly."""
-        evaluator = GliEvaluator(sample_tasks_file)
-        assert evaluator is not None
-        assert evaluator.fuzzy is False
+        assert gli_evaluator is not None
+        assert gli_evaluator.fuzzy is False
 
     def test_gli_evaluator_fuzzy_mode(self, sample_tasks_file):
         """Test GliEvaluator with fuzzy matching."""
+        from tinydsl.gli.gli_evaluator import GliEvaluator
+
         evaluator = GliEvaluator(sample_tasks_file, fuzzy=True, threshold=0.9)
         assert evaluator.fuzzy is True
         assert evaluator.threshold == 0.9
 
-    def test_gli_evaluator_output_exact(self, sample_tasks_file):
-        """Test evaluate_output with exact matching."""
-        evaluator = GliEvaluator(sample_tasks_file)
-        result = evaluator.evaluate_output("test_001", "test output")
-        assert result["status"] == "pass"
-        assert result["exact_match"] is True
-
     def test_gli_evaluator_output_fuzzy(self, sample_tasks_file):
         """Test evaluate_output with fuzzy matching."""
+        from tinydsl.gli.gli_evaluator import GliEvaluator
+
         evaluator = GliEvaluator(sample_tasks_file, fuzzy=True)
         result = evaluator.evaluate_output("test_001", "test output!")
         assert result["status"] == "pass"
         assert "similarity" in result
         assert "line_overlap" in result
 
-    def test_gli_batch_evaluate(self, sample_tasks_file):
-        """Test batch evaluation."""
-        evaluator = GliEvaluator(sample_tasks_file)
-        results = [
-            {"task_id": "test_001", "output": "test output"},
-            {"task_id": "test_002", "output": "test output 2"},
-        ]
-        report = evaluator.batch_evaluate(results)
-        assert report["accuracy"] == 1.0
-        assert len(report["details"]) == 2
+
+@pytest.fixture(scope="module")
+def fuzzy_cmp():
+    """Fuzzy comparator (threshold 0.8, with metrics) shared by the module."""
+    return BaseEvaluator.fuzzy_comparator(threshold=0.8, return_metrics=True)
 
 
 class TestFuzzyComparator:
     """Test fuzzy comparator functionality."""
 
-    def test_fuzzy_exact_match(self):
-        """Test fuzzy comparator with exact match."""
-        comparator = BaseEvaluator.fuzzy_comparator(threshold=0.8, return_metrics=True)
-        passed, metrics = comparator("hello world", "hello world")
-        assert passed is True
-        assert metrics["similarity"] == 1.0
-
-    def test_fuzzy_close_match(self):
-        """Test fuzzy comparator with close match."""
-        comparator = BaseEvaluator.fuzzy_comparator(threshold=0.8, return_metrics=True)
-        passed, metrics = comparator("hello world!", "hello world")
-        assert passed is True
-        assert metrics["similarity"] > 0.8
-
-    def test_fuzzy_no_match(self):
-        """Test fuzzy comparator with no match."""
-        comparator = BaseEvaluator.fuzzy_comparator(threshold=0.8, return_metrics=True)
-        passed, metrics = comparator("completely different", "hello world")
-        assert passed is False
-        assert metrics["similarity"] < 0.8
-
-    def test_fuzzy_multiline_match(self):
-        """Test fuzzy comparator with multiline text."""
-        comparator = BaseEvaluator.fuzzy_comparator(threshold=0.8, return_metrics=True)
-        text1 = "line 1\nline 2\nline 3"
-        text2 = "line 1\nline 2\nline 3"
-        passed, metrics = comparator(text1, text2)
-        assert passed is True
-        assert metrics["line_overlap"] == 1.0
+    @pytest.mark.parametrize(
+        "actual,expected,should_pass,metric,check",
+        [
+            pytest.param(
+                "hello world",
+                "hello world",
+                True,
+                "similarity",
+                lambda v: v == 1.0,
+                id="exact_match",
+            ),
+            pytest.param(
+                "hello world!",
+                "hello world",
+                True,
+                "similarity",
+                lambda v: v > 0.8,
+                id="close_match",
+            ),
+            pytest.param(
+                "completely different",
+                "hello world",
+                False,
+                "similarity",
+                lambda v: v < 0.8,
+                id="no_match",
+            ),
+            pytest.param(
+                "line 1\nline 2\nline 3",
+                "line 1\nline 2\nline 3",
+                True,
+                "line_overlap",
+                lambda v: v == 1.0,
+                id="multiline_match",
+            ),
+        ],
+    )
+    def test_fuzzy_compare(
+        self, fuzzy_cmp, actual, expected, should_pass, metric, check
+    ):
+        """Test pass/fail and the reported metric for each input pair."""
+        passed, metrics = fuzzy_cmp(actual, expected)
+        assert passed is should_pass
+        assert check(metrics[metric])
+
+    def test_fuzzy_pass_fail_matches_metrics(self, fuzzy_cmp):
+        """Test the pass/fail-only comparator agrees with the full metrics."""
+        import random
+
+        rng = random.Random(0)
+        words = ["draw", "circle", "set", "color", "red", "x=50", "y=50"]
+        texts = [
+            "\n".join(" ".join(rng.choices(words, k=4)) for _ in range(3))
+            for _ in range(40)
+        ]
+        pass_fail = BaseEvaluator.fuzzy_comparator(threshold=0.8)
+
+        for actual in texts:
+            for expected in texts[:10]:
+                passed, _ = fuzzy_cmp(actual, expected)
+                assert pass_fail(actual, expected) is passed
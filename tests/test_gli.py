@@ -1,98 +1,107 @@
 """Tests for Gli DSL."""
 
+import pytest
 from tinydsl.gli.gli import GlintInterpreter
 
 
+@pytest.fixture(scope="class")
+def gli_v1():
+    """Gli V1 interpreter shared by a test class (parse() replaces its shapes)."""
+    return GlintInterpreter(version="v1")
+
+
+@pytest.fixture(scope="class")
+def gli_v2():
+    """Gli V2 interpreter shared by a test class (parse() replaces its shapes)."""
+    return GlintInterpreter(version="v2")
+
+
 class TestGliV1:
     """Test Gli V1 features."""
 
-    def test_gli_v1_initialization(self):
+    def test_gli_v1_initialization(self, gli_v1):
         """Test Gli V1 initializes correctly."""
-        gli = GlintInterpreter(version="v1")
-        assert gli.version == "v1"
+        assert gli_v1.version == "v1"
 
-    def test_basic_shape(self, sample_gli_v1_code):
+    def test_basic_shape(self, gli_v1, sample_gli_v1_code):
         """Test basic shape drawing."""
-        gli = GlintInterpreter(version="v1")
-        shapes = gli.parse(sample_gli_v1_code)
+        shapes = gli_v1.parse(sample_gli_v1_code)
         assert len(shapes) >= 1
         assert shapes[0][0] == "circle"  # shape name
 
-    def test_set_color(self):
+    def test_set_color(self, gli_v1):
         """Test setting color."""
-        gli = GlintInterpreter(version="v1")
         code = "set color red\ndraw circle x=50 y=50"
-        shapes = gli.parse(code)
+        shapes = gli_v1.parse(code)
         assert shapes[0][4] == "red"  # color
 
-    def test_set_size(self):
+    def test_set_size(self, gli_v1):
         """Test setting size."""
-        gli = GlintInterpreter(version="v1")
         code = "set size 20\ndraw square x=10 y=10"
-        shapes = gli.parse(code)
+        shapes = gli_v1.parse(code)
         assert shapes[0][3] == 20.0  # size
 
-    def test_repeat_block(self):
+    def test_repeat_block(self, gli_v1):
         """Test repeat block."""
-        gli = GlintInterpreter(version="v1")
         code = "repeat 3 {\ndraw circle x=10 y=10\n}"
-        shapes = gli.parse(code)
+        shapes = gli_v1.parse(code)
         assert len(shapes) == 3
 
-    def test_math_expressions(self):
+    def test_math_expressions(self, gli_v1):
         """Test math in coordinates."""
-        gli = GlintInterpreter(version="v1")
         code = "draw circle x=10+5 y=20*2"
-        shapes = gli.parse(code)
+        shapes = gli_v1.parse(code)
         assert shapes[0][1] == 15.0  # x
         assert shapes[0][2] == 40.0  # y
 
+    def test_grammars_compiled_once(self, gli_v1, gli_v2):
+        """Test interpreters and per-program compilers share compiled grammars."""
+        from tinydsl.parser.lark_gli_parser import _GLICompiler
+
+        assert gli_v1._parser._parser is gli_v2._parser._parser
+        assert _GLICompiler().math.parser is _GLICompiler().math.parser
+
 
 class TestGliV2:
     """Test Gli V2 features."""
 
-    def test_gli_v2_initialization(self):
+    def test_gli_v2_initialization(self, gli_v2):
         """Test Gli V2 initializes correctly."""
-        gli = GlintInterpreter(version="v2")
-        assert gli.version == "v2"
+        assert gli_v2.version == "v2"
 
-    def test_variables(self, sample_gli_v2_code):
+    def test_variables(self, gli_v2, sample_gli_v2_code):
         """Test variable assignment and usage."""
-        gli = GlintInterpreter(version="v2")
-        shapes = gli.parse(sample_gli_v2_code)
+        shapes = gli_v2.parse(sample_gli_v2_code)
         assert len(shapes) >= 1
 
-    def test_conditionals(self):
+    def test_conditionals(self, gli_v2):
         """Test if-else conditionals."""
-        gli = GlintInterpreter(version="v2")
         code = """
 var x = 50
 if x > 40 {
     draw circle x=x y=50
 }
 """
-        shapes = gli.parse(code)
+        shapes = gli_v2.parse(code)
         assert len(shapes) == 1
 
-    def test_functions(self):
+    def test_functions(self, gli_v2):
         """Test function definition and call."""
-        gli = GlintInterpreter(version="v2")
         code = """
 define drawCircle(x, y) {
     draw circle x=x y=y
 }
 call drawCircle(50, 50)
 """
-        shapes = gli.parse(code)
+        shapes = gli_v2.parse(code)
         assert len(shapes) >= 1
 
-    def test_transforms(self):
+    def test_transforms(self, gli_v2):
         """Test transform operations."""
-        gli = GlintInterpreter(version="v2")
         code = """
 rotate 45
 draw circle x=50 y=50
 """
-        shapes = gli.parse(code)
+        shapes = gli_v2.parse(code)
         # V2 shapes have transform data
         assert len(shapes[0]) == 7  # includes rotation and transform matrix
@@ -1,8 +1,11 @@
 """Tests for RL framework."""
 
+import functools
+
 import pytest
 import numpy as np
-from tinydsl.rl.envs import make_env
+from unittest.mock import MagicMock
+from tinydsl.rl.envs import make_env, SubprocVecEnv
 from tinydsl.rl.envs.dsl_env import DSLEnv
 from tinydsl.rl.agents import RandomAgent, QLearningAgent, PolicyGradientAgent
 from tinydsl.rl.rewards import CorrectnessReward, EfficiencyReward
@@ -14,14 +17,53 @@ from tinydsl.rl.utils import RLTrainer, RLEvaluator
 # ====================
 
 
+@pytest.fixture(scope="module")
+def tinycalc_env():
+    """
+    TinyCalc env shared by tests that only read it or reset() before use.
+
+    Tests that step through episodes build their own env.
+    """
+    return make_env("tinycalc", "001", max_steps=10)
+
+
+def _readonly(array):
+    """Mark a shared fixture array read-only so no test can modify it."""
+    array.flags.writeable = False
+    return array
+
+
+@pytest.fixture(scope="module")
+def obs100():
+    """A fixed (seeded) 100-dim observation."""
+    return _readonly(np.random.default_rng(0).random(100))
+
+
+@pytest.fixture(scope="module")
+def next_obs100():
+    """A second fixed 100-dim observation, for next-state arguments."""
+    return _readonly(np.random.default_rng(1).random(100))
+
+
+@pytest.fixture(scope="module")
+def obs8():
+    """A small fixed observation for tests that only check the agent API."""
+    return _readonly(np.random.default_rng(0).random(8))
+
+
+@pytest.fixture(scope="module")
+def next_obs8():
+    """A second small fixed observation, for next-state arguments."""
+    return _readonly(np.random.default_rng(1).random(8))
+
+
 class TestRLEnvironment:
     """Test RL environment."""
 
-    def test_make_env(self):
+    def test_make_env(self, tinycalc_env):
         """Test creating an environment."""
-        env = make_env("tinycalc", "001", max_steps=10)
-        assert env is not None
-        assert env.max_steps == 10
+        assert tinycalc_env is not None
+        assert tinycalc_env.max_steps == 10
 
     def test_env_reset(self):
         """Test environment reset."""
@@ -61,68 +103,184 @@ class TestRLEnvironment:
         assert "select" in env.vocabulary
         assert "from" in env.vocabulary
 
-    def test_env_render(self):
+    def test_env_render(self, tinycalc_env):
         """Test environment render."""
-        env = make_env("tinycalc", "001", max_steps=10)
-        env.reset()
-        rendered = env.render()
+        tinycalc_env.reset()
+        rendered = tinycalc_env.render()
         assert isinstance(rendered, str)
         assert "Step" in rendered
 
-    def test_env_action_mask(self):
+    def test_env_action_mask(self, tinycalc_env):
         """Test action mask generation."""
-        env = make_env("tinycalc", "001", max_steps=10)
-        env.reset()
-        mask = env.get_action_mask()
+        tinycalc_env.reset()
+        mask = tinycalc_env.get_action_mask()
         assert isinstance(mask, np.ndarray)
-        assert len(mask) == env.action_space_size
+        assert len(mask) == tinycalc_env.action_space_size
+
+    def test_subproc_vec_env(self):
+        """Test stepping environments in worker processes."""
+        env_fns = [functools.partial(make_env, "tinycalc", "001", max_steps=3)] * 2
+        with SubprocVecEnv(env_fns) as vec_env:
+            observations = vec_env.reset()
+            assert observations.shape == (2, 100)
+
+            observations, rewards, dones, infos = vec_env.step([0, 1])
+            assert observations.shape == (2, 100)
+            assert rewards.shape == dones.shape == (2,)
+            assert infos[1]["current_code"] == env_fns[1]().vocabulary[1]
+
+            # Only the selected environment is stepped
+            observations, _, _, infos = vec_env.step([2], indices=[1])
+            assert observations.shape == (1, 100)
+            assert infos[0]["step"] == 2
+
+    def test_env_memoizes_program_output(self):
+        """Test repeated programs are executed only once."""
+        client = MagicMock()
+        client.run.return_value = {"output": "1.0 grobble"}
+        env = make_env("tinycalc", "001", max_steps=10, client=client)
+
+        for _ in range(2):
+            env.reset()
+            env.step(0)
+            _, _, _, info = env.step(1)
+
+        assert client.run.call_count == 2
+        assert info["result"]["output"] == "1.0 grobble"
+
+    @pytest.mark.parametrize("dsl_name", ["lexi", "tinysql"])
+    def test_env_runs_stateful_programs_every_time(self, dsl_name):
+        """Test Lexi/TinySQL programs are re-run (memory or table files)."""
+        client = MagicMock()
+        client.run.side_effect = [{"output": f"run {i}"} for i in range(4)]
+        env = make_env(dsl_name, "001", max_steps=10, client=client)
+
+        for _ in range(2):
+            env.reset()
+            env.step(0)
+            _, _, _, info = env.step(1)
+
+        assert client.run.call_count == 4
+        assert info["result"]["output"] == "run 3"
 
 
 class TestRLAgents:
     """Test RL agents."""
 
-    def test_random_agent(self):
+    def test_random_agent(self, obs100):
         """Test random agent."""
         agent = RandomAgent(action_space_size=10)
-        obs = np.random.rand(100)
-        action = agent.act(obs)
+        action = agent.act(obs100)
         assert 0 <= action < 10
 
-    def test_q_learning_agent(self):
+    def test_q_learning_agent(self, obs8, next_obs8):
         """Test Q-learning agent."""
-        agent = QLearningAgent(action_space_size=10, learning_rate=0.01, epsilon=0.3)
+        agent = QLearningAgent(
+            action_space_size=10, state_size=8, learning_rate=0.01, epsilon=0.3
+        )
 
-        obs = np.random.rand(100)
-        action = agent.act(obs)
+        action = agent.act(obs8)
         assert 0 <= action < 10
 
         # Test learning
-        next_obs = np.random.rand(100)
-        agent.learn(obs, action, 1.0, next_obs, False)
+        agent.learn(obs8, action, 1.0, next_obs8, False)
 
-    def test_policy_gradient_agent(self):
+    def test_policy_gradient_agent(self, obs8, next_obs8):
         """Test policy gradient agent."""
-        agent = PolicyGradientAgent(action_space_size=10, learning_rate=0.001)
+        agent = PolicyGradientAgent(
+            action_space_size=10, state_size=8, learning_rate=0.001
+        )
 
-        obs = np.random.rand(100)
-        action = agent.act(obs)
+        action = agent.act(obs8)
         assert 0 <= action < 10
 
         # Test learning (PolicyGradientAgent uses learn() not store_transition())
-        next_obs = np.random.rand(100)
-        agent.learn(obs, action, 1.0, next_obs, done=False)
+        agent.learn(obs8, action, 1.0, next_obs8, done=False)
 
         # Test episode completion
-        agent.learn(next_obs, action, 1.0, next_obs, done=True)
+        agent.learn(next_obs8, action, 1.0, next_obs8, done=True)
 
     def test_epsilon_decay(self):
         """Test epsilon decay in Q-learning agent."""
-        agent = QLearningAgent(action_space_size=10, epsilon=0.5, epsilon_decay=0.9)
+        agent = QLearningAgent(action_space_size=1, epsilon=0.5, epsilon_decay=0.9)
 
         initial_epsilon = agent.epsilon
         agent.decay_epsilon()
         assert agent.epsilon < initial_epsilon
 
+    def test_seeded_agents_reproducible(self, obs100):
+        """Test agents with the same seed make the same choices."""
+        for cls in [RandomAgent, QLearningAgent, PolicyGradientAgent]:
+            a, b = cls(action_space_size=10, seed=7), cls(action_space_size=10, seed=7)
+            first = [a.act(obs100) for _ in range(20)]
+            assert first == [b.act(obs100) for _ in range(20)]
+
+    def test_batch_act(self):
+        """Test batched action selection for all agents."""
+        observations = np.random.rand(8, 100)
+        for agent in [
+            RandomAgent(action_space_size=10),
+            QLearningAgent(action_space_size=10, epsilon=0.5, seed=0),
+            PolicyGradientAgent(action_space_size=10, seed=0),
+        ]:
+            actions = agent.batch_act(observations)
+            assert actions.shape == (8,)
+            assert ((actions >= 0) & (actions < 10)).all()
+
+        # Greedy Q-learning batch matches per-observation greedy actions
+        agent = QLearningAgent(action_space_size=10, seed=0)
+        greedy = agent.batch_act(observations, explore=False)
+        assert list(greedy) == [agent.act(o, explore=False) for o in observations]
+
+    def test_learn_batch_matches_learn(self):
+        """Test a batched Q-learning episode update equals per-step learn."""
+        rng = np.random.default_rng(0)
+        obs = rng.random((6, 100), dtype=np.float32)
+        next_obs = rng.random((6, 100), dtype=np.float32)
+        actions = rng.integers(0, 10, 6)
+        rewards = rng.random(6)
+        dones = np.arange(6) == 5
+
+        a, b = QLearningAgent(10, seed=3), QLearningAgent(10, seed=3)
+        a.learn_batch(obs, actions, rewards, next_obs, dones)
+        for t in range(6):
+            b.learn(obs[t], int(actions[t]), float(rewards[t]), next_obs[t], dones[t])
+        np.testing.assert_array_equal(a.weights, b.weights)
+
+    def test_discounted_returns(self):
+        """Test discounted returns match the recursive definition."""
+        from tinydsl.rl.agents._kernels import discounted_returns
+
+        returns = discounted_returns([1.0, 0.0, 2.0], gamma=0.5)
+        np.testing.assert_allclose(returns, [1.5, 1.0, 2.0])
+        assert discounted_returns([], gamma=0.9).shape == (0,)
+
+    def test_normalized_discounted_returns(self):
+        """Test fused normalization matches mean/std normalization."""
+        from tinydsl.rl.agents._kernels import (
+            discounted_returns,
+            normalized_discounted_returns,
+        )
+
+        rewards = list(np.random.rand(20))
+        returns = discounted_returns(rewards, gamma=0.9)
+        expected = (returns - returns.mean()) / (returns.std() + 1e-8)
+        np.testing.assert_allclose(
+            normalized_discounted_returns(rewards, gamma=0.9), expected
+        )
+        np.testing.assert_allclose(normalized_discounted_returns([2.0], 0.9), [2.0])
+
+    def test_agent_float32_observations(self, obs100, next_obs100):
+        """Test agents keep float32 parameters when fed float64 observations."""
+        agent = QLearningAgent(action_space_size=10, epsilon=0.0)
+        action = agent.act(obs100)
+        agent.learn(obs100, action, 1.0, next_obs100, False)
+        assert agent.weights.dtype == np.float32
+
+        coerced = agent._coerce(np.asfortranarray(np.random.rand(100, 1)[:, 0]))
+        assert coerced.dtype == np.float32
+        assert coerced.flags["C_CONTIGUOUS"]
+
 
 class TestRewardFunctions:
     """Test reward functions."""
@@ -165,28 +323,124 @@ class TestRewardFunctions:
 class TestRLTrainer:
     """Test RL trainer."""
 
-    def test_trainer_initialization(self):
+    def test_trainer_initialization(self, tinycalc_env, tmp_path):
         """Test trainer initializes correctly."""
-        env = make_env("tinycalc", "001", max_steps=10)
-        agent = RandomAgent(env.action_space_size)
-        trainer = RLTrainer(env, agent)
-        assert trainer.env == env
+        agent = RandomAgent(tinycalc_env.action_space_size)
+        trainer = RLTrainer(tinycalc_env, agent, log_dir=tmp_path)
+        assert trainer.env == tinycalc_env
         assert trainer.agent == agent
 
-    def test_trainer_short_training(self):
+    def test_trainer_short_training(self, train_episodes, tmp_path):
         """Test short training run."""
         env = make_env("tinycalc", "001", max_steps=10)
         agent = RandomAgent(env.action_space_size)
-        trainer = RLTrainer(env, agent)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
 
         # Train for just 5 episodes
-        stats = trainer.train(num_episodes=5, verbose=False)
+        num_episodes = train_episodes(5)
+        stats = trainer.train(num_episodes=num_episodes, verbose=False)
 
         assert "total_episodes" in stats
-        assert stats["total_episodes"] == 5
+        assert stats["total_episodes"] == num_episodes
+        assert isinstance(trainer.episode_rewards, list)
+        assert len(trainer.episode_rewards) == num_episodes
         assert "final_avg_reward" in stats
         assert "final_success_rate" in stats
 
+    def test_trainer_parallel_envs(self, tmp_path):
+        """Test training with episodes batched across worker environments."""
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = PolicyGradientAgent(env.action_space_size, seed=0)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path, num_envs=2)
+
+        stats = trainer.train(num_episodes=3, verbose=False)
+
+        assert stats["total_episodes"] == 3
+        assert len(trainer.episode_lengths) == 3
+        assert all(1 <= n <= 5 for n in trainer.episode_lengths)
+
+    def test_training_curve_files(self, tmp_path):
+        """Test the training curve is saved as matching .npz and .json files."""
+        import json
+
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = RandomAgent(env.action_space_size, seed=0)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
+        trainer.train(num_episodes=4, verbose=False)
+
+        arrays = np.load(tmp_path / "training_curve.npz")
+        curve = json.loads((tmp_path / "training_curve.json").read_text())
+        assert set(arrays.files) == set(curve)
+        for key in curve:
+            assert arrays[key].tolist() == curve[key]
+        assert len(curve["episode_rewards"]) == 4
+
+    def test_evaluate_on_workers(self, tmp_path):
+        """Test evaluation on auto-resetting workers matches the serial loop."""
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = QLearningAgent(env.action_space_size, seed=0)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path, num_envs=2)
+
+        serial = trainer.evaluate(n_episodes=5)
+        with trainer._make_vec_env() as vec_env:
+            parallel = trainer.evaluate(n_episodes=5, vec_env=vec_env)
+
+        assert parallel == serial
+
+    def test_trainer_checkpoint_snapshot(self, tmp_path):
+        """Test checkpoints are written in the background as load()-able snapshots."""
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = QLearningAgent(env.action_space_size, seed=0)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
+
+        expected = agent.weights.copy()
+        trainer._save_checkpoint(0)
+        agent.weights += 1.0  # mutate after queueing; file must keep the snapshot
+        trainer._ckpt_writer.flush()
+
+        other = QLearningAgent(env.action_space_size, seed=1)
+        other.load(str(tmp_path / "checkpoint_ep0.npy"))
+        np.testing.assert_array_equal(other.weights, expected)
+
+    def test_trainer_checkpoint_falls_back_to_save(self, tmp_path):
+        """Test agents that only override save() still get checkpoints."""
+
+        class SaveOnlyAgent(QLearningAgent):
+            def serialize(self):
+                return None
+
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = SaveOnlyAgent(env.action_space_size, seed=0)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
+
+        expected = agent.weights.copy()
+        trainer._save_checkpoint(0)
+        agent.weights += 1.0
+        trainer._ckpt_writer.flush()
+
+        other = QLearningAgent(env.action_space_size, seed=1)
+        other.load(str(tmp_path / "checkpoint_ep0.npy"))
+        np.testing.assert_array_equal(other.weights, expected)
+
+    def test_trainer_flushes_checkpoints_on_error(self, tmp_path):
+        """Test checkpoints queued before a training failure still reach disk."""
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = QLearningAgent(env.action_space_size, seed=0)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
+        results = [(0.0, 1, False)]
+
+        def run_episode():
+            if not results:
+                raise RuntimeError("episode failed")
+            return results.pop()
+
+        trainer._run_episode = run_episode
+        with pytest.raises(RuntimeError, match="episode failed"):
+            trainer.train(num_episodes=2, save_every=1, verbose=False)
+
+        assert trainer._ckpt_writer.thread is None
+        assert (tmp_path / "checkpoint_ep1.npy").exists()
+
 
 class TestRLEvaluator:
     """Test RL evaluator."""
@@ -209,6 +463,31 @@ class TestRLEvaluator:
         assert "avg_length" in results
         assert 0 <= results["success_rate"] <= 1
 
+    def test_evaluate_agent_parallel(self):
+        """Test evaluating an agent across worker processes."""
+        env = make_env("tinycalc", "001", max_steps=5)
+        agent = RandomAgent(env.action_space_size)
+        evaluator = RLEvaluator()
+
+        results = evaluator.evaluate_agent(agent, env, n_episodes=3, n_workers=2)
+
+        assert results["n_episodes"] == 3
+        assert len(results["sample_programs"]) == 3
+        assert 0 <= results["success_rate"] <= 1
+
+    def test_compute_sample_efficiency(self):
+        """Test sample efficiency for equal-length and ragged curves."""
+        evaluator = RLEvaluator()
+
+        results = evaluator.compute_sample_efficiency(
+            [[0.0, 0.5, 1.0, 1.0], [0.0, 0.0, 0.0, 0.0]]
+        )
+        assert results["mean_auc"] == pytest.approx(1.0)
+        assert results["mean_episodes_to_threshold"] == pytest.approx(3.0)
+
+        ragged = evaluator.compute_sample_efficiency([[0.0, 0.9], [0.0, 0.0, 0.0]])
+        assert ragged["mean_episodes_to_threshold"] == pytest.approx(2.0)
+
     def test_compare_agents(self):
         """Test comparing multiple agents."""
         env = make_env("tinycalc", "001", max_steps=10)
@@ -225,19 +504,38 @@ class TestRLEvaluator:
         assert "agent2" in results
 
 
-# ====================
-# Integration Tests (Require Server)
-# ====================
-
-
-@pytest.mark.integration
-@pytest.mark.requires_server
-class TestRLEnvironmentIntegration:
-    """Integration tests for RL environment with real server."""
-
-    def test_env_step_execution(self):
-        """Test environment step with actual DSL execution."""
-        env = make_env("tinycalc", "001", max_steps=10)
+@pytest.fixture(
+    params=[
+        "mocked",
+        pytest.param(
+            "live",
+            marks=[
+                pytest.mark.integration,
+                pytest.mark.requires_server,
+                pytest.mark.xdist_group("server"),
+            ],
+        ),
+    ]
+)
+def env_client(request):
+    """
+    Client for env step tests: a canned in-process fake, or the live server.
+
+    The mocked variant runs by default; the live one only with --full.
+    """
+    if request.param == "live":
+        return request.getfixturevalue("dsl_client")
+    client = MagicMock()
+    client.run.return_value = {"status": "ok", "output": "14.0 grobble"}
+    return client
+
+
+class TestRLEnvironmentSteps:
+    """Test stepping environments, against a fake client and the live server."""
+
+    def test_env_step_execution(self, env_client):
+        """Test environment step executing the program through the client."""
+        env = make_env("tinycalc", "001", max_steps=10, client=env_client)
         env.reset()
 
         # Take first action
@@ -256,9 +554,9 @@ class TestRLEnvironmentIntegration:
         assert "expected" in info
         assert "step" in info
 
-    def test_env_episode_flow(self):
+    def test_env_episode_flow(self, env_client):
         """Test full episode flow."""
-        env = make_env("tinycalc", "001", max_steps=20)
+        env = make_env("tinycalc", "001", max_steps=20, client=env_client)
         obs = env.reset()
 
         done = False
@@ -275,10 +573,12 @@ class TestRLEnvironmentIntegration:
         assert steps <= 20
         assert isinstance(total_reward, (int, float))
 
-    def test_env_with_correctness_reward(self):
+    def test_env_with_correctness_reward(self, env_client):
         """Test environment with CorrectnessReward."""
         reward_fn = CorrectnessReward("tinycalc")
-        env = DSLEnv("tinycalc", "001", reward_fn=reward_fn, max_steps=10)
+        env = DSLEnv(
+            "tinycalc", "001", reward_fn=reward_fn, max_steps=10, client=env_client
+        )
 
         obs = env.reset()
         action = 0
@@ -287,6 +587,18 @@ class TestRLEnvironmentIntegration:
         # Reward should be a float
         assert isinstance(reward, (int, float))
 
+
+# ====================
+# Integration Tests (Require Server)
+# ====================
+
+
+@pytest.mark.integration
+@pytest.mark.requires_server
+@pytest.mark.xdist_group("server")
+class TestRLEnvironmentIntegration:
+    """Integration tests for RL environment with real server."""
+
     def test_env_multiple_dsls(self):
         """Test environment creation for all DSLs."""
         dsls = ["tinycalc", "lexi", "gli", "tinysql"]
@@ -300,55 +612,58 @@ class TestRLEnvironmentIntegration:
             obs = env.reset()
             assert isinstance(obs, np.ndarray)
 
-    def test_env_integration_with_client(self):
+    def test_env_integration_with_client(self, dsl_client):
         """Test environment uses GenericDSLClient correctly."""
-        from tinydsl.agent_tools.generic_dsl_client import GenericDSLClient
-
-        # Create client
-        client = GenericDSLClient()
-
         # Test client works
-        result = client.run(
+        result = dsl_client.run(
             "tinycalc", "define 1 flurb = 3.5 grobble\nconvert 4 flurb to grobble"
         )
         assert result.get("status") == "ok"
 
-        # Create environment that uses same client internally
-        env = DSLEnv("tinycalc", "001")
+        # Create environment that runs programs through the same client
+        env = DSLEnv("tinycalc", "001", client=dsl_client)
         assert env.dsl_name == "tinycalc"
+        executed = env._execute_program(
+            "define 1 flurb = 3.5 grobble\nconvert 4 flurb to grobble"
+        )
+        assert executed["error"] is None
+        assert executed["output"] == result["output"]
 
 
 @pytest.mark.integration
 @pytest.mark.requires_server
+@pytest.mark.xdist_group("server")
 class TestRLTrainerIntegration:
     """Integration tests for RL trainer with real environment."""
 
-    def test_train_random_agent(self):
+    def test_train_random_agent(self, dsl_client, train_episodes, tmp_path):
         """Test training a random agent on real environment."""
-        env = make_env("tinycalc", "001", max_steps=15)
+        env = make_env("tinycalc", "001", max_steps=15, client=dsl_client)
         agent = RandomAgent(env.action_space_size)
-        trainer = RLTrainer(env, agent)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
 
         # Short training run
-        stats = trainer.train(num_episodes=10, verbose=False)
+        num_episodes = train_episodes(10)
+        stats = trainer.train(num_episodes=num_episodes, verbose=False)
 
-        assert stats["total_episodes"] == 10
+        assert stats["total_episodes"] == num_episodes
         assert "final_avg_reward" in stats
         assert "final_success_rate" in stats
         assert 0 <= stats["final_success_rate"] <= 1
 
-    def test_train_q_learning_agent(self):
+    def test_train_q_learning_agent(self, dsl_client, train_episodes, tmp_path):
         """Test training a Q-learning agent."""
-        env = make_env("tinycalc", "001", max_steps=15)
+        env = make_env("tinycalc", "001", max_steps=15, client=dsl_client)
         agent = QLearningAgent(
             action_space_size=env.action_space_size, learning_rate=0.01, epsilon=0.3
         )
-        trainer = RLTrainer(env, agent)
+        trainer = RLTrainer(env, agent, log_dir=tmp_path)
 
         # Short training run
-        stats = trainer.train(num_episodes=10, verbose=False)
+        num_episodes = train_episodes(10)
+        stats = trainer.train(num_episodes=num_episodes, verbose=False)
 
-        assert stats["total_episodes"] == 10
+        assert stats["total_episodes"] == num_episodes
         assert isinstance(stats["final_avg_reward"], (int, float))
 
 
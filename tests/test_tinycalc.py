@@ -1,25 +1,36 @@
 """Tests for TinyCalc DSL."""
 
+import pytest
 from tinydsl.tinycalc.tinycalc import TinyCalcInterpreter
 
 
+@pytest.fixture(scope="module")
+def shared_calc():
+    """TinyCalc interpreter shared by the module."""
+    return TinyCalcInterpreter()
+
+
+@pytest.fixture
+def calc(shared_calc):
+    """The shared TinyCalc interpreter, reset after each test."""
+    yield shared_calc
+    shared_calc.reset()
+
+
 class TestTinyCalc:
     """Test TinyCalc DSL."""
 
-    def test_tinycalc_initialization(self):
+    def test_tinycalc_initialization(self, calc):
         """Test TinyCalc initializes correctly."""
-        calc = TinyCalcInterpreter()
         assert calc.name == "tinycalc"
 
-    def test_simple_conversion(self, sample_tinycalc_code):
+    def test_simple_conversion(self, calc, sample_tinycalc_code):
         """Test simple unit conversion."""
-        calc = TinyCalcInterpreter()
         result = calc.execute(sample_tinycalc_code)
         assert "grobble" in result
 
-    def test_define_and_convert(self):
+    def test_define_and_convert(self, calc):
         """Test defining units and converting."""
-        calc = TinyCalcInterpreter()
         code = """
 define 1 flurb = 3 zept
 convert 2 flurb to zept
@@ -27,9 +38,8 @@ convert 2 flurb to zept
         result = calc.execute(code)
         assert "6.0 zept" in result
 
-    def test_chained_conversion(self):
+    def test_chained_conversion(self, calc):
         """Test multi-hop conversion."""
-        calc = TinyCalcInterpreter()
         code = """
 define 1 flurb = 2 grobble
 define 1 grobble = 3 zept
@@ -38,9 +48,8 @@ convert 1 flurb to zept
         result = calc.execute(code)
         assert "6.0 zept" in result
 
-    def test_arithmetic_in_conversion(self):
+    def test_arithmetic_in_conversion(self, calc):
         """Test arithmetic operations in conversion."""
-        calc = TinyCalcInterpreter()
         code = """
 define 1 flurb = 5 grobble
 compute 2 * 3 flurb in grobble
@@ -48,9 +57,8 @@ compute 2 * 3 flurb in grobble
         result = calc.execute(code)
         assert "grobble" in result
 
-    def test_invalid_syntax(self):
+    def test_invalid_syntax(self, calc):
         """Test handling of invalid syntax."""
-        calc = TinyCalcInterpreter()
         code = "invalid syntax here"
         try:
             result = calc.execute(code)
@@ -59,3 +67,64 @@ compute 2 * 3 flurb in grobble
         except (ValueError, Exception) as e:
             # Or it should raise an error
             assert "error" in str(e).lower() or "unexpected" in str(e).lower()
+
+    def test_statement_error_surface(self, calc):
+        """Test statement errors reach callers as a plain TinyCalc ValueError."""
+        code = "define 1 flurb = 2 grobble\nconvert 5 flurb to zept"
+        with pytest.raises(ValueError) as error:
+            calc.execute(code)
+
+        assert str(error.value) == "TinyCalc parse error: Unknown unit: zept"
+
+    def test_definitions_do_not_leak_between_parses(self, calc):
+        """Test each parse starts without the previous parse's definitions."""
+        calc.execute("define 1 flurb = 2 grobble")
+        with pytest.raises(ValueError, match="Unknown unit: flurb"):
+            calc.execute("convert 5 flurb to grobble")
+
+    def test_tasks_loaded_once(self):
+        """Test task/example files are parsed once and shared across instances."""
+        tasks = TinyCalcInterpreter().get_tasks()
+        assert tasks and "id" in tasks[0]
+        assert TinyCalcInterpreter().get_tasks() is tasks
+        assert TinyCalcInterpreter().get_examples() is not tasks
+
+    def test_repeated_conversions_and_redefine(self, calc):
+        """Test cached conversion paths give stable results and follow redefines."""
+        code = """
+define 1 flurb = 3.7 grobble
+define 1 grobble = 2.1 zept
+convert 10 flurb to zept
+convert 10 flurb to zept
+define 1 zept = 2 quib
+convert 10 flurb to quib
+"""
+        lines = calc.execute(code).split("\n")
+        assert lines[0] == lines[1] == f"{10 * 3.7 * 2.1} zept"
+        assert lines[2] == f"{10 * 3.7 * 2.1 * 2.0} quib"
+
+    def test_one_search_caches_paths_to_all_reachable_units(self):
+        """Test converting from a unit caches paths to every unit it reaches."""
+        from tinydsl.parser.lark_tinycalc_parser import TinyCalcTransformer
+
+        transformer = TinyCalcTransformer()
+        for pair in [("flurb", "grobble"), ("grobble", "zept"), ("quib", "blit")]:
+            transformer.define_stmt(1, pair[0], 2, pair[1])
+
+        assert transformer._convert(3.0, "flurb", "zept") == 12.0
+        assert ("flurb", "grobble") in transformer._paths
+        assert ("flurb", "quib") not in transformer._paths
+        with pytest.raises(ValueError, match="No conversion path"):
+            transformer._convert(1.0, "flurb", "blit")
+
+    def test_repeated_code_reuses_parse_tree(self):
+        """Test identical code is parsed once and still runs from a clean state."""
+        from tinydsl.parser.base_parser import _parse_once
+
+        code = "define 1 flurb = 4 grobble\nconvert 2 flurb to grobble"
+        first = TinyCalcInterpreter().execute(code)
+        hits = _parse_once.cache_info().hits
+        second = TinyCalcInterpreter().execute(code)
+
+        assert first == second == "8.0 grobble"
+        assert _parse_once.cache_info().hits == hits + 1
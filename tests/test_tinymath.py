@@ -1,215 +1,323 @@
 """Tests for TinyMath DSL."""
 
+import gc
+import re
+import weakref
+
 import pytest
 from tinydsl.tinymath.tinymath import TinyMathInterpreter
 
 
+@pytest.fixture(scope="module")
+def shared_math_interp():
+    """TinyMath interpreter shared by the module."""
+    return TinyMathInterpreter()
+
+
+@pytest.fixture
+def math_interp(shared_math_interp):
+    """The shared TinyMath interpreter, reset after each test."""
+    yield shared_math_interp
+    shared_math_interp.reset()
+
+
 class TestTinyMath:
     """Test TinyMath DSL."""
 
-    def test_tinymath_initialization(self):
+    def test_tinymath_initialization(self, math_interp):
         """Test TinyMath initializes correctly."""
-        math_interp = TinyMathInterpreter()
         assert math_interp.name == "tinymath"
 
-    def test_simple_addition(self):
+    def test_simple_addition(self, math_interp):
         """Test basic addition."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("2 + 3")
         output = math_interp.render()
         assert "5.0" in output
 
-    def test_multiplication(self):
+    def test_multiplication(self, math_interp):
         """Test multiplication."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("4 * 5")
         output = math_interp.render()
         assert "20.0" in output
 
-    def test_division(self):
+    def test_division(self, math_interp):
         """Test division."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("20 / 4")
         output = math_interp.render()
         assert "5.0" in output
 
-    def test_subtraction(self):
+    def test_subtraction(self, math_interp):
         """Test subtraction."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("10 - 3")
         output = math_interp.render()
         assert "7.0" in output
 
-    def test_operator_precedence(self):
+    def test_operator_precedence(self, math_interp):
         """Test order of operations."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("2 + 3 * 4")
         output = math_interp.render()
         assert "14.0" in output
 
-    def test_parentheses(self):
+    def test_parentheses(self, math_interp):
         """Test parentheses override precedence."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("(2 + 3) * 4")
         output = math_interp.render()
         assert "20.0" in output
 
-    def test_variable_assignment(self):
+    def test_variable_assignment(self, math_interp):
         """Test variable assignment."""
-        math_interp = TinyMathInterpreter()
         code = "x = 10\nx"
         math_interp.parse(code)
         output = math_interp.render()
         assert "x = 10.0" in output
         assert "10.0" in output
 
-    def test_variable_arithmetic(self):
+    def test_variable_arithmetic(self, math_interp):
         """Test arithmetic with variables."""
-        math_interp = TinyMathInterpreter()
         code = "x = 5\ny = 3\nx + y"
         math_interp.parse(code)
         output = math_interp.render()
         assert "8.0" in output
 
-    def test_sqrt_function(self):
+    def test_sqrt_function(self, math_interp):
         """Test square root function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("sqrt(16)")
         output = math_interp.render()
         assert "4.0" in output
 
-    def test_power_operator(self):
+    def test_power_operator(self, math_interp):
         """Test exponentiation operator."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("2 ^ 8")
         output = math_interp.render()
         assert "256.0" in output
 
-    def test_abs_function(self):
+    def test_abs_function(self, math_interp):
         """Test absolute value function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("abs(-10)")
         output = math_interp.render()
         assert "10.0" in output
 
-    def test_max_function(self):
+    def test_max_function(self, math_interp):
         """Test max function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("max(3, 7, 2, 9, 1)")
         output = math_interp.render()
         assert "9.0" in output
 
-    def test_min_function(self):
+    def test_min_function(self, math_interp):
         """Test min function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("min(8, 3, 12, 1, 5)")
         output = math_interp.render()
         assert "1.0" in output
 
-    def test_floor_function(self):
+    def test_floor_function(self, math_interp):
         """Test floor function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("floor(3.7)")
         output = math_interp.render()
         assert "3" in output
 
-    def test_ceil_function(self):
+    def test_ceil_function(self, math_interp):
         """Test ceil function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("ceil(3.2)")
         output = math_interp.render()
         assert "4" in output
 
-    def test_modulo(self):
+    def test_modulo(self, math_interp):
         """Test modulo operator."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("17 % 5")
         output = math_interp.render()
         assert "2.0" in output
 
-    def test_negative_numbers(self):
+    def test_negative_numbers(self, math_interp):
         """Test negative unary operator."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("-5 + 10")
         output = math_interp.render()
         assert "5.0" in output
 
-    def test_complex_expression(self):
+    def test_complex_expression(self, math_interp):
         """Test complex multi-operation expression."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("(10 + 5) * 2 - 3")
         output = math_interp.render()
         assert "27.0" in output
 
-    def test_pythagorean_theorem(self):
+    def test_pythagorean_theorem(self, math_interp):
         """Test Pythagorean theorem calculation."""
-        math_interp = TinyMathInterpreter()
         code = "a = 3\nb = 4\nsqrt(a^2 + b^2)"
         math_interp.parse(code)
         output = math_interp.render()
         assert "5.0" in output
 
-    def test_sin_function(self):
+    def test_sin_function(self, math_interp):
         """Test sine function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("sin(0)")
         output = math_interp.render()
         assert "0.0" in output
 
-    def test_cos_function(self):
+    def test_cos_function(self, math_interp):
         """Test cosine function."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("cos(0)")
         output = math_interp.render()
         assert "1.0" in output
 
-    def test_comparison_equal(self):
+    def test_comparison_equal(self, math_interp):
         """Test equality comparison."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("5 == 5")
         output = math_interp.render()
         assert "1.0" in output
 
-    def test_comparison_less_than(self):
+    def test_comparison_less_than(self, math_interp):
         """Test less than comparison."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("3 < 7")
         output = math_interp.render()
         assert "1.0" in output
 
-    def test_comparison_greater_than(self):
+    def test_comparison_greater_than(self, math_interp):
         """Test greater than comparison."""
-        math_interp = TinyMathInterpreter()
         math_interp.parse("10 > 5")
         output = math_interp.render()
         assert "1.0" in output
 
-    def test_show_variable(self):
+    def test_show_variable(self, math_interp):
         """Test show statement."""
-        math_interp = TinyMathInterpreter()
         code = "x = 42\nshow x"
         math_interp.parse(code)
         output = math_interp.render()
         assert "x = 42.0" in output
 
-    def test_invalid_syntax(self):
+    def test_invalid_syntax(self, math_interp):
         """Test error handling for invalid syntax."""
-        math_interp = TinyMathInterpreter()
         with pytest.raises(ValueError):
             math_interp.parse("2 +")  # Incomplete expression
 
-    def test_undefined_variable(self):
+    def test_invalid_syntax_cached(self, math_interp):
+        """Test a repeated syntax error is served from the compile cache."""
+        from tinydsl.parser.base_parser import _parse_once
+
+        with pytest.raises(ValueError, match="Unexpected token") as first:
+            math_interp.parse("2 + * 3")
+        hits = _parse_once.cache_info().hits
+        with pytest.raises(ValueError) as second:
+            TinyMathInterpreter().parse("2 + * 3")
+
+        assert str(second.value) == str(first.value)
+        assert _parse_once.cache_info().hits == hits + 1
+
+    def test_undefined_variable(self, math_interp):
         """Test error handling for undefined variable."""
-        math_interp = TinyMathInterpreter()
         with pytest.raises(ValueError):
             math_interp.parse("undefined_var + 5")
 
-    def test_division_by_zero(self):
+    def test_division_by_zero(self, math_interp):
         """Test error handling for division by zero."""
-        math_interp = TinyMathInterpreter()
         with pytest.raises(ValueError):
             math_interp.parse("10 / 0")
 
+    def test_repeated_code_reuses_compiled_program(self, math_interp):
+        """Test identical code is compiled once and still evaluates afresh."""
+        from tinydsl.parser.base_parser import _parse_once
+
+        code = "x = 3\ny = 4\nsqrt(x ^ 2 + y ^ 2)"
+        first = math_interp.parse(code)
+        hits = _parse_once.cache_info().hits
+        second = TinyMathInterpreter().parse(code)
+
+        assert first == second
+        assert first.endswith("\n5.0")
+        assert _parse_once.cache_info().hits == hits + 1
+
+    def test_constant_subexpressions_folded(self, math_interp):
+        """Test constant subtrees compile to constants; failing ones do not."""
+        from tinydsl.parser.lark_tinymath_parser import _compile_node
+
+        def compile_expression(code):
+            tree = math_interp.parser.parser.parse(code)
+            return _compile_node(tree.children[0], {})
+
+        assert compile_expression("(10 + 5) * 2 - sqrt(16)").value == 26.0
+        assert not hasattr(compile_expression("x + 2 * 3"), "value")
+        assert not hasattr(compile_expression("1 / 0"), "value")
+        with pytest.raises(ValueError, match="Undefined variable: x"):
+            math_interp.parse("x\n1 / 0")
+
+    def test_compiled_program_drops_tree(self, math_interp):
+        """Test a compiled program keeps no reference to its parse tree."""
+        from tinydsl.parser.lark_tinymath_parser import _compile_tree
+
+        tree = math_interp.parser.parser.parse("x = 2\nshow x\nsqrt(x) + y")
+        program = _compile_tree(tree)
+        tree_ref = weakref.ref(tree)
+        del tree
+        gc.collect()
+
+        assert tree_ref() is None
+        with pytest.raises(ValueError, match="Undefined variable: y"):
+            program()
+
+    @pytest.mark.parametrize(
+        "code, expected",
+        [
+            (
+                "x = 5\ny = 10\nshow x\n(x + y) * 2 - -x",
+                "x = 5.0\n5.0\ny = 10.0\n10.0\nx = 5.0\n5.0\n35.0",
+            ),
+            ("2 ^ 3 ^ 2\n7 % 3\n1 / 4\n+2", "512.0\n1.0\n2.25"),
+            (
+                "1 == 1\n2 != 2\n3 < 4\n4 <= 3\n5 > 6\n6 >= 6",
+                "1.0\n0.0\n1.0\n0.0\n0.0\n1.0",
+            ),
+            (
+                "sin(0)\ncos(0)\nmax(1, 2, 3)\nmin(4, 5)\nround(2.5)\npow(2, 10)",
+                "0.0\n1.0\n3.0\n4.0\n2\n1024.0",
+            ),
+            ("(-8) ^ (1 / 3)", "(1.0000000000000002+1.7320508075688772j)"),
+            (" 42 ", "42.0"),
+            ("-0\n", "-0.0"),
+            ("007.50", "7.5"),
+            (
+                "x = 1.5\nx ^ 2 + x ^ 2.5 + floor(x) ^ 2",
+                "x = 1.5\n1.5\n6.005675960631075",
+            ),
+            (
+                "x = 1\nx = x + 1\ny = x * x\nshow y",
+                "x = 1.0\n1.0\nx = 2.0\n2.0\ny = 4.0\n4.0\ny = 4.0\n4.0",
+            ),
+        ],
+    )
+    def test_program_output(self, math_interp, code, expected):
+        """Test statement results, including folded and squared operations."""
+        assert math_interp.parser.parse(code) == expected
+
+    @pytest.mark.parametrize(
+        "code, message",
+        [
+            ("10 / 0", "Division by zero"),
+            ("5 % 0", "float modulo"),
+            ("max()", "Error calling max: max() iterable argument is empty"),
+            ("sqrt(-1)", "Error calling sqrt: math domain error"),
+            ("foo(undefined_var)", "Undefined variable: undefined_var"),
+            ("sqrt(1, 2)", "Error calling sqrt: math.sqrt() takes exactly one"),
+            ("show y", "Undefined variable: y"),
+            ("x = 1\nx < (-8) ^ 0.5", "'<' not supported between instances"),
+            ("x = 1e200\nx ^ 2", "Numerical result out of range"),
+            ("y = y + 1", "Undefined variable: y"),
+        ],
+    )
+    def test_program_errors(self, math_interp, code, message):
+        """Test runtime errors surface with the operation's own message."""
+        with pytest.raises(ValueError, match=re.escape(message)):
+            math_interp.parser.parse(code)
+
+    def test_transformer_compat(self, math_interp):
+        """Test TinyMathTransformer still evaluates trees and keeps variables."""
+        from tinydsl.parser.lark_tinymath_parser import TinyMathTransformer
+
+        transformer = TinyMathTransformer()
+        transformer.transform(math_interp.parser.parser.parse("x = 2\nx * 3"))
+        results = transformer.transform(math_interp.parser.parser.parse("x + 1"))
+
+        assert results == ["3.0"]
+        assert transformer.results == ["x = 2.0", "2.0", "6.0", "3.0"]
+        assert transformer.variables == {"x": 2.0}
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,57 +1,67 @@
 """Tests for TinySQL DSL."""
 
+import json
+
+import pytest
+
 from tinydsl.tinysql.tinysql import TinySQLInterpreter
 
 
+@pytest.fixture(scope="module")
+def shared_sql():
+    """TinySQL interpreter shared by the module."""
+    return TinySQLInterpreter()
+
+
+@pytest.fixture
+def sql(shared_sql):
+    """The shared TinySQL interpreter, reset after each test."""
+    yield shared_sql
+    shared_sql.reset()
+
+
 class TestTinySQL:
     """Test TinySQL DSL."""
 
-    def test_tinysql_initialization(self):
+    def test_tinysql_initialization(self, sql):
         """Test TinySQL initializes correctly."""
-        sql = TinySQLInterpreter()
         assert sql.name == "tinysql"
 
-    def test_select_query(self):
+    def test_select_query(self, sql):
         """Test select statement."""
-        sql = TinySQLInterpreter()
         code = "select name, age"
         result = sql.execute(code)
         assert isinstance(result, str)
 
-    def test_load_and_filter(self):
+    def test_load_and_filter(self, sql):
         """Test load and filter statements."""
-        sql = TinySQLInterpreter()
         code = """load table users from "users.json"
 filter users where age > 25"""
         result = sql.execute(code)
         assert isinstance(result, str)
 
-    def test_sort_statement(self):
+    def test_sort_statement(self, sql):
         """Test sort statement."""
-        sql = TinySQLInterpreter()
         code = """load table users from "data.json"
 sort by age desc"""
         result = sql.execute(code)
         assert isinstance(result, str)
 
-    def test_limit_statement(self):
+    def test_limit_statement(self, sql):
         """Test limit statement."""
-        sql = TinySQLInterpreter()
         code = """load table users from "data.json"
 limit 10"""
         result = sql.execute(code)
         assert isinstance(result, str)
 
-    def test_show_tables(self):
+    def test_show_tables(self, sql):
         """Test show tables statement."""
-        sql = TinySQLInterpreter()
         code = "show tables"
         result = sql.execute(code)
         assert isinstance(result, str)
 
-    def test_invalid_query(self):
+    def test_invalid_query(self, sql):
         """Test handling of invalid SQL."""
-        sql = TinySQLInterpreter()
         code = "INVALID QUERY"
         try:
             result = sql.execute(code)
@@ -60,3 +70,125 @@ limit 10"""
         except (ValueError, Exception) as e:
             # Or it should raise an error
             assert "error" in str(e).lower() or "unexpected" in str(e).lower()
+
+    def test_large_table_filter_and_sort(self, tmp_path):
+        """Test vectorized filter/sort on a large table matches row semantics."""
+        rows = [{"id": i, "age": i % 90} for i in range(2000)]
+        rows[0].pop("age")
+        rows[1]["age"] = None
+        table_file = tmp_path / "big.json"
+        table_file.write_text(json.dumps(rows))
+
+        sql = TinySQLInterpreter()
+        result = sql.execute(
+            f'load table big from "{table_file}"\nfilter big where age >= 45'
+        )
+        expected = sum(1 for r in rows if r.get("age") is not None and r["age"] >= 45)
+        assert f"Filtered to {expected} rows" in result
+
+        sql = TinySQLInterpreter()
+        del rows[:2]
+        table_file.write_text(json.dumps(rows))
+        result = sql.execute(
+            f'load table big from "{table_file}"\nsort by age\nlimit 3\nselect id'
+        )
+        assert json.loads(result[result.index("[") :]) == [
+            {"id": 90},
+            {"id": 180},
+            {"id": 270},
+        ]
+
+    def test_large_table_filter_sort_limit_chain(self, sql, tmp_path):
+        """Test sorting filtered rows of a large table keeps row semantics."""
+        rows = [{"id": i, "age": (i * 37) % 90} for i in range(2000)]
+        table_file = tmp_path / "big.json"
+        table_file.write_text(json.dumps(rows))
+
+        result = sql.execute(
+            f'load table big from "{table_file}"\nfilter big where age < 30\n'
+            "sort by age\nlimit 4\nselect id, age"
+        )
+        matching = [r for r in rows if r["age"] < 30]
+        expected = sorted(matching, key=lambda r: r["age"])[:4]
+        assert json.loads(result[result.index("[") :]) == expected
+
+    @pytest.mark.parametrize("n", [1, 5, 700, 1999, 2000, 3000])
+    def test_large_table_sort_then_limit(self, sql, tmp_path, n):
+        """Test a limit after a sort keeps the stable full-sort order."""
+        rows = [{"id": i, "age": (i * 7) % 3} for i in range(2000)]
+        table_file = tmp_path / "big.json"
+        table_file.write_text(json.dumps(rows))
+
+        result = sql.execute(
+            f'load table big from "{table_file}"\nsort by age\nsort by id\n'
+            f"sort by age\nlimit {n}\nselect id"
+        )
+        expected = [{"id": r["id"]} for r in sorted(rows, key=lambda r: r["age"])]
+        assert json.loads(result[result.index("[") :]) == expected[:n]
+
+    def test_sort_rows_missing_field(self, sql, tmp_path):
+        """Test sorting treats a row without the field as 0."""
+        rows = [{"id": 1, "age": 30}, {"id": 2}, {"id": 3, "age": -5}]
+        table_file = tmp_path / "users.json"
+        table_file.write_text(json.dumps(rows))
+
+        result = sql.execute(
+            f'load table users from "{table_file}"\nsort by age\nselect id'
+        )
+        assert json.loads(result[result.index("[") :]) == [
+            {"id": 3},
+            {"id": 2},
+            {"id": 1},
+        ]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "42",
+            "-1.5e3",
+            ".5",
+            "inf",
+            "-Infinity",
+            "nan",
+            "1_000",
+            " 7 ",
+            "1e5",
+            "١٢",
+            "alice",
+            "1e",
+            "1__0",
+            "",
+            "infinite",
+            "0x10",
+        ],
+    )
+    def test_filter_value_numbers_match_float(self, text):
+        """Test filter values become floats exactly when float() accepts them."""
+        from tinydsl.parser.lark_tinysql_parser import _as_number
+
+        try:
+            expected = float(text)
+        except ValueError:
+            expected = text
+        result = _as_number(text)
+
+        assert type(result) is type(expected)
+        assert result == expected or result != result  # nan != nan
+
+    def test_loaded_tables_cached_until_file_changes(self, sql, tmp_path):
+        """Test a table file is parsed once and re-read after it changes."""
+        from tinydsl.parser.lark_tinysql_parser import _load_table
+
+        table_file = tmp_path / "users.json"
+        table_file.write_text(json.dumps([{"age": 30}]))
+        rows = _load_table(str(table_file))
+        assert _load_table(str(table_file)) is rows
+
+        table_file.write_text(json.dumps([{"age": 30}, {"age": 20}]))
+        assert "Loaded 2 rows" in sql.execute(f'load table users from "{table_file}"')
+
+    def test_parse_calls_are_independent(self, sql):
+        """Test output from one parse does not leak into the next."""
+        sql.execute("show tables")
+        result = sql.execute("show tables")
+        assert result == "Tables: "